@@ -19,33 +19,52 @@
  ***************************************************************************/
 """
 
+import email.utils
 import json
+import os
+import random
 import re
 import tempfile
 import urllib.parse
+import weakref
+from datetime import datetime, timezone
+from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 from urllib.parse import urlparse
 
 import requests
-from PyQt5.QtNetwork import QSslPreSharedKeyAuthenticator
 from qgis.core import (
     Qgis,
     QgsApplication,
     QgsAuthMethodConfig,
+    QgsMessageLog,
     QgsNetworkAccessManager,
     QgsProject,
 )
-from qgis.PyQt.QtCore import QFileSystemWatcher, QObject, QUrl, QUrlQuery, pyqtSignal
+from qgis.PyQt.QtCore import (
+    QByteArray,
+    QFileSystemWatcher,
+    QObject,
+    Qt,
+    QThread,
+    QTimer,
+    QUrl,
+    QUrlQuery,
+    pyqtSignal,
+    pyqtSlot,
+)
 from qgis.PyQt.QtNetwork import (
     QHttpMultiPart,
     QHttpPart,
     QNetworkReply,
     QNetworkRequest,
+    QSslConfiguration,
 )
 
-from qfieldsync.core.cloud_project import CloudProject
-from qfieldsync.core.preferences import Preferences
+from qfieldsync.core.cloud_project import CloudProject, ProjectFile
+from qfieldsync.core.preferences import Preferences, preferences_cache
+from qfieldsync.utils.json_stream import JsonArrayStreamParser, JsonStreamError
 from qfieldsync.utils.qt_utils import strip_html
 
 
@@ -57,24 +76,6 @@ class CloudException(Exception):
         self.httpCode = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
 
 
-class disable_nam_timeout:
-    """By default QGIS has 60 seconds timeout, which is too short for uploading huge files"""
-
-    def __init__(self, nam: QgsNetworkAccessManager) -> None:
-        self.nam = nam
-
-    def __enter__(self):
-        self.timeout = self.nam.timeout()
-        if Qgis.QGIS_VERSION_INT >= 31800:
-            self.nam.setTimeout(0)
-        else:
-            # Set it to ridiculously big timeout of 24h.
-            self.nam.setTimeout(60 * 60 * 24)
-
-    def __exit__(self, exc_type, exc_value, exc_traceback):
-        self.nam.setTimeout(self.timeout)
-
-
 def from_reply(reply: QNetworkReply) -> Optional[CloudException]:
     if reply.error() == QNetworkReply.NoError:
         return None
@@ -114,6 +115,162 @@ def from_reply(reply: QNetworkReply) -> Optional[CloudException]:
     return CloudException(reply, Exception(message))
 
 
+# renamed in Qt 5.15
+HTTP2_ALLOWED_ATTRIBUTE = getattr(
+    QNetworkRequest,
+    "Http2AllowedAttribute",
+    getattr(QNetworkRequest, "HTTP2AllowedAttribute", None),
+)
+
+
+class CloudRequestPriority(Enum):
+    """Priority classes of the cloud requests."""
+
+    """Short requests the user is waiting for, like API calls of the browser and the dialogs."""
+    INTERACTIVE = QNetworkRequest.HighPriority
+
+    """Long running file transfers, sent from the network worker thread."""
+    BULK = QNetworkRequest.LowPriority
+
+
+class CloudConnectionWarmer(QObject):
+    """Opens connections in advance with the QGIS network access manager of its thread."""
+
+    connect_requested = pyqtSignal(list, bool)
+
+    def __init__(self, parent=None) -> None:
+        super(CloudConnectionWarmer, self).__init__(parent=parent)
+
+        self.connect_requested.connect(self.connect_to_hosts)
+
+    @pyqtSlot(list, bool)
+    def connect_to_hosts(self, urls: List[QUrl], is_http2_enabled: bool) -> None:
+        nam = QgsNetworkAccessManager.instance()
+
+        for url in urls:
+            if url.scheme() != "https":
+                nam.connectToHost(url.host(), url.port(80))
+                continue
+
+            ssl_configuration = QSslConfiguration.defaultConfiguration()
+
+            if is_http2_enabled:
+                ssl_configuration.setAllowedNextProtocols(
+                    [
+                        QSslConfiguration.ALPNProtocolHTTP2,
+                        QSslConfiguration.NextProtocolHttp1_1,
+                    ]
+                )
+
+            try:
+                nam.connectToHostEncrypted(url.host(), url.port(443), ssl_configuration)
+            except TypeError:
+                # the overload with the SSL configuration requires Qt 5.13
+                nam.connectToHostEncrypted(url.host(), url.port(443))
+
+
+class CloudRetryPolicy:
+    """Decides whether a failed request should be sent again and after how long.
+
+    The delay grows exponentially with every retry, with a random jitter so parallel
+    requests do not retry all at once, unless the server asks for a delay with the
+    `Retry-After` header.
+    """
+
+    """HTTP status codes of failures expected to be temporary."""
+    RETRYABLE_HTTP_CODES = (408, 425, 429, 500, 502, 503, 504)
+
+    """HTTP status codes telling the request has not been processed, safe to retry even for non-idempotent requests."""
+    NOT_PROCESSED_HTTP_CODES = (429, 503)
+
+    """Network errors expected to be temporary."""
+    RETRYABLE_NETWORK_ERRORS = (
+        QNetworkReply.RemoteHostClosedError,
+        QNetworkReply.TimeoutError,
+        QNetworkReply.TemporaryNetworkFailureError,
+        QNetworkReply.NetworkSessionFailedError,
+        QNetworkReply.ProxyConnectionClosedError,
+        QNetworkReply.ProxyTimeoutError,
+        QNetworkReply.UnknownNetworkError,
+        QNetworkReply.ConnectionRefusedError,
+    )
+
+    """Network errors happening before the request reaches the server."""
+    NOT_PROCESSED_NETWORK_ERRORS = (QNetworkReply.ConnectionRefusedError,)
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay_ms: int = 500,
+        max_delay_ms: int = 30000,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay_ms = base_delay_ms
+        self.max_delay_ms = max_delay_ms
+
+    def should_retry(
+        self, reply: "CloudReply", attempt: int, is_idempotent: bool = True
+    ) -> bool:
+        """Checks whether the request of the finished `reply`, the `attempt`-th one, should be sent again."""
+        if attempt >= self.max_attempts:
+            return False
+
+        error = reply.error()
+
+        if error in (QNetworkReply.NoError, QNetworkReply.OperationCanceledError):
+            return False
+
+        http_code = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+
+        if http_code:
+            if is_idempotent:
+                return http_code in self.RETRYABLE_HTTP_CODES
+            else:
+                return http_code in self.NOT_PROCESSED_HTTP_CODES
+
+        if is_idempotent:
+            return error in self.RETRYABLE_NETWORK_ERRORS
+        else:
+            return error in self.NOT_PROCESSED_NETWORK_ERRORS
+
+    def get_delay_ms(self, reply: "CloudReply", attempt: int) -> int:
+        """Returns the delay before sending the request again after the `attempt`-th one failed."""
+        retry_after_ms = self.get_retry_after_ms(reply)
+
+        if retry_after_ms is not None:
+            return min(retry_after_ms, self.max_delay_ms)
+
+        # "full jitter" exponential backoff
+        return round(
+            random.uniform(
+                0, min(self.max_delay_ms, self.base_delay_ms * 2 ** (attempt - 1))
+            )
+        )
+
+    @staticmethod
+    def get_retry_after_ms(reply: "CloudReply") -> Optional[int]:
+        """Returns the delay requested with the `Retry-After` header, given either in seconds or as HTTP date."""
+        if not reply.hasRawHeader(b"Retry-After"):
+            return None
+
+        value = bytes(reply.rawHeader(b"Retry-After")).decode("latin-1").strip()
+
+        if value.isdigit():
+            return int(value) * 1000
+
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+        return max(
+            0, round((retry_at - datetime.now(timezone.utc)).total_seconds() * 1000)
+        )
+
+
 class CloudNetworkAccessManager(QObject):
     token_changed = pyqtSignal()
     login_finished = pyqtSignal()
@@ -121,6 +278,9 @@ class CloudNetworkAccessManager(QObject):
     logout_failed = pyqtSignal(str)
     avatar_success = pyqtSignal()
 
+    """Time without any bytes transferred after which a request is considered stalled."""
+    DEFAULT_STALL_TIMEOUT_MS = 60 * 1000
+
     def __init__(self, parent=None) -> None:
         """Constructor."""
         super(CloudNetworkAccessManager, self).__init__(parent=parent)
@@ -129,8 +289,41 @@ class CloudNetworkAccessManager(QObject):
         self.url = ""
         self._token = ""
         self.user_details: Dict[str, str] = {}
+        # in-flight GET replies by url and token, shared by identical requests
+        self._shared_get_replies: Dict[Tuple[str, str], "CloudReply"] = {}
+        # the parsed JSON payloads of the shared replies, which can be read only once
+        self._shared_get_payloads: Dict["CloudReply", Optional[Any]] = {}
+        self.retry_policy = CloudRetryPolicy()
+        # requests are aborted and retried after that long without any bytes transferred
+        self.stall_timeout_ms = self.DEFAULT_STALL_TIMEOUT_MS
+        # the thread of the bulk file transfers, started on the first bulk request
+        self._bulk_thread: Optional[QThread] = None
+        self._bulk_connection_warmer: Optional[CloudConnectionWarmer] = None
+        self._connection_warmer = CloudConnectionWarmer(self)
+        # the hosts the files are redirected to, by authority and scheme
+        self._storage_urls: Dict[str, QUrl] = {}
+        # whether the server accepts several files in a single request, see `upload_files` and `delete_files`
+        self.is_upload_batch_supported = True
+        self.is_delete_batch_supported = True
+        # whether the server streams all the files of a project as an archive, see `get_project_archive`
+        self.is_archive_download_supported = True
+        # whether the server transfers only the changed chunks of files, see `get_file_chunks`
+        self.is_delta_sync_supported = True
+        # whether the server applies the row changes of GeoPackages, see `upload_file_changeset`
+        self.is_changeset_upload_supported = True
+        # whether the server copies files within a project, see `copy_file`
+        self.is_server_copy_supported = True
+        # opt-in, as some proxies and servers do not handle HTTP/2 well
+        self.is_http2_enabled = bool(self.preferences.value("qfieldCloudHttp2"))
         self.projects_cache = CloudProjectsCache(self, self)
         self.is_login_active = False
+        # the replies rejected with 401, waiting for the token to be renewed by a single login
+        self._reauthentication_waiting_replies: List["CloudReply"] = []
+        self._reauthentication_reply: Optional["CloudReply"] = None
+        # the replies kept alive until finished, as they have no parent, see `CloudReply`
+        self._running_replies: Set[QObject] = set()
+        # the replies not released yet by their consumer, see `CloudReply.release`
+        self._live_replies: "weakref.WeakSet[CloudReply]" = weakref.WeakSet()
 
         url = self.preferences.value("qfieldCloudServerUrl")
         # we should always use the QgsNetworkAccessManager instance, otherwise ssl handling is impossible
@@ -154,12 +347,21 @@ class CloudNetworkAccessManager(QObject):
         if not should_parse_json:
             return None
 
+        # the reply is shared between several callers and has already been read
+        if self._shared_get_payloads.get(reply) is not None:
+            return self._shared_get_payloads[reply]
+
         try:
             payload_str = str(reply.readAll().data(), encoding="utf-8")
-            return json.loads(payload_str)
+            payload = json.loads(payload_str)
         except Exception as error:
             raise CloudException(reply, error) from error
 
+        if reply in self._shared_get_payloads:
+            self._shared_get_payloads[reply] = payload
+
+        return payload
+
     def json_object(self, reply: QNetworkReply) -> Dict[str, Any]:
         payload = self.handle_response(reply, True)
 
@@ -174,6 +376,36 @@ class CloudNetworkAccessManager(QObject):
 
         return payload
 
+    def json_array_stream(
+        self, reply: QNetworkReply, parser: JsonArrayStreamParser
+    ) -> List[Any]:
+        """Streaming alternative of `json_array`, to be called on every `readyRead` and on `finished`.
+
+        Returns the array elements received completely since the previous call, without
+        keeping the whole response in memory. Once the reply is finished, raises if there
+        is an error or the array is incomplete.
+        """
+        if reply.isFinished():
+            self.handle_response(reply, False)
+        elif reply.error() != QNetworkReply.NoError:
+            return []
+        else:
+            status_code = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+
+            # error responses are handled once finished
+            if not status_code or not 200 <= status_code < 300:
+                return []
+
+        try:
+            payload = parser.feed(reply.readAll().data())
+
+            if reply.isFinished():
+                parser.close()
+
+            return payload
+        except JsonStreamError as error:
+            raise CloudException(reply, error) from error
+
     @staticmethod
     def server_urls() -> List[str]:
         return [
@@ -235,6 +467,12 @@ class CloudNetworkAccessManager(QObject):
         else:
             self.url = f"{p.scheme or 'https'}://{p.netloc}{p.path}"
 
+        self.is_upload_batch_supported = True
+        self.is_delete_batch_supported = True
+        self.is_archive_download_supported = True
+        self.is_delta_sync_supported = True
+        self.is_changeset_upload_supported = True
+        self.is_server_copy_supported = True
         self.preferences.set_value("qfieldCloudServerUrl", server_url)
 
     @property
@@ -250,11 +488,41 @@ class CloudNetworkAccessManager(QObject):
         server_url = cfg.uri() or self.url
         username = cfg.config("username")
         password = cfg.config("password")
+        token = cfg.config("token")
 
-        if username and password:
+        if username and token:
+            self.set_url(server_url)
+            self.login_with_token(username, token)
+        elif username and password:
             self.set_url(server_url)
             self.login(username, password)
 
+    def login_with_token(self, username: str, token: str) -> None:
+        """Reuses a token stored in the QGIS auth database, without waiting for the server.
+
+        The token is checked in the background, only if it has been rejected the
+        stored password is used to login again.
+        """
+        # don't login multiple times
+        if self.is_login_active:
+            return
+
+        # the other requests rejected while checking must not log out
+        self.is_login_active = True
+        self.user_details = {
+            "username": username,
+            "avatar_url": "",
+        }
+        self.set_token(token)
+
+        reply = self.get_user(token)
+        reply.can_reauthenticate = False
+        reply.finished.connect(lambda: self._on_token_check_finished(reply))
+        reply.finished.connect(reply.release)
+
+        self.warm_up()
+        self.login_finished.emit()
+
     def login(self, username: str, password: str) -> Optional[QNetworkReply]:
         """Login to QFieldCloud"""
         # don't login multiple times
@@ -270,44 +538,73 @@ class CloudNetworkAccessManager(QObject):
                 "password": password,
             },
         )
+        reply.can_reauthenticate = False
         reply.finished.connect(lambda: self._on_login_finished(reply))
+        reply.finished.connect(reply.release)
 
         return reply
 
-    def get_user(self, token: str) -> QNetworkReply:
+    def get_user(self, token: str) -> "CloudReply":
         """Gets current user and if token is still valid"""
         return self.cloud_get("auth/user/", {"token": token})
 
-    def logout(self) -> QNetworkReply:
+    def logout(self) -> "CloudReply":
         """Logout to QFieldCloud"""
 
         reply = self.cloud_post("auth/logout/")
         reply.finished.connect(lambda: self._on_logout_finished(reply))
+        reply.finished.connect(reply.release)
 
         return reply
 
-    def get_projects(self, should_include_public: bool = False) -> QNetworkReply:
-        """Get QFieldCloud projects"""
+    def get_projects(
+        self,
+        should_include_public: bool = False,
+        page_size: int = 0,
+        force: bool = False,
+    ) -> "CloudPaginatedReply":
+        """Get QFieldCloud projects, one page of `page_size` projects at a time. Zero `page_size` fetches them all at once."""
         params = {"include-public": "1"} if should_include_public else {}
-        return self.cloud_get("projects", params)
+        return CloudPaginatedReply(self, "projects", params, page_size, force)
 
-    def get_projects_not_async(self, should_include_public: bool = False) -> List[Dict]:
+    def get_projects_not_async(
+        self, should_include_public: bool = False, page_size: int = 0
+    ) -> List[Dict]:
         """Get QFieldCloud projects synchronously"""
         headers = {"Authorization": "token {}".format(self._token)}
-        params = {"include-public": "1"} if should_include_public else {}
-
-        response = requests.get(
-            self._prepare_uri("projects").toString(),
-            headers=headers,
-            params=params,
+        params: Dict[str, Any] = (
+            {"include-public": "1"} if should_include_public else {}
         )
-        response.raise_for_status()
 
-        return response.json()
+        if page_size:
+            params["limit"] = page_size
+            params["offset"] = 0
+
+        url = self._prepare_uri("projects").toString()
+        projects = []
+
+        while url:
+            # the read timeout of `requests` applies between received bytes, like the stall watchdog
+            response = requests.get(
+                url,
+                headers=headers,
+                params=params,
+                timeout=self.stall_timeout_ms / 1000,
+            )
+            response.raise_for_status()
+
+            results, url = CloudPaginatedReply.parse_page(
+                response.json(), response.headers.get("X-Next-Page")
+            )
+            projects += results
+            # the `next` url already contains all the query params
+            params = {}
+
+        return projects
 
     def create_project(
         self, name: str, owner: str, description: str, private: bool
-    ) -> QNetworkReply:
+    ) -> "CloudReply":
         """Create a new QFieldCloud project"""
 
         return self.cloud_post(
@@ -322,7 +619,7 @@ class CloudNetworkAccessManager(QObject):
 
     def update_project(
         self, project_id: str, name: str, description: str
-    ) -> QNetworkReply:
+    ) -> "CloudReply":
         """Update an existing QFieldCloud project"""
 
         return self.cloud_patch(
@@ -333,28 +630,162 @@ class CloudNetworkAccessManager(QObject):
             },
         )
 
-    def delete_project(self, project_id: str) -> QNetworkReply:
+    def delete_project(self, project_id: str) -> "CloudReply":
         """Delete an existing QFieldCloud project"""
 
         return self.cloud_delete(["projects", project_id])
 
-    def get_user_organizations(self, username: str) -> QNetworkReply:
+    def get_user_organizations(self, username: str) -> "CloudReply":
         """Gets the available projects for the owner dropdown menu"""
 
         return self.cloud_get(["users", username, "organizations"])
 
-    def get_files(self, project_id: str, client: str = "qgis") -> QNetworkReply:
+    def get_files(
+        self, project_id: str, client: str = "qgis", force: bool = False
+    ) -> "CloudReply":
         """Get project files and their versions"""
 
-        return self.cloud_get(["files", project_id], {"client": client})
+        return self.cloud_get(["files", project_id], {"client": client}, force=force)
+
+    def get_project_archive(
+        self,
+        project_id: str,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        """Gets the latest version of all the project files as a single tar archive.
+
+        The archive is streamed, so it is meant to be read on every `readyRead`.
+        Servers without support for it answer with 404, 405 or 501, see
+        `is_archive_download_supported`.
+        """
+        return self.cloud_get(["projects", project_id, "archive"], priority=priority)
 
-    def get_file(self, url: QUrl, local_filename: str) -> QNetworkReply:
+    def get_file(self, url: QUrl, local_filename: str) -> "CloudReply":
         """Download file from external URL"""
 
         return self.cloud_get(url, local_filename=local_filename)
 
-    def delete_file(self, filename: str) -> QNetworkReply:
-        return self.cloud_delete("files/" + filename)
+    def get_file_chunks(
+        self,
+        project_id: str,
+        filename: str,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        """Gets the content-defined chunks of the latest version of a file, see `ChunkedFile.to_json`.
+
+        The response also gives the chunking parameters, so the local files are cut the
+        same way. Servers without support for it answer with 404, 405 or 501, see
+        `is_delta_sync_supported`.
+        """
+        return self.cloud_get(
+            "files/" + project_id + "/" + filename + "/chunks", priority=priority
+        )
+
+    def get_file_range(
+        self,
+        project_id: str,
+        filename: str,
+        offset: int,
+        size: int,
+        local_filename: str,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        """Downloads a byte range of the latest version of a file, answered with 206."""
+        return self.cloud_get(
+            "files/" + project_id + "/" + filename,
+            local_filename=local_filename,
+            priority=priority,
+            headers={"Range": "bytes={}-{}".format(offset, offset + size - 1)},
+        )
+
+    def upload_file_delta(
+        self,
+        project_id: str,
+        filename: str,
+        delta_filename: str,
+        recipe: Dict[str, Any],
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        """Uploads a new version of a file made of chunks of its latest version and new chunks.
+
+        The `recipe` lists all the chunks of the new version in order, each either
+        already in the latest version or new. The new chunks are sent in order, one
+        after the other, in the `delta_filename` file. The server answers with 412 if
+        the latest version is not the `base_sha256` of the recipe anymore.
+        """
+        return self.cloud_upload_files(
+            "files/" + project_id + "/" + filename + "/delta",
+            filenames=[delta_filename],
+            payload=recipe,
+            priority=priority,
+            part_filenames=[filename],
+        )
+
+    def upload_file_changeset(
+        self,
+        project_id: str,
+        filename: str,
+        changeset_filename: str,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        """Uploads the rows changed in a GeoPackage, to be applied by the server on its latest version.
+
+        The changeset is created with `create_changeset`. The server answers with the
+        name and SHA256 of the new version, or with 412 if the latest version is not the
+        `base_sha256` of the changeset anymore. Servers without support for it answer
+        with 404, 405 or 501, or might take the request for the upload of another file,
+        see `is_changeset_upload_supported`.
+        """
+        return self.cloud_upload_files(
+            "files/" + project_id + "/" + filename + "/changeset",
+            filenames=[changeset_filename],
+            priority=priority,
+            part_filenames=[filename],
+        )
+
+    def copy_file(
+        self,
+        project_id: str,
+        filename: str,
+        destination: str,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        """Copies the latest version of a file to another filename of the project, without transferring it.
+
+        The server answers with the name and SHA256 of the new file. Servers without
+        support for it answer with 404, 405 or 501, or might take the request for the
+        upload of another file, see `is_server_copy_supported`.
+        """
+        return self.cloud_post(
+            "files/" + project_id + "/" + filename + "/copy",
+            payload={"destination": destination},
+            priority=priority,
+        )
+
+    def delete_file(
+        self,
+        filename: str,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        return self.cloud_delete("files/" + filename, priority=priority)
+
+    def delete_files(
+        self,
+        project_id: str,
+        filenames: List[str],
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        """Deletes several files of a project in a single request.
+
+        The server answers with the outcome of each file, see `parse_file_results`.
+        Servers without support for it answer with 404, 405 or 501, see
+        `is_delete_batch_supported`.
+        """
+        return self.cloud_delete(
+            "files/" + project_id,
+            priority=priority,
+            payload={"filenames": filenames},
+        )
 
     def set_token(self, token: str, update_auth: bool = False) -> None:
         """Sets QFieldCloud authentication token to be used by all the following requests. Set to empty string to disable token authentication."""
@@ -371,13 +802,32 @@ class CloudNetworkAccessManager(QObject):
     def has_token(self) -> bool:
         return self._token is not None and len(self._token) > 0
 
+    @property
+    def live_replies_count(self) -> int:
+        """The number of replies not released yet, either running or still referenced by their consumer."""
+        return len(self._live_replies)
+
+    @property
+    def buffered_bytes(self) -> int:
+        """The number of bytes received by the live replies and not read yet."""
+        return sum(reply.buffered_bytes for reply in list(self._live_replies))
+
     def cloud_get(
         self,
         uri: Union[str, List[str], QUrl],
         params: Dict[str, Any] = {},
         local_filename: str = None,
-    ) -> QNetworkReply:
-        """Issues a GET HTTP request"""
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+        headers: Optional[Dict[str, str]] = None,
+        force: bool = False,
+    ) -> "CloudReply":
+        """Issues a GET HTTP request.
+
+        Identical concurrent requests, except file downloads, share the same reply.
+        A `force` request is sent even if an identical one is running, e.g. right after
+        a change the running one might not reflect, and is then shared instead.
+        Bulk requests are sent from the network worker thread.
+        """
         url = self._prepare_uri(uri)
 
         query = QUrlQuery(url.query())
@@ -394,55 +844,186 @@ class CloudNetworkAccessManager(QObject):
 
         url.setQuery(query)
 
-        request = QNetworkRequest(url)
+        shared_key = (url.toString(), self._token)
+        if (
+            local_filename is None
+            and headers is None
+            and priority == CloudRequestPriority.INTERACTIVE
+            and not force
+            and shared_key in self._shared_get_replies
+        ):
+            return self._shared_get_replies[shared_key]
+
+        request = self._create_request(url, priority)
         request.setAttribute(
             QNetworkRequest.RedirectPolicyAttribute,
             QNetworkRequest.NoLessSafeRedirectPolicy,
         )
         request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
 
-        if self._token:
-            request.setRawHeader(
-                b"Authorization", "Token {}".format(self._token).encode("utf-8")
-            )
-
-        with disable_nam_timeout(self._nam):
-            reply = self._nam.get(request)
+        for name, value in (headers or {}).items():
+            request.setRawHeader(name.encode("utf-8"), value.encode("utf-8"))
 
-        reply.sslErrors.connect(lambda sslErrors: reply.ignoreSslErrors(sslErrors))
-        reply.setParent(self)
+        reply = CloudReply(
+            self,
+            lambda nam: nam.get(self._authorize(request)),
+            self.retry_policy,
+            thread=self._get_reply_thread(priority),
+        )
 
         if local_filename is not None:
+            self._connect_download_finished(reply, local_filename)
+        elif headers is None and priority == CloudRequestPriority.INTERACTIVE:
+            self._shared_get_replies[shared_key] = reply
+            self._shared_get_payloads[reply] = None
+            # connected before the callers' slots, so no new caller gets the finished reply
             reply.finished.connect(
-                lambda: self._on_cloud_get_download_finished(
-                    reply, local_filename=local_filename
-                )
+                lambda: self._on_shared_get_finished(reply, shared_key)
             )
 
         return reply
 
-    def get(self, url: QUrl, local_filename: str = None) -> QNetworkReply:
+    def _create_request(
+        self,
+        url: QUrl,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> QNetworkRequest:
         request = QNetworkRequest(url)
+        request.setPriority(priority.value)
+        # explicitly set, as the default differs between Qt versions
+        request.setAttribute(HTTP2_ALLOWED_ATTRIBUTE, self.is_http2_enabled)
+        # the global QGIS timeout is a user setting shared by all the threads, so it is
+        # never changed, Qt aborts the stalled transfers too, along with the watchdog of `CloudReply`
+        if hasattr(request, "setTransferTimeout"):
+            request.setTransferTimeout(self.stall_timeout_ms)
+
+        return request
+
+    def _authorize(self, request: QNetworkRequest) -> QNetworkRequest:
+        """Returns a copy of the request with the current token.
+
+        Called whenever the request is sent, so the replayed requests use the renewed token.
+        """
+        if not self._token:
+            return request
+
+        authorized_request = QNetworkRequest(request)
+        authorized_request.setRawHeader(
+            b"Authorization", "Token {}".format(self._token).encode("utf-8")
+        )
+
+        return authorized_request
+
+    def _get_reply_thread(self, priority: CloudRequestPriority) -> Optional[QThread]:
+        """Returns the thread to send the request from, `None` for the current thread.
+
+        Bulk requests are sent from their own thread, by a network access manager with its
+        own connections, so they never hold the connection slots of interactive requests.
+        """
+        if priority != CloudRequestPriority.BULK:
+            return None
+
+        if self._bulk_thread is None:
+            self._bulk_thread = QThread()
+            self._bulk_thread.setObjectName("QFieldSync network worker")
+            self._bulk_connection_warmer = CloudConnectionWarmer()
+            self._bulk_connection_warmer.moveToThread(self._bulk_thread)
+            self._bulk_thread.start()
+
+        return self._bulk_thread
+
+    def stop_bulk_thread(self) -> None:
+        """Stops the thread of the bulk file transfers, waiting for it to finish."""
+        if self._bulk_thread is None:
+            return
+
+        # deleted by the thread before it finishes
+        self._bulk_connection_warmer.deleteLater()
+        self._bulk_connection_warmer = None
+        self._bulk_thread.quit()
+        self._bulk_thread.wait()
+        self._bulk_thread = None
+
+    def warm_up(self, with_bulk: bool = False) -> None:
+        """Connects in advance to the API server and the storage hosts seen so far.
+
+        The TCP and TLS handshakes are then already done when the first requests are
+        sent, from the main thread and, `with_bulk` or if it is already running, from
+        the network worker thread. The worker thread is not started just to warm up,
+        e.g. on login, only when file transfers are about to start.
+        """
+        self.is_http2_enabled = bool(self.preferences.value("qfieldCloudHttp2"))
+
+        if not self.url:
+            return
+
+        api_url = QUrl(self.server_url)
+
+        self._connection_warmer.connect_to_hosts([api_url], self.is_http2_enabled)
+
+        if not with_bulk and self._bulk_thread is None:
+            return
+
+        self._get_reply_thread(CloudRequestPriority.BULK)
+        self._bulk_connection_warmer.connect_requested.emit(
+            [api_url, *self._storage_urls.values()], self.is_http2_enabled
+        )
+
+    def add_storage_url(self, url: QUrl) -> None:
+        """Remembers the host files are redirected to, so it is warmed up too."""
+        key = url.authority(QUrl.FullyEncoded) + url.scheme()
+
+        if key not in self._storage_urls:
+            self._storage_urls[key] = url.adjusted(
+                QUrl.RemovePath | QUrl.RemoveQuery | QUrl.RemoveFragment
+            )
+
+    def _on_shared_get_finished(
+        self, reply: QNetworkReply, shared_key: Tuple[str, str]
+    ) -> None:
+        if self._shared_get_replies.get(shared_key) is reply:
+            del self._shared_get_replies[shared_key]
+
+        # the parsed payload is available to all the `finished` slots, then released
+        QTimer.singleShot(0, lambda: self._shared_get_payloads.pop(reply, None))
+
+    def get(
+        self,
+        url: QUrl,
+        local_filename: str = None,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        request = self._create_request(url, priority)
         request.setAttribute(
             QNetworkRequest.RedirectPolicyAttribute,
             QNetworkRequest.UserVerifiedRedirectPolicy,
         )
 
-        with disable_nam_timeout(self._nam):
-            reply = self._nam.get(request)
-
-        reply.sslErrors.connect(lambda sslErrors: reply.ignoreSslErrors(sslErrors))
-        reply.setParent(self)
+        # external urls, e.g. presigned storage urls, must not get the token
+        reply = CloudReply(
+            self,
+            lambda nam: nam.get(request),
+            self.retry_policy,
+            thread=self._get_reply_thread(priority),
+        )
 
         if local_filename is not None:
-            reply.finished.connect(
-                lambda: self._on_cloud_get_download_finished(
-                    reply, local_filename=local_filename
-                )
-            )
+            self._connect_download_finished(reply, local_filename)
 
         return reply
 
+    def _connect_download_finished(
+        self, reply: "CloudReply", local_filename: str
+    ) -> None:
+        # direct connection, so the file is written in the thread of the reply, while the
+        # network reply still belongs to it, and exists before the `finished` slots are called
+        reply.data_finished.connect(
+            lambda: self._on_cloud_get_download_finished(
+                reply, local_filename=local_filename
+            ),
+            Qt.DirectConnection,
+        )
+
     def _on_cloud_get_download_finished(
         self, reply: QNetworkReply, local_filename: str
     ) -> None:
@@ -457,122 +1038,182 @@ class CloudNetworkAccessManager(QObject):
             ), 'Error while writing to file "{}"'.format(local_filename)
 
     def cloud_post(
-        self, uri: Union[str, List[str]], payload: Dict = None
-    ) -> QNetworkReply:
+        self,
+        uri: Union[str, List[str]],
+        payload: Dict = None,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
         url = self._prepare_uri(uri)
 
         self._clear_cloud_cookies(url)
 
-        request = QNetworkRequest(url)
+        request = self._create_request(url, priority)
         request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
         request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
 
-        if self._token:
-            request.setRawHeader(
-                b"Authorization", "Token {}".format(self._token).encode("utf-8")
-            )
-
         payload_bytes = b"" if payload is None else json.dumps(payload).encode("utf-8")
 
-        with disable_nam_timeout(self._nam):
-            reply = self._nam.post(request, payload_bytes)
-
-        reply.sslErrors.connect(lambda sslErrors: reply.ignoreSslErrors(sslErrors))
-        reply.setParent(self)
+        reply = CloudReply(
+            self,
+            lambda nam: nam.post(self._authorize(request), payload_bytes),
+            self.retry_policy,
+            is_idempotent=False,
+            thread=self._get_reply_thread(priority),
+        )
 
         return reply
 
     def cloud_put(
         self, uri: Union[str, List[str]], payload: Dict = None
-    ) -> QNetworkReply:
+    ) -> "CloudReply":
         url = self._prepare_uri(uri)
 
         self._clear_cloud_cookies(url)
 
-        request = QNetworkRequest(url)
+        request = self._create_request(url)
         request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
         request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
 
-        if self._token:
-            request.setRawHeader(
-                b"Authorization", "Token {}".format(self._token).encode("utf-8")
-            )
-
         payload_bytes = b"" if payload is None else json.dumps(payload).encode("utf-8")
 
-        with disable_nam_timeout(self._nam):
-            reply = self._nam.put(request, payload_bytes)
-
-        reply.sslErrors.connect(lambda sslErrors: reply.ignoreSslErrors(sslErrors))
-        reply.setParent(self)
+        reply = CloudReply(
+            self, lambda nam: nam.put(self._authorize(request), payload_bytes)
+        )
 
         return reply
 
     def cloud_patch(
         self, uri: Union[str, List[str]], payload: Dict = None
-    ) -> QNetworkReply:
+    ) -> "CloudReply":
         url = self._prepare_uri(uri)
 
         self._clear_cloud_cookies(url)
 
-        request = QNetworkRequest(url)
+        request = self._create_request(url)
         request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
         request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
 
-        if self._token:
-            request.setRawHeader(
-                b"Authorization", "Token {}".format(self._token).encode("utf-8")
-            )
-
         payload_bytes = b"" if payload is None else json.dumps(payload).encode("utf-8")
 
-        with disable_nam_timeout(self._nam):
-            reply = self._nam.sendCustomRequest(request, b"PATCH", payload_bytes)
-
-        reply.sslErrors.connect(lambda sslErrors: reply.ignoreSslErrors(sslErrors))
-        reply.setParent(self)
+        reply = CloudReply(
+            self,
+            lambda nam: nam.sendCustomRequest(
+                self._authorize(request), b"PATCH", payload_bytes
+            ),
+        )
 
         return reply
 
-    def cloud_delete(self, uri: Union[str, List[str]]) -> QNetworkReply:
+    def cloud_delete(
+        self,
+        uri: Union[str, List[str]],
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> "CloudReply":
         url = self._prepare_uri(uri)
 
         self._clear_cloud_cookies(url)
 
-        request = QNetworkRequest(url)
+        request = self._create_request(url, priority)
         request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
         request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
 
-        if self._token:
-            request.setRawHeader(
-                b"Authorization", "Token {}".format(self._token).encode("utf-8")
+        if payload is None:
+            reply = CloudReply(
+                self,
+                lambda nam: nam.deleteResource(self._authorize(request)),
+                self.retry_policy,
+                thread=self._get_reply_thread(priority),
+            )
+        else:
+            # `deleteResource` cannot send a body
+            payload_bytes = json.dumps(payload).encode("utf-8")
+            reply = CloudReply(
+                self,
+                lambda nam: nam.sendCustomRequest(
+                    self._authorize(request), b"DELETE", payload_bytes
+                ),
+                self.retry_policy,
+                thread=self._get_reply_thread(priority),
             )
 
-        with disable_nam_timeout(self._nam):
-            reply = self._nam.deleteResource(request)
+        return reply
+
+    def upload_files(
+        self,
+        project_id: str,
+        filenames: Dict[str, str],
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+    ) -> "CloudReply":
+        """Uploads several files of a project in a single request.
+
+        The `filenames` are the local filenames by project filename. The server answers
+        with the outcome of each file, see `parse_file_results`. Servers without
+        support for it answer with 404, 405 or 501, see `is_upload_batch_supported`.
+        """
+        return self.cloud_upload_files(
+            "files/" + project_id,
+            filenames=list(filenames.values()),
+            part_filenames=list(filenames.keys()),
+            priority=priority,
+        )
 
-        reply.sslErrors.connect(lambda sslErrors: reply.ignoreSslErrors(sslErrors))
-        reply.setParent(self)
+    @staticmethod
+    def parse_file_results(payload: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """Returns the error of each file of a batch request by project filename, `None` if succeeded."""
+        results = {}
 
-        return reply
+        for result in payload:
+            status = int(result.get("status", 0))
+
+            if 200 <= status < 300:
+                results[result["name"]] = None
+            else:
+                results[result["name"]] = "[HTTP-{}] {}".format(
+                    status, result.get("detail", "")
+                )
+
+        return results
 
     def cloud_upload_files(
-        self, uri: Union[str, List[str]], filenames: List[str], payload: Dict = None
-    ) -> QNetworkReply:
+        self,
+        uri: Union[str, List[str]],
+        filenames: List[str],
+        payload: Dict = None,
+        priority: CloudRequestPriority = CloudRequestPriority.INTERACTIVE,
+        part_filenames: Optional[List[str]] = None,
+    ) -> "CloudReply":
         url = self._prepare_uri(uri)
 
         self._clear_cloud_cookies(url)
 
-        request = QNetworkRequest(url)
+        request = self._create_request(url, priority)
         request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
 
-        if self._token:
-            request.setRawHeader(
-                b"Authorization", "Token {}".format(self._token).encode("utf-8")
-            )
+        def send_request(nam: QgsNetworkAccessManager) -> QNetworkReply:
+            # the multipart body is consumed by the request, so it is built again for every attempt
+            multi_part = self._build_multipart(filenames, payload, part_filenames)
+            reply = nam.post(self._authorize(request), multi_part)
+            multi_part.setParent(reply)
+
+            return reply
 
+        reply = CloudReply(
+            self,
+            send_request,
+            self.retry_policy,
+            thread=self._get_reply_thread(priority),
+        )
+
+        return reply
+
+    def _build_multipart(
+        self,
+        filenames: List[str],
+        payload: Optional[Dict],
+        part_filenames: Optional[List[str]] = None,
+    ) -> QHttpMultiPart:
         multi_part = QHttpMultiPart(QHttpMultiPart.FormDataType)
-        multi_part.setParent(self)
         multi_part.setBoundary(
             b"boundary_.oOo.QFieldRoxAndYouKnowItDXMtCoIPQV84CAX3rDyv83393"
         )
@@ -589,27 +1230,24 @@ class CloudNetworkAccessManager(QObject):
 
             multi_part.append(json_part)
 
+        # the parts are named after the local filenames, unless given other names
+        if part_filenames is None:
+            part_filenames = filenames
+
         # now attach each file
-        for filename in filenames:
+        for filename, part_filename in zip(filenames, part_filenames):
             # this might be optimized by usung QFile and QHttpPart.setBodyDevice, but didn't work on the first
             with open(filename, "rb") as file:
                 file_part = QHttpPart()
                 file_part.setBody(file.read())
                 file_part.setHeader(
                     QNetworkRequest.ContentDispositionHeader,
-                    'form-data; name="file"; filename="{}"'.format(filename),
+                    'form-data; name="file"; filename="{}"'.format(part_filename),
                 )
 
                 multi_part.append(file_part)
 
-        with disable_nam_timeout(self._nam):
-            reply = self._nam.post(request, multi_part)
-
-        reply.sslErrors.connect(lambda sslErrors: reply.ignoreSslErrors(sslErrors))
-        reply.setParent(self)
-        multi_part.setParent(reply)
-
-        return reply
+        return multi_part
 
     def _prepare_uri(self, uri: Union[str, List[str], QUrl]) -> QUrl:
         if isinstance(uri, QUrl):
@@ -652,27 +1290,153 @@ class CloudNetworkAccessManager(QObject):
             self._login_error = err
             self.login_finished.emit()
             self.preferences.set_value("qfieldCloudRememberMe", False)
+            self._resume_reauthentication_waiting_replies(False)
             return
 
-        self.user_details = {
-            "username": payload["username"],
-            "avatar_url": payload["avatar_url"],
-        }
-        if payload["avatar_url"]:
-            suffix = payload["avatar_url"].rsplit(".")[-1]
-            avatar_filename = tempfile.mktemp(suffix=f".{suffix}")
-            reply = self.get_file(
-                QUrl(payload["avatar_url"]),
-                avatar_filename,
-            )
-            reply.finished.connect(
-                lambda: self._on_avatar_download_finished(reply, avatar_filename)
-            )
+        self._set_user_details(payload)
         self.set_auth(self.url, username=payload["username"])
         self.set_token(
             payload["token"], self.preferences.value("qfieldCloudRememberMe")
         )
+        self.warm_up()
         self.login_finished.emit()
+        self._resume_reauthentication_waiting_replies(True)
+
+    def _on_token_check_finished(self, reply: QNetworkReply) -> None:
+        self.is_login_active = False
+
+        try:
+            payload = self.json_object(reply)
+        except CloudException as err:
+            # keep the token when the server cannot be reached, e.g. while offline
+            if err.httpCode != 401:
+                self._resume_reauthentication_waiting_replies(False)
+                return
+
+            cfg = self.auth()
+            username = cfg.config("username")
+            password = cfg.config("password")
+
+            self.set_token("", True)
+
+            if username and password:
+                # the waiting replies are resumed once logged in again
+                self.login(username, password)
+            else:
+                self.logout_success.emit()
+                self._resume_reauthentication_waiting_replies(False)
+
+            return
+
+        self._set_user_details(payload)
+        self._resume_reauthentication_waiting_replies(True)
+
+    @pyqtSlot(QObject)
+    def _on_reauthentication_requested(self, reply: "CloudReply") -> None:
+        """Renews the token once for all the concurrent replies rejected with 401.
+
+        The replies are sent again with the renewed token, or finish with their 401 error
+        when the token could not be renewed.
+        """
+        # the token has already been renewed since the reply has been sent
+        if self._token and reply.sent_token != self._token:
+            reply.resume(True)
+            return
+
+        self._reauthentication_waiting_replies.append(reply)
+
+        # resumed once the running login or token check is finished
+        if self._reauthentication_reply is not None or self.is_login_active:
+            return
+
+        cfg = self.auth()
+        username = cfg.config("username")
+        password = cfg.config("password")
+
+        if not username or not password:
+            self._resume_reauthentication_waiting_replies(False)
+            return
+
+        QgsMessageLog.logMessage(
+            self.tr("The token has been rejected, logging in again"),
+            "QFieldSync",
+            Qgis.Info,
+        )
+
+        url = self._prepare_uri("auth/login/")
+        request = self._create_request(url)
+        request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+        request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
+        # without the rejected token, which the server would refuse even for logging in
+        payload_bytes = json.dumps(
+            {
+                "username": username,
+                "password": password,
+            }
+        ).encode("utf-8")
+
+        login_reply = CloudReply(
+            self,
+            lambda nam: nam.post(request, payload_bytes),
+            self.retry_policy,
+            is_idempotent=False,
+        )
+        login_reply.can_reauthenticate = False
+        login_reply.finished.connect(
+            lambda: self._on_reauthentication_finished(login_reply, username)
+        )
+        login_reply.finished.connect(login_reply.release)
+        self._reauthentication_reply = login_reply
+
+    def _on_reauthentication_finished(self, reply: "CloudReply", username: str) -> None:
+        self._reauthentication_reply = None
+
+        try:
+            payload = self.json_object(reply)
+        except CloudException as err:
+            QgsMessageLog.logMessage(
+                self.tr("Failed to log in again: {}").format(err),
+                "QFieldSync",
+                Qgis.Warning,
+            )
+            # the waiting replies finish with 401, which logs out
+            self._resume_reauthentication_waiting_replies(False)
+            return
+
+        if self.preferences.value("qfieldCloudRememberMe"):
+            self.set_auth(self.url, token=payload["token"])
+
+        if payload["username"] == username:
+            # the same user, so the running requests and the cached projects are still valid
+            self._token = payload["token"]
+        else:
+            self.set_token(payload["token"])
+
+        self._resume_reauthentication_waiting_replies(True)
+
+    def _resume_reauthentication_waiting_replies(self, is_authenticated: bool) -> None:
+        replies = self._reauthentication_waiting_replies
+        self._reauthentication_waiting_replies = []
+
+        for reply in replies:
+            reply.resume(is_authenticated)
+
+    def _set_user_details(self, payload: Dict[str, Any]) -> None:
+        self.user_details = {
+            "username": payload["username"],
+            "avatar_url": payload["avatar_url"],
+        }
+        if payload["avatar_url"]:
+            suffix = payload["avatar_url"].rsplit(".")[-1]
+            avatar_filename = tempfile.mktemp(suffix=f".{suffix}")
+            reply = self.get_file(
+                QUrl(payload["avatar_url"]),
+                avatar_filename,
+            )
+            reply.finished.connect(
+                lambda: self._on_avatar_download_finished(reply, avatar_filename)
+            )
+            reply.finished.connect(reply.release)
 
     def _on_avatar_download_finished(self, reply: QNetworkReply, filename: str) -> None:
         error = from_reply(reply)
@@ -710,31 +1474,597 @@ class CloudNetworkAccessManager(QObject):
             self._nam.cookieJar().deleteCookie(cookie)
 
 
-class CloudReply:
+class CloudPaginatedReply(QObject):
+    """Fetches a list endpoint page by page, following the `next` links of the server.
+
+    Mimics the parts of the `QNetworkReply` interface used by the callers, so it can be used in place of a reply.
+    The pages are either objects with the `results` and the `next` link, or lists with the
+    link in the `X-Next-Page` header, as QFieldCloud answers. Servers that do not support
+    pagination return the whole list at once, which is treated as the only page.
+    Like `CloudReply`, it is owned by its consumer once finished.
+    """
+
+    page_finished = pyqtSignal(list)
     finished = pyqtSignal()
-    sslErrors = pyqtSignal()
-    projects_error = pyqtSignal(str)
-    downloadProgress = pyqtSignal(int, int)
-    encrypted = pyqtSignal()
-    errorOccurred = pyqtSignal(QNetworkReply.NetworkError)
+    _finish_delivered = pyqtSignal()
+
+    def __init__(
+        self,
+        network_manager: CloudNetworkAccessManager,
+        uri: Union[str, List[str]],
+        params: Dict[str, Any],
+        page_size: int = 0,
+        force: bool = False,
+    ) -> None:
+        super(CloudPaginatedReply, self).__init__()
+
+        self.network_manager = network_manager
+        network_manager._running_replies.add(self)
+        self._finish_delivered.connect(self._on_finish_delivered, Qt.QueuedConnection)
+        # whether the pages are requested again rather than shared, see `CloudNetworkAccessManager.cloud_get`
+        self.force = force
+        self.pages_count = 0
+        self.is_aborted = False
+        self.error_exception: Optional[Exception] = None
+        self._is_finished = False
+        self._reply: Optional["CloudReply"] = None
+
+        if page_size:
+            params = {**params, "limit": page_size, "offset": 0}
+
+        self._request_page(self.network_manager.cloud_get(uri, params, force=force))
+
+    @staticmethod
+    def parse_page(
+        payload: Union[List, Dict], next_page_header: Optional[str] = None
+    ) -> Tuple[List, Optional[str]]:
+        """Returns the results of a page and the url of the next one, if any.
+
+        The `next_page_header` is the `X-Next-Page` header of the response, if any.
+        """
+        if isinstance(payload, list):
+            return payload, next_page_header or None
+
+        assert isinstance(payload, dict)
+
+        return payload["results"], payload.get("next")
+
+    @property
+    def last_reply(self) -> "CloudReply":
+        return self._reply
+
+    def abort(self) -> None:
+        if self._is_finished:
+            return
+
+        self.is_aborted = True
+        self._reply.abort()
+
+    def error(self) -> QNetworkReply.NetworkError:
+        if self.is_aborted:
+            return QNetworkReply.OperationCanceledError
+
+        return self._reply.error()
+
+    def isFinished(self) -> bool:
+        return self._is_finished
+
+    @pyqtSlot()
+    def release(self) -> None:
+        """Releases the reply of the last page, see `CloudReply.release`."""
+        self._reply.release()
+
+    def _request_page(self, reply: QNetworkReply) -> None:
+        # only the reply of the last page is kept, to tell the outcome
+        if self._reply is not None:
+            self._reply.release()
+
+        self._reply = reply
+        self._reply.finished.connect(lambda: self._on_page_finished(reply))
+
+    def _on_page_finished(self, reply: QNetworkReply) -> None:
+        if self.is_aborted or reply.error() == QNetworkReply.OperationCanceledError:
+            self.is_aborted = True
+            self._finish()
+            return
+
+        try:
+            next_page_header = (
+                bytes(reply.rawHeader(b"X-Next-Page")).decode()
+                if reply.hasRawHeader(b"X-Next-Page")
+                else None
+            )
+            results, next_url = self.parse_page(
+                self.network_manager.handle_response(reply), next_page_header
+            )
+        except Exception as err:
+            self.error_exception = err
+            self._finish()
+            return
+
+        self.pages_count += 1
+        self.page_finished.emit(results)
+
+        # the page handlers might have aborted the request
+        if self.is_aborted:
+            self._finish()
+        elif next_url:
+            self._request_page(
+                self.network_manager.cloud_get(QUrl(next_url), force=self.force)
+            )
+        else:
+            self._finish()
+
+    def _finish(self) -> None:
+        self._is_finished = True
+        self.finished.emit()
+        self._finish_delivered.emit()
+
+    @pyqtSlot()
+    def _on_finish_delivered(self) -> None:
+        # from now on, the reply lives as long as its consumers reference it
+        self.network_manager._running_replies.discard(self)
+
+
+class CloudReply(QObject):
+    """Reply of a cloud request, sent again on temporary failures according to the retry policy.
+
+    Mimics the parts of the `QNetworkReply` API used by the plugin, delegating to the
+    reply of the last attempt. The `finished` signal is emitted only once, when the
+    request succeeded, failed permanently or has been aborted.
+
+    Each attempt is watched for inactivity and aborted as timed out when no bytes have
+    been transferred for `stall_timeout_ms`. The attempts canceled by the global QGIS
+    network timeout, which is never changed, are seen as timed out too and retried.
+
+    When given a `thread`, the reply lives in that thread while running and the requests
+    are sent with the QGIS network access manager of that thread. Its signals reach
+    the slots in other threads as queued signals. Once finished, the network reply is
+    detached: its outcome and unread data are kept and it is deleted in its own thread,
+    then the reply is moved back to the thread that created it, where it is then read
+    and released. The consumers reading the data in the thread of the reply connect
+    to `data_finished` instead of `finished`.
+
+    Replies have no parent. The network manager keeps them alive while running and
+    until the `finished` slots are called, then they are owned by the consumers
+    referencing them and deleted along with their last reference. Consumers call
+    `release` as soon as they are done with the data, while the outcome stays
+    available to whoever still exposes the reply.
+    """
+
+    """The attributes of the network reply still available once the network reply is detached."""
+    DETACHED_ATTRIBUTES = (
+        QNetworkRequest.HttpStatusCodeAttribute,
+        QNetworkRequest.HttpReasonPhraseAttribute,
+        QNetworkRequest.RedirectionTargetAttribute,
+    )
+
+    """The headers of the network reply still available once the network reply is detached."""
+    DETACHED_HEADERS = (
+        QNetworkRequest.ContentTypeHeader,
+        QNetworkRequest.ContentLengthHeader,
+        QNetworkRequest.LocationHeader,
+    )
+
     finished = pyqtSignal()
-    metaDataChanged = pyqtSignal()
-    preSharedKeyAuthenticationRequired = pyqtSignal(QSslPreSharedKeyAuthenticator)
-    redirectAllowed = pyqtSignal()
-    redirected = pyqtSignal(QUrl)
-    sslErrors = pyqtSignal(list)
+    # emitted in the thread of the reply once finished, before the network reply is detached
+    data_finished = pyqtSignal()
+    readyRead = pyqtSignal()
+    downloadProgress = pyqtSignal(int, int)
     uploadProgress = pyqtSignal(int, int)
+    redirected = pyqtSignal(QUrl)
+    # emitted with the number of retries so far and the delay in milliseconds before the next attempt
+    retrying = pyqtSignal(int, int)
+    # emitted with the reply itself when rejected with 401, to be resumed once the token is renewed
+    reauthentication_requested = pyqtSignal(QObject)
+    _send_requested = pyqtSignal()
+    _abort_requested = pyqtSignal()
+    _resume_requested = pyqtSignal(bool)
+    _finish_delivered = pyqtSignal()
+
+    def __init__(
+        self,
+        network_manager: "CloudNetworkAccessManager",
+        send_request: Callable[[QgsNetworkAccessManager], QNetworkReply],
+        retry_policy: Optional[CloudRetryPolicy] = None,
+        is_idempotent: bool = True,
+        thread: Optional[QThread] = None,
+    ) -> None:
+        # objects with a parent cannot be moved to another thread
+        super(CloudReply, self).__init__()
+
+        self.network_manager = network_manager
+        self.retry_policy = retry_policy
+        self.is_idempotent = is_idempotent
+        self.retries_count = 0
+        # whether the request is sent again with a renewed token when rejected with 401
+        self.can_reauthenticate = True
+        # the token the last attempt has been sent with
+        self.sent_token = ""
+        self._is_reauthenticated = False
+        self._is_released = False
+        # the outcome and the unread data of the reply, kept once the network reply is detached
+        self._is_detached = False
+        self._detached_error = QNetworkReply.NoError
+        self._detached_error_string = ""
+        self._detached_attributes: Dict[QNetworkRequest.Attribute, Any] = {}
+        self._detached_headers: Dict[QNetworkRequest.KnownHeaders, Any] = {}
+        self._detached_raw_headers: Dict[bytes, QByteArray] = {}
+        self._detached_url = QUrl()
+        self._detached_data = QByteArray()
+        self.stall_timeout_ms = network_manager.stall_timeout_ms
+        self._send_request = send_request
+        self._reply: Optional[QNetworkReply] = None
+        self._is_aborted = False
+        # the last attempt has been aborted because no bytes were transferred for too long
+        self._is_stalled = False
+        self._is_finished = False
+        # the data of an attempt has been consumed before it finished, so it cannot be retried transparently
+        self._is_partially_read = False
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._send)
+        self._stall_timer = QTimer(self)
+        self._stall_timer.setSingleShot(True)
+        self._stall_timer.timeout.connect(self._on_stalled)
+        self._abort_requested.connect(self._abort)
+        self._resume_requested.connect(self._resume)
+        self.reauthentication_requested.connect(
+            network_manager._on_reauthentication_requested
+        )
+        # the thread to move the finished reply back to
+        self._home_thread: Optional[QThread] = None
+
+        network_manager._running_replies.add(self)
+        network_manager._live_replies.add(self)
+        # queued in the thread the reply is moved back to, after the `finished` slots there
+        self._finish_delivered.connect(self._on_finish_delivered, Qt.QueuedConnection)
+
+        if thread is None:
+            self._send()
+        else:
+            self._home_thread = self.thread()
+            self.moveToThread(thread)
+            self._send_requested.connect(self._send)
+            # sent on the next event loop iteration, once the caller connected to the signals
+            QTimer.singleShot(0, self._send_requested.emit)
+
+    @property
+    def raw_reply(self) -> QNetworkReply:
+        """The reply of the last attempt."""
+        assert self._reply
+
+        return self._reply
+
+    @property
+    def is_released(self) -> bool:
+        return self._is_released
+
+    @property
+    def buffered_bytes(self) -> int:
+        """The number of received bytes not read yet."""
+        if self._is_detached:
+            return self._detached_data.size()
+
+        if self._reply is None:
+            return 0
+
+        return self._reply.bytesAvailable()
+
+    @pyqtSlot()
+    def release(self) -> None:
+        """Drops the unread data and the headers of the reply, once its consumer is done with them.
+
+        Only the outcome of the reply remains available afterwards: the error, the url
+        and the status attributes. The reply itself is not deleted, so it can still be
+        exposed, e.g. as the last reply of a transfer. Releasing a running reply
+        releases it once finished.
+        """
+        if self._is_released:
+            return
+
+        if not self._is_finished:
+            self.finished.connect(self.release)
+            return
+
+        self._is_released = True
+        self._detached_data = QByteArray()
+        self._detached_headers = {}
+        self._detached_raw_headers = {}
+        self.network_manager._live_replies.discard(self)
+
+    def abort(self) -> None:
+        if self._is_finished:
+            return
+
+        if QThread.currentThread() is not self.thread():
+            self._abort_requested.emit()
+            return
+
+        self._abort()
+
+    @pyqtSlot()
+    def _abort(self) -> None:
+        if self._is_finished:
+            return
+
+        self._is_aborted = True
+
+        if (
+            self._reply is None
+            or self._reply.isFinished()
+            or self._retry_timer.isActive()
+        ):
+            self._retry_timer.stop()
+            self._finish()
+        else:
+            self._reply.abort()
+
+    def resume(self, is_authenticated: bool) -> None:
+        """Sends the request rejected with 401 again, or finishes it if the token could not be renewed."""
+        if QThread.currentThread() is not self.thread():
+            self._resume_requested.emit(is_authenticated)
+            return
+
+        self._resume(is_authenticated)
+
+    @pyqtSlot(bool)
+    def _resume(self, is_authenticated: bool) -> None:
+        if self._is_finished:
+            return
+
+        if is_authenticated and not self._is_aborted:
+            self._send()
+        else:
+            self._finish()
+
+    def isFinished(self) -> bool:
+        return self._is_finished
+
+    def error(self) -> QNetworkReply.NetworkError:
+        if self._is_detached:
+            return self._detached_error
+
+        if self._is_aborted:
+            return QNetworkReply.OperationCanceledError
+
+        if self._is_stalled:
+            return QNetworkReply.TimeoutError
+
+        return self.raw_reply.error()
+
+    def errorString(self) -> str:
+        if self._is_detached:
+            return self._detached_error_string
+
+        if self._is_stalled and not self._is_aborted:
+            return self.tr("No data transferred for {} seconds").format(
+                self.stall_timeout_ms // 1000
+            )
+
+        if self._is_aborted and (
+            self._reply is None
+            or self._reply.error() != QNetworkReply.OperationCanceledError
+        ):
+            return self.tr("Operation canceled")
+
+        return self.raw_reply.errorString()
+
+    def readAll(self) -> QByteArray:
+        if self._is_detached:
+            data = self._detached_data
+            self._detached_data = QByteArray()
+
+            return data
 
-    def __init__(self, reply: QNetworkReply):
-        self.rawReply = QNetworkReply
-        # self.redi
+        if not self.raw_reply.isFinished():
+            self._is_partially_read = True
+
+        return self.raw_reply.readAll()
+
+    def attribute(self, code: QNetworkRequest.Attribute) -> Any:
+        if self._is_detached:
+            return self._detached_attributes.get(code)
+
+        # the request might have been aborted before being sent from its thread
+        if self._reply is None:
+            return None
+
+        return self.raw_reply.attribute(code)
+
+    def header(self, header: QNetworkRequest.KnownHeaders) -> Any:
+        if self._is_detached:
+            return self._detached_headers.get(header)
+
+        return self.raw_reply.header(header)
+
+    def hasRawHeader(self, name: bytes) -> bool:
+        if self._is_detached:
+            return bytes(name).lower() in self._detached_raw_headers
+
+        return self.raw_reply.hasRawHeader(name)
+
+    def rawHeader(self, name: bytes) -> QByteArray:
+        if self._is_detached:
+            return self._detached_raw_headers.get(bytes(name).lower(), QByteArray())
+
+        return self.raw_reply.rawHeader(name)
+
+    def url(self) -> QUrl:
+        if self._is_detached:
+            return self._detached_url
+
+        return self.raw_reply.url()
+
+    @pyqtSlot()
+    def _send(self) -> None:
+        if self._is_finished:
+            return
+
+        if self._reply:
+            self._reply.deleteLater()
+
+        self._is_stalled = False
+        self.sent_token = self.network_manager._token
+
+        # each thread has its own QGIS network access manager, sharing the SSL and auth configuration
+        nam = QgsNetworkAccessManager.instance()
+        reply = self._send_request(nam)
+
+        reply.sslErrors.connect(lambda sslErrors: reply.ignoreSslErrors(sslErrors))
+        reply.setParent(self)
+        reply.readyRead.connect(self.readyRead)
+        reply.downloadProgress.connect(self.downloadProgress)
+        reply.uploadProgress.connect(self.uploadProgress)
+        reply.redirected.connect(self.redirected)
+        reply.downloadProgress.connect(self._restart_stall_timer)
+        reply.uploadProgress.connect(self._restart_stall_timer)
+        reply.finished.connect(lambda: self._on_reply_finished(reply))
+
+        self._reply = reply
+        self._restart_stall_timer()
+
+    def _restart_stall_timer(self, *_args) -> None:
+        if self.stall_timeout_ms > 0:
+            self._stall_timer.start(self.stall_timeout_ms)
+
+    def _on_stalled(self) -> None:
+        if not self._reply or self._reply.isFinished():
+            return
+
+        QgsMessageLog.logMessage(
+            self.tr('Request to "{}" stalled for {} ms, aborting').format(
+                self._reply.url().toString(QUrl.RemoveQuery), self.stall_timeout_ms
+            ),
+            "QFieldSync",
+            Qgis.Info,
+        )
+
+        self._is_stalled = True
+        self._reply.abort()
+
+    def _on_reply_finished(self, reply: QNetworkReply) -> None:
+        if reply is not self._reply:
+            return
+
+        self._stall_timer.stop()
+
+        # canceled without being aborted, by the transfer timeout of the request or by the QGIS one
+        if (
+            not self._is_aborted
+            and reply.error() == QNetworkReply.OperationCanceledError
+        ):
+            self._is_stalled = True
+
+        if (
+            self.can_reauthenticate
+            and not self._is_reauthenticated
+            and not self._is_aborted
+            and not self._is_partially_read
+            and self.sent_token
+            and reply.attribute(QNetworkRequest.HttpStatusCodeAttribute) == 401
+        ):
+            # only once, a request rejected again with the renewed token is not allowed
+            self._is_reauthenticated = True
+            self.reauthentication_requested.emit(self)
+            return
+
+        # the policy is given this reply, so stalled attempts are seen as timed out
+        if (
+            self.retry_policy
+            and not self._is_aborted
+            and not self._is_partially_read
+            and self.retry_policy.should_retry(
+                self, self.retries_count + 1, self.is_idempotent
+            )
+        ):
+            self.retries_count += 1
+            delay_ms = self.retry_policy.get_delay_ms(self, self.retries_count)
+
+            QgsMessageLog.logMessage(
+                self.tr(
+                    'Retrying request to "{}" in {} ms after error: [{}] {}'
+                ).format(
+                    reply.url().toString(QUrl.RemoveQuery),
+                    delay_ms,
+                    self.error(),
+                    self.errorString(),
+                ),
+                "QFieldSync",
+                Qgis.Info,
+            )
+
+            self.retrying.emit(self.retries_count, delay_ms)
+            self._retry_timer.start(delay_ms)
+            return
+
+        self._finish()
+
+    def _finish(self) -> None:
+        self._stall_timer.stop()
+        self._is_finished = True
+        # the request and its payload are not sent anymore
+        self._send_request = None
+
+        self.data_finished.emit()
+        self._detach()
+
+        if self._home_thread is not None:
+            # the network reply is gone, nothing is left in the thread of the requests
+            self.moveToThread(self._home_thread)
+
+        self.finished.emit()
+        self._finish_delivered.emit()
+
+    @pyqtSlot()
+    def _on_finish_delivered(self) -> None:
+        # from now on, the reply lives as long as its consumers reference it
+        self.network_manager._running_replies.discard(self)
+
+    def _detach(self) -> None:
+        """Keeps the outcome and the unread data of the network reply, then deletes it in its own thread."""
+        self._detached_error = self.error()
+        self._detached_error_string = self.errorString()
+
+        reply = self._reply
+
+        if reply is not None:
+            self._detached_url = reply.url()
+            self._detached_attributes = {
+                code: reply.attribute(code) for code in self.DETACHED_ATTRIBUTES
+            }
+            self._detached_headers = {
+                header: reply.header(header) for header in self.DETACHED_HEADERS
+            }
+            self._detached_raw_headers = {
+                bytes(name).lower(): value for name, value in reply.rawHeaderPairs()
+            }
+            self._detached_data = reply.readAll()
+
+            # given back to the network access manager of its thread, which deletes it
+            # along with the multipart bodies keeping the uploaded files open
+            reply.setParent(QgsNetworkAccessManager.instance())
+            reply.deleteLater()
+
+        self._reply = None
+        self._is_detached = True
 
 
 class CloudProjectsCache(QObject):
+    PROJECTS_PAGE_SIZE = 250
+
     projects_started = pyqtSignal()
+    # emitted with the ids of all the projects contained in each received page
+    projects_page_updated = pyqtSignal(list)
+    # emitted with the ids of the projects that appeared, disappeared or changed since the previous refresh
+    projects_added = pyqtSignal(list)
+    projects_removed = pyqtSignal(list)
+    projects_changed = pyqtSignal(list)
+    # emitted when the refresh is finished or the projects list is reset
     projects_updated = pyqtSignal()
     projects_error = pyqtSignal(str)
     project_files_started = pyqtSignal(str)
+    project_files_received = pyqtSignal(str, list)
     project_files_updated = pyqtSignal(str)
     project_files_error = pyqtSignal(str, str)
 
@@ -745,12 +2075,27 @@ class CloudProjectsCache(QObject):
         self.network_manager = network_manager
         self._error_reason = ""
         self._projects: Optional[List[CloudProject]] = None
-        self._projects_reply: Optional[QNetworkReply] = None
+        self._projects_reply: Optional[CloudPaginatedReply] = None
+        self._project_files_replies: Dict[str, CloudReply] = {}
+        # the files received so far by the running requests, by project id
+        self._received_project_files: Dict[str, List[ProjectFile]] = {}
+        self._refreshed_project_ids: Set[str] = set()
+        self._watched_dirs: Dict[str, List[str]] = {}
+        # indexes of the projects, kept in sync with `_projects` on every update
+        self._projects_by_id: Dict[str, CloudProject] = {}
+        self._projects_by_name_with_owner: Dict[str, CloudProject] = {}
+        self._project_names_count: Dict[str, int] = {}
+        self._project_ids_by_local_dir: Dict[str, List[str]] = {}
+        self._local_dir_keys_by_project_id: Dict[str, str] = {}
         self._fs_watcher = QFileSystemWatcher()
         self._fs_watcher.directoryChanged.connect(self._on_directory_changed)
 
         self.network_manager.token_changed.connect(self._on_token_changed)
-        self.projects_updated.connect(self._on_projects_updated)
+        self.projects_added.connect(self._on_projects_added)
+        self.projects_removed.connect(self._on_projects_removed)
+
+        self._index_local_dirs()
+        preferences_cache.value_changed.connect(self._on_preference_changed)
 
         if self.network_manager.has_token():
             self.refresh()
@@ -773,16 +2118,15 @@ class CloudProjectsCache(QObject):
         Returns:
             bool: opened QGIS project is configured cloud project
         """
-        project_dir = QgsProject.instance().homePath()
-        project_ids = [p.id for p in self.projects] if self.projects else []
+        project_ids = self._get_project_ids_by_local_dir(
+            QgsProject.instance().homePath()
+        )
 
-        for project_id, local_dir in self.preferences.value(
-            "qfieldCloudProjectLocalDirs"
-        ).items():
-            if project_ids and project_id not in project_ids:
-                continue
+        if not self._projects_by_id:
+            return len(project_ids) > 0
 
-            if local_dir and Path(local_dir) == Path(project_dir):
+        for project_id in project_ids:
+            if project_id in self._projects_by_id:
                 return True
 
         return False
@@ -796,17 +2140,12 @@ class CloudProjectsCache(QObject):
         Returns:
             Optional[CloudProject]: associated cloud project
         """
-        project_dir = QgsProject.instance().homePath()
-
         if not self.projects:
             return
 
-        for project_id, local_dir in self.preferences.value(
-            "qfieldCloudProjectLocalDirs"
-        ).items():
-            if not local_dir or Path(local_dir) != Path(project_dir):
-                continue
-
+        for project_id in self._get_project_ids_by_local_dir(
+            QgsProject.instance().homePath()
+        ):
             cloud_project = self.find_project(project_id)
 
             if cloud_project is not None:
@@ -816,31 +2155,44 @@ class CloudProjectsCache(QObject):
         if not self.projects:
             return None
 
-        names = [p.name for p in self.projects]
-        if name not in names:
+        if not self.has_project_name(name):
             return name
 
         i = 1
         while True:
             new_name = f"{name}_{i}"
 
-            if new_name not in names:
+            if not self.has_project_name(new_name):
                 return new_name
 
             i += 1
 
-    def refresh(self) -> QNetworkReply:
-        # TODO this abort appears sometimes in the UI, think how to hide it?
-        if self._projects_reply:
-            self._projects_reply.abort()
+    def has_project_name(self, name: str) -> bool:
+        """Checks whether any of the projects, regardless of the owner, is called `name`."""
+        return self._project_names_count.get(name, 0) > 0
+
+    def refresh(self, force: bool = False) -> CloudPaginatedReply:
+        """Refreshes the projects list, sharing the running refresh unless `force`.
+
+        Refreshes following a change must `force`, as the running refresh might have been
+        sent before the change. It is then superseded, its results are ignored.
+        """
+        if not force and self._projects_reply and not self._projects_reply.isFinished():
+            return self._projects_reply
 
         self.projects_started.emit()
-        self._projects_reply = self.network_manager.get_projects()
-        self._projects_reply.finished.connect(
-            lambda: self._on_get_projects_reply_finished(self._projects_reply)
+
+        reply = self.network_manager.get_projects(
+            page_size=self.PROJECTS_PAGE_SIZE, force=force
         )
+        reply.page_finished.connect(
+            lambda payload: self._on_get_projects_page_finished(reply, payload)
+        )
+        reply.finished.connect(lambda: self._on_get_projects_reply_finished(reply))
+
+        self._projects_reply = reply
 
-        return self._projects_reply
+        return reply
 
     def refresh_not_async(self) -> None:
         """Projects are requested in synchronous manner.
@@ -849,92 +2201,306 @@ class CloudProjectsCache(QObject):
         """
         self.projects_started.emit()
 
-        payload = self.network_manager.get_projects_not_async()
+        payload = self.network_manager.get_projects_not_async(
+            page_size=self.PROJECTS_PAGE_SIZE
+        )
 
-        self._projects = []
-
-        for project_data in payload:
-            self._projects.append(CloudProject(project_data))
+        self._refreshed_project_ids = set()
+        self._merge_projects(payload)
+        self._remove_unrefreshed_projects()
 
         self.projects_updated.emit()
 
-    def get_project_files(self, project_id: str) -> QNetworkReply:
+    def get_project_files(self, project_id: str, force: bool = False) -> "CloudReply":
+        """Fetches the files of the project, sharing the running request unless `force`, see `refresh`."""
         assert project_id
 
+        # the files of the project are already being fetched, share the same reply
+        if not force and project_id in self._project_files_replies:
+            return self._project_files_replies[project_id]
+
         self.project_files_started.emit(project_id)
-        reply = self.network_manager.get_files(project_id)
+        reply = self.network_manager.get_files(project_id, force=force)
+        self._project_files_replies[project_id] = reply
+        parser = JsonArrayStreamParser()
+        project_files: List[ProjectFile] = []
+        self._received_project_files[project_id] = project_files
+        reply.readyRead.connect(
+            lambda: self._on_get_project_files_reply_ready_read(
+                reply, parser, project_files, project_id
+            )
+        )
         reply.finished.connect(
             lambda: self._on_get_project_files_reply_finished(
-                reply, project_id=project_id
+                reply, parser, project_files, project_id=project_id
             )
         )
         return reply
 
+    def get_received_project_files(self, project_id: str) -> List[ProjectFile]:
+        """Returns the files received so far while fetching the files of the project, see `get_project_files`.
+
+        The `project_files_received` signal is emitted only once for each file, so the
+        views set up while the files are being fetched start from these.
+        """
+        return list(self._received_project_files.get(project_id, []))
+
     def find_project(self, project_id: str) -> Optional[CloudProject]:
-        if not self._projects or not project_id:
+        if not project_id:
             return
 
-        for project in self._projects:
-            if project.id == project_id:
-                return project
+        return self._projects_by_id.get(project_id)
+
+    def find_project_by_name_with_owner(
+        self, name_with_owner: str
+    ) -> Optional[CloudProject]:
+        return self._projects_by_name_with_owner.get(name_with_owner)
+
+    def _index_project(self, cloud_project: CloudProject) -> None:
+        self._projects_by_id[cloud_project.id] = cloud_project
+        self._projects_by_name_with_owner[cloud_project.name_with_owner] = cloud_project
+        self._project_names_count[cloud_project.name] = (
+            self._project_names_count.get(cloud_project.name, 0) + 1
+        )
+
+    def _unindex_project(self, cloud_project: CloudProject) -> None:
+        self._projects_by_id.pop(cloud_project.id, None)
+
+        if (
+            self._projects_by_name_with_owner.get(cloud_project.name_with_owner)
+            is cloud_project
+        ):
+            del self._projects_by_name_with_owner[cloud_project.name_with_owner]
+
+        names_count = self._project_names_count.get(cloud_project.name, 0) - 1
+        if names_count > 0:
+            self._project_names_count[cloud_project.name] = names_count
+        else:
+            self._project_names_count.pop(cloud_project.name, None)
+
+    @staticmethod
+    def _local_dir_key(local_dir: str) -> str:
+        """Normalized form of a local directory, so equal paths get equal keys, the same way `Path` compares them."""
+        return os.path.normcase(str(Path(local_dir)))
+
+    def _get_project_ids_by_local_dir(self, local_dir: str) -> List[str]:
+        if not local_dir:
+            return []
+
+        return self._project_ids_by_local_dir.get(self._local_dir_key(local_dir), [])
+
+    def _index_local_dirs(self) -> None:
+        """Rebuilds the index of the configured project local directories."""
+        self._project_ids_by_local_dir = {}
+        self._local_dir_keys_by_project_id = {}
+
+        for project_id, local_dir in preferences_cache.project_local_dirs().items():
+            self._index_local_dir(project_id, local_dir)
+
+    def _index_local_dir(self, project_id: str, local_dir: Optional[str]) -> None:
+        """Updates the index with the configured local directory of a single project."""
+        previous_key = self._local_dir_keys_by_project_id.pop(project_id, None)
+
+        if previous_key is not None:
+            project_ids = self._project_ids_by_local_dir[previous_key]
+            project_ids.remove(project_id)
+
+            if not project_ids:
+                del self._project_ids_by_local_dir[previous_key]
+
+        if not local_dir:
+            return
+
+        key = self._local_dir_key(local_dir)
+        self._local_dir_keys_by_project_id[project_id] = key
+        self._project_ids_by_local_dir.setdefault(key, []).append(project_id)
 
     def refresh_filesystem_watchers(self, _dirpath: str = "") -> None:
-        # TODO in theory we can update only the _dirpath. There are gothas with links etc, better keep it KISS for now
-        if self._fs_watcher.directories():
-            self._fs_watcher.removePaths(self._fs_watcher.directories())
+        for project_id in list(self._watched_dirs.keys()):
+            self._unwatch_project(project_id)
 
         if self._projects:
             for project in self._projects:
-                if not project.local_dir:
-                    continue
+                self._watch_project(project)
+
+    def _watch_project(self, project: CloudProject) -> None:
+        # TODO in theory we can update only the changed dirpath. There are gothas with links etc, better keep it KISS for now
+        self._unwatch_project(project.id)
+
+        if not project.local_dir:
+            return
+
+        dirnames = [project.local_dir]
+        project_dirpath = Path(project.local_dir)
+        for project_child_dirpath in project_dirpath.glob("**/"):
+            project_child_dirname = str(project_child_dirpath)
 
-                project_dirpath = Path(project.local_dir)
-                for project_child_dirpath in project_dirpath.glob("**/"):
-                    project_child_dirname = str(project_child_dirpath)
+            # ignore QFieldSync caches
+            if project_child_dirname.startswith(
+                str(project_dirpath.joinpath(".qfieldsync"))
+            ):
+                continue
+
+            dirnames.append(project_child_dirname)
+
+        self._fs_watcher.addPaths(dirnames)
+        self._watched_dirs[project.id] = dirnames
+
+    def _unwatch_project(self, project_id: str) -> None:
+        dirnames = self._watched_dirs.pop(project_id, None)
+
+        if dirnames:
+            self._fs_watcher.removePaths(dirnames)
+
+    def _merge_projects(self, payload: List[Dict[str, Any]]) -> None:
+        """Adds the new projects and updates the existing ones in place, so `CloudProject` instances keep their identity."""
+        if self._projects is None:
+            self._projects = []
+
+        added_ids = []
+        changed_ids = []
+        for project_data in payload:
+            cloud_project = self.find_project(project_data["id"])
+
+            if cloud_project is None:
+                cloud_project = CloudProject(
+                    project_data, self._on_project_local_dir_changed
+                )
+                self._projects.append(cloud_project)
+                self._index_project(cloud_project)
+                added_ids.append(cloud_project.id)
+            elif cloud_project.has_changes(project_data):
+                self._unindex_project(cloud_project)
+                cloud_project.update_data(project_data)
+                self._index_project(cloud_project)
+                changed_ids.append(cloud_project.id)
 
-                    # ignore QFieldSync caches
-                    if project_child_dirname.startswith(
-                        str(project_dirpath.joinpath(".qfieldsync"))
-                    ):
-                        continue
+            self._refreshed_project_ids.add(cloud_project.id)
 
-                    self._fs_watcher.addPath(project_child_dirname)
+        if added_ids:
+            self.projects_added.emit(added_ids)
 
-                self._fs_watcher.addPath(project.local_dir)
+        if changed_ids:
+            self.projects_changed.emit(changed_ids)
+
+    def _remove_unrefreshed_projects(self) -> None:
+        if not self._projects:
+            return
+
+        removed_ids = [
+            p.id for p in self._projects if p.id not in self._refreshed_project_ids
+        ]
+
+        if not removed_ids:
+            return
+
+        for project_id in removed_ids:
+            self._unindex_project(self._projects_by_id[project_id])
+
+        self._projects = [
+            p for p in self._projects if p.id in self._refreshed_project_ids
+        ]
+        self.projects_removed.emit(removed_ids)
+
+    def _on_get_projects_page_finished(
+        self, reply: CloudPaginatedReply, payload: List[Dict[str, Any]]
+    ) -> None:
+        if reply is not self._projects_reply:
+            return
+
+        if reply.pages_count == 1:
+            self._refreshed_project_ids = set()
+
+        self._merge_projects(payload)
+
+        self.projects_page_updated.emit([p["id"] for p in payload])
+
+    def _on_get_projects_reply_finished(self, reply: CloudPaginatedReply) -> None:
+        # released once all the `finished` slots of the callers are called
+        QTimer.singleShot(0, reply.release)
 
-    def _on_get_projects_reply_finished(self, reply: QNetworkReply) -> None:
         if reply.error() == QNetworkReply.OperationCanceledError:
             return
 
+        if reply is not self._projects_reply:
+            return
+
         self._projects_reply = None
 
-        try:
-            payload = self.network_manager.json_array(reply)
-        except Exception as err:
-            self.projects_error.emit(str(err))
+        if reply.error_exception:
+            self.projects_error.emit(str(reply.error_exception))
             return
 
-        self._projects = []
+        # only a complete list tells which projects are gone
+        self._remove_unrefreshed_projects()
 
-        for project_data in payload:
-            cloud_project = CloudProject(project_data)
+        self.projects_updated.emit()
 
-            self._projects.append(cloud_project)
+    def _read_project_files(
+        self,
+        reply: QNetworkReply,
+        parser: JsonArrayStreamParser,
+        project_files: List[ProjectFile],
+        cloud_project: CloudProject,
+    ) -> None:
+        received_files = [
+            ProjectFile(file_obj, local_dir=cloud_project.local_dir)
+            for file_obj in self.network_manager.json_array_stream(reply, parser)
+        ]
 
-        self.projects_updated.emit()
+        if received_files:
+            project_files.extend(received_files)
+            self.project_files_received.emit(cloud_project.id, received_files)
+
+    def _on_get_project_files_reply_ready_read(
+        self,
+        reply: QNetworkReply,
+        parser: JsonArrayStreamParser,
+        project_files: List[ProjectFile],
+        project_id: str,
+    ) -> None:
+        # superseded by a forced request, see `get_project_files`
+        if self._project_files_replies.get(project_id) is not reply:
+            return
+
+        cloud_project = self.find_project(project_id)
+
+        if not cloud_project:
+            return
+
+        try:
+            self._read_project_files(reply, parser, project_files, cloud_project)
+        except Exception:
+            # the same error is raised again and reported once the reply is finished
+            pass
 
     def _on_get_project_files_reply_finished(
-        self, reply: QNetworkReply, project_id: str = None
+        self,
+        reply: QNetworkReply,
+        parser: JsonArrayStreamParser,
+        project_files: List[ProjectFile],
+        project_id: str = None,
     ) -> None:
         assert project_id
 
+        # released once all the `finished` slots of the callers are called
+        QTimer.singleShot(0, reply.release)
+
+        # superseded by a forced request, see `get_project_files`
+        if self._project_files_replies.get(project_id) is not reply:
+            return
+
+        del self._project_files_replies[project_id]
+        del self._received_project_files[project_id]
+
         cloud_project = self.find_project(project_id)
 
         if not cloud_project:
             return
 
         try:
-            payload = self.network_manager.json_array(reply)
+            self._read_project_files(reply, parser, project_files, cloud_project)
+            payload = project_files
         except Exception as err:
             payload = None
             self.project_files_error.emit(project_id, str(err))
@@ -944,21 +2510,61 @@ class CloudProjectsCache(QObject):
         self.project_files_updated.emit(project_id)
 
     def _on_token_changed(self) -> None:
+        # the running requests were made on behalf of the previous user
+        if self._projects_reply:
+            self._projects_reply.abort()
+
+        if self._projects:
+            self.projects_removed.emit([p.id for p in self._projects])
+
         self._projects = None
+        self._projects_by_id = {}
+        self._projects_by_name_with_owner = {}
+        self._project_names_count = {}
+
+        # aborted after the projects are gone, so the files are not updated
+        for reply in list(self._project_files_replies.values()):
+            reply.abort()
+
         self.projects_updated.emit()
 
         if self.network_manager.has_token():
             self.refresh()
 
-    def _on_projects_updated(self) -> None:
-        self.refresh_filesystem_watchers()
+    def _on_project_local_dir_changed(self, cloud_project: CloudProject) -> None:
+        self._watch_project(cloud_project)
+
+    def _on_preference_changed(self, name: str, key: str) -> None:
+        # local directories might be configured also by projects outside of the cache
+        if name != "qfieldCloudProjectLocalDirs":
+            return
+
+        if key:
+            self._index_local_dir(key, preferences_cache.project_local_dir(key))
+        else:
+            self._index_local_dirs()
+
+    def _on_projects_added(self, project_ids: List[str]) -> None:
+        for project_id in project_ids:
+            cloud_project = self.find_project(project_id)
+
+            if cloud_project:
+                self._watch_project(cloud_project)
+
+    def _on_projects_removed(self, project_ids: List[str]) -> None:
+        for project_id in project_ids:
+            self._unwatch_project(project_id)
 
     def _on_directory_changed(self, dirpath: str) -> None:
         if not self._projects:
             return
 
-        self.refresh_filesystem_watchers(dirpath)
-
         for project in self._projects:
+            if (
+                project.id in self._watched_dirs
+                and dirpath in self._watched_dirs[project.id]
+            ):
+                self._watch_project(project)
+
             if dirpath == project.local_dir:
                 project.refresh_files()
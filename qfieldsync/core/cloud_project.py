@@ -22,15 +22,38 @@
 
 import hashlib
 import sqlite3
+import sys
 from enum import IntFlag
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from libqfieldsync.utils.qgis import get_qgis_files_within_dir
 from qgis.core import QgsProject
 from qgis.PyQt.QtCore import QDir
 
-from qfieldsync.core.preferences import Preferences
+from qfieldsync.core.preferences import preferences_cache
+from qfieldsync.core.sync_manifest import SyncManifest
+
+
+_version_keys_cache: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern_path_parts(name: str) -> Tuple[str, ...]:
+    """Splits the file name into path parts, all but the basename are interned as they repeat across files."""
+    parts = name.split("/")
+
+    return tuple(sys.intern(part) for part in parts[:-1]) + (parts[-1],)
+
+
+def _intern_version_keys(versions: List[Dict[str, Any]]) -> Tuple[str, ...]:
+    """Returns the union of the version keys, shared between all files with the same keys."""
+    keys: Dict[str, None] = {}
+    for version in versions:
+        keys.update(dict.fromkeys(version))
+
+    keys_tuple = tuple(sys.intern(key) for key in keys)
+
+    return _version_keys_cache.setdefault(keys_tuple, keys_tuple)
 
 
 class ProjectFileCheckout(IntFlag):
@@ -41,14 +64,47 @@ class ProjectFileCheckout(IntFlag):
 
 
 class ProjectFile:
+    """A cloud and/or local file of a project.
+
+    Projects might contain hundreds of thousands of files, so only the needed values are
+    kept from the server response, the directory names are interned and the version
+    history is stored as tuples, materialized as dicts only when requested.
+    """
+
+    __slots__ = (
+        "_local_dir",
+        "_name",
+        "_parts",
+        "_size",
+        "_sha256",
+        "_version_keys",
+        "_version_values",
+    )
+
     def __init__(self, data: Dict[str, Any], local_dir: str = None) -> None:
         self._local_dir = local_dir
-        self._temp_dir = None
-        self._data = data
+        self._name: str = data["name"]
+        self._parts = _intern_path_parts(self._name)
+        self._size: Optional[int] = data.get("size")
+        self._sha256: Optional[str] = data.get("sha256")
+        self._version_keys: Tuple[str, ...] = ()
+        self._version_values: Optional[Tuple[Tuple[Any, ...], ...]] = None
+
+        versions = data.get("versions")
+        if versions is not None:
+            self._version_keys = _intern_version_keys(versions)
+            self._version_values = tuple(
+                tuple(version.get(key) for key in self._version_keys)
+                for version in versions
+            )
 
     @property
     def name(self) -> str:
-        return self._data["name"]
+        return self._name
+
+    @property
+    def parts(self) -> Tuple[str, ...]:
+        return self._parts
 
     @property
     def path(self) -> Path:
@@ -60,21 +116,29 @@ class ProjectFile:
 
     @property
     def created_at(self) -> Optional[str]:
-        if not self.versions:
-            return
-
-        return self.versions[-1].get("last_modified")
+        return self._get_version_value(-1, "last_modified")
 
     @property
     def updated_at(self) -> Optional[str]:
-        if not self.versions:
-            return
-
-        return self.versions[0].get("last_modified")
+        return self._get_version_value(0, "last_modified")
 
     @property
     def versions(self) -> Optional[List[Dict[str, str]]]:
-        return self._data.get("versions")
+        if self._version_values is None:
+            return None
+
+        return [
+            dict(zip(self._version_keys, values)) for values in self._version_values
+        ]
+
+    def set_local_dir(self, local_dir: Optional[str]) -> None:
+        self._local_dir = local_dir
+
+    def _get_version_value(self, version_idx: int, key: str) -> Optional[Any]:
+        if not self._version_values or key not in self._version_keys:
+            return None
+
+        return self._version_values[version_idx][self._version_keys.index(key)]
 
     @property
     def checkout(self) -> ProjectFileCheckout:
@@ -91,11 +155,11 @@ class ProjectFile:
 
     @property
     def size(self) -> Optional[int]:
-        return self._data.get("size")
+        return self._size
 
     @property
     def sha256(self) -> Optional[str]:
-        return self._data.get("sha256")
+        return self._sha256
 
     @property
     def local_size(self) -> Optional[int]:
@@ -143,13 +207,19 @@ class ProjectFile:
 
 
 class CloudProject:
-    def __init__(self, project_data: Dict[str, Any]) -> None:
+    def __init__(
+        self,
+        project_data: Dict[str, Any],
+        local_dir_changed_cb: Optional[Callable[["CloudProject"], None]] = None,
+    ) -> None:
         """Constructor."""
-        self._preferences = Preferences()
+        self._local_dir_changed_cb = local_dir_changed_cb
         self._files = {}
         self._data = {}
         self._cloud_files = None
         self._local_dir = None
+        # the project files only saved again by QGIS, as found by the last `files_to_sync`
+        self.suppressed_project_files: List[ProjectFile] = []
 
         self.update_data(project_data)
 
@@ -165,19 +235,14 @@ class CloudProject:
             if self._local_dir and not Path(self._local_dir).is_absolute():
                 self._local_dir = None
 
-            old_project_local_dirs = self._preferences.value(
-                "qfieldCloudProjectLocalDirs"
-            )
-            new_value = {
-                **old_project_local_dirs,
-                self.id: self._local_dir,
-            }
-
-            self._preferences.set_value("qfieldCloudProjectLocalDirs", new_value)
+            preferences_cache.set_project_local_dir(self.id, self._local_dir)
 
             if self._local_dir:
                 Path(self._local_dir).mkdir(exist_ok=True, parents=True)
 
+            if self._local_dir_changed_cb:
+                self._local_dir_changed_cb(self)
+
         # NOTE the cloud_files value is a list and may be in any order, so always assume that if the key is present in the new data, then there is a change
         if "cloud_files" in new_data:
             self._cloud_files = self._data.get("cloud_files")
@@ -185,27 +250,39 @@ class CloudProject:
             del self._data["cloud_files"]
 
             if isinstance(self._cloud_files, list):
-                self._preferences.set_value(
-                    "qfieldCloudLastProjectFiles",
-                    {
-                        **self._preferences.value("qfieldCloudLastProjectFiles"),
-                        self.id: [
-                            cloud_file["name"] for cloud_file in self._cloud_files
-                        ],
-                    },
+                # keep only the compact representation, not the raw server response.
+                # The files are already parsed if the response has been streamed.
+                self._cloud_files = sorted(
+                    (
+                        cloud_file
+                        if isinstance(cloud_file, ProjectFile)
+                        else ProjectFile(cloud_file)
+                        for cloud_file in self._cloud_files
+                    ),
+                    key=lambda f: f.name,
                 )
-                self._cloud_files = sorted(self._cloud_files, key=lambda f: f["name"])
             else:
                 assert self._cloud_files is None
 
         if "cloud_files" in new_data or "local_dir" in new_data or not self._files:
             self.refresh_files()
 
+    def has_changes(self, new_data: Dict[str, Any]) -> bool:
+        """Checks whether applying `new_data` with `update_data` would change the project."""
+        for key, value in new_data.items():
+            if key == "local_dir":
+                if (value or None) != self._local_dir:
+                    return True
+            elif key == "cloud_files":
+                return True
+            elif self._data.get(key) != value:
+                return True
+
+        return False
+
     @staticmethod
     def get_cloud_project_id(path: str) -> Optional[str]:
-        project_local_dirs: Dict[str, str] = Preferences().value(
-            "qfieldCloudProjectLocalDirs"
-        )
+        project_local_dirs = preferences_cache.project_local_dirs()
 
         for project_id, project_path in project_local_dirs.items():
             if project_path == path:
@@ -256,7 +333,7 @@ class CloudProject:
 
     @property
     def local_dir(self) -> Optional[str]:
-        dirname = self._preferences.value("qfieldCloudProjectLocalDirs").get(self.id)
+        dirname = preferences_cache.project_local_dir(self.id)
 
         if not dirname or not Path(dirname).exists() or not Path(dirname).is_absolute():
             return None
@@ -265,7 +342,7 @@ class CloudProject:
 
     @property
     def human_local_dir(self) -> Optional[str]:
-        dirname = self._preferences.value("qfieldCloudProjectLocalDirs").get(self.id)
+        dirname = preferences_cache.project_local_dir(self.id)
 
         if not dirname or not Path(dirname).exists() or not Path(dirname).is_absolute():
             return None
@@ -277,16 +354,38 @@ class CloudProject:
 
     # TODO remove this, use `get_files` instead
     @property
-    def cloud_files(self) -> Optional[List]:
+    def cloud_files(self) -> Optional[List[ProjectFile]]:
         return self._cloud_files
 
     @property
     def files_to_sync(self) -> Iterator[ProjectFile]:
+        local_dir = self.local_dir
+        manifest = SyncManifest(local_dir) if local_dir else None
+        self.suppressed_project_files = []
+
         for project_file in self.get_files():
             project_file.flush()
 
+            local_sha256 = project_file.local_sha256
+
             # don't attempt to sync files that are the same both locally and remote
-            if project_file.sha256 == project_file.local_sha256:
+            if project_file.sha256 == local_sha256:
+                continue
+
+            # nor the files unchanged on both sides since the last sync, e.g. the cloud
+            # copy of a GeoPackage is not the same bytes once a changeset is applied,
+            # or the GeoPackage has been rewritten locally without any data change
+            if manifest and manifest.is_synchronized(
+                project_file.name,
+                local_sha256,
+                project_file.sha256,
+                project_file.local_path,
+            ):
+                # the cloud project is a byte copy of the synchronized one, so the local one
+                # has only been saved again, its upload would trigger a useless job
+                if project_file.path.suffix in (".qgs", ".qgz"):
+                    self.suppressed_project_files.append(project_file)
+
                 continue
 
             # ignore local files that are not in the temp directory
@@ -298,6 +397,13 @@ class CloudProject:
 
             yield project_file
 
+        # keeps the new SHA256 of the files known to be unchanged
+        if manifest and manifest.is_modified:
+            try:
+                manifest.save()
+            except OSError:
+                pass
+
     @property
     def is_current_qgis_project(self) -> bool:
         project_home_path = QgsProject.instance().homePath()
@@ -343,18 +449,19 @@ class CloudProject:
     def refresh_files(self) -> None:
         self._files = {}
 
+        local_dir = self.local_dir
+
         if self._cloud_files:
-            for file_obj in self._cloud_files:
-                self._files[file_obj["name"]] = ProjectFile(
-                    file_obj, local_dir=self.local_dir
-                )
+            for project_file in self._cloud_files:
+                project_file.set_local_dir(local_dir)
+                self._files[project_file.name] = project_file
 
-        if self.local_dir:
+        if local_dir:
             local_filenames = [
                 f
                 for f in [
-                    str(f.relative_to(self.local_dir).as_posix())
-                    for f in Path(self.local_dir).glob("**/*")
+                    str(f.relative_to(local_dir).as_posix())
+                    for f in Path(local_dir).glob("**/*")
                     if f.is_file()
                 ]
                 if not f.startswith(".")
@@ -371,5 +478,5 @@ class CloudProject:
                     continue
 
                 self._files[filename] = ProjectFile(
-                    {"name": filename}, local_dir=self.local_dir
+                    {"name": filename}, local_dir=local_dir
                 )
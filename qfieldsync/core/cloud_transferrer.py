@@ -20,10 +20,16 @@
 """
 
 
+import hashlib
+import json
+import os
 import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from libqfieldsync.utils.file_utils import copy_multifile
 from qgis.core import Qgis, QgsMessageLog
@@ -34,11 +40,34 @@ from qgis.PyQt.QtCore import (
     Qt,
     QUrl,
     pyqtSignal,
+    pyqtSlot,
 )
-from qgis.PyQt.QtNetwork import QNetworkReply
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
 
-from qfieldsync.core.cloud_api import CloudNetworkAccessManager
+from qfieldsync.core.cloud_api import (
+    CloudException,
+    CloudNetworkAccessManager,
+    CloudReply,
+    CloudRequestPriority,
+)
 from qfieldsync.core.cloud_project import CloudProject, ProjectFile, ProjectFileCheckout
+from qfieldsync.core.sync_manifest import SyncManifest
+from qfieldsync.utils.chunking import Chunk, ChunkedFile, chunk_file, plan_ranges
+from qfieldsync.utils.file_utils import get_file_sha256
+from qfieldsync.utils.gpkg_changeset import (
+    ChangesetError,
+    apply_changeset,
+    create_changeset,
+)
+from qfieldsync.utils.project_fingerprint import ProjectFingerprintError
+from qfieldsync.utils.image_recompression import (
+    DEFAULT_MAX_SIZE,
+    DEFAULT_QUALITY,
+    IMAGE_SUFFIXES,
+    is_recompression_supported,
+    recompress_images,
+)
+from qfieldsync.utils.tar_stream import TarStreamError, TarStreamExtractor
 
 
 class CloudTransferrer(QObject):
@@ -52,6 +81,10 @@ class CloudTransferrer(QObject):
     upload_finished = pyqtSignal()
     download_finished = pyqtSignal()
     delete_finished = pyqtSignal()
+    # emitted once the files are prepared and the transfers are created, see `transfers_model`
+    prepared = pyqtSignal()
+    # emitted from the thread preparing the files, with its result or exception
+    _thread_finished = pyqtSignal(object)
 
     def __init__(
         self, network_manager: CloudNetworkAccessManager, cloud_project: CloudProject
@@ -82,6 +115,41 @@ class CloudTransferrer(QObject):
         self.throttled_downloader = None
         self.throttled_deleter = None
         self.transfers_model = None
+        # whether the files are downloaded as a single archive, e.g. on the first checkout of a project
+        self.is_archive_download_enabled = False
+        # whether the uploads, deletes and downloads run at the same time rather than one after the other
+        self.is_pipelined = False
+        self.max_parallel_requests = 8
+        self.budget: Optional[TransferBudget] = None
+        # whether only the changed rows of GeoPackages are uploaded, against the baselines of the sync manifest
+        self.is_changeset_upload_enabled = False
+        self._changesets: Dict[str, Path] = {}
+        # the baselines with the changesets applied, as the server must end up with, by filename
+        self._rebuilt_files: Dict[str, Path] = {}
+        # whether the logical fingerprints of the GeoPackages are kept, so the ones rewritten without any data change are not synced again
+        self.is_gpkg_fingerprint_enabled = False
+        # whether the fingerprints of the .qgs/.qgz files are kept, so the ones only saved again by QGIS are not uploaded again
+        self.is_project_fingerprint_enabled = False
+        # whether the moved files are copied on the server or relocated locally rather than transferred, see `_plan_moves`
+        self.is_move_detection_enabled = False
+        # whether the files moved locally are copied on the server, only some servers support it, see `copy_file`
+        self.is_server_copy_enabled = False
+        # the files moved locally, copied on the server from the filename of their content
+        self._copies: Dict[str, str] = {}
+        # the SHA256 the server must answer with for the changesets and the copies, by filename
+        self._expected_sha256s: Dict[str, str] = {}
+        # the files moved on the cloud, relocated from the local file of their content
+        self._relocated_files: Dict[str, ProjectFile] = {}
+        # whether the photos of the attachment dirs are downsized and recompressed before upload, see `_recompress_images`
+        self.is_image_recompression_enabled = False
+        self.attachment_dirs: List[str] = ["DCIM"]
+        self.image_max_size = DEFAULT_MAX_SIZE
+        self.image_quality = DEFAULT_QUALITY
+        # the recompressed files, with the SHA256 of their local original
+        self._recompressed_files: Dict[str, str] = {}
+        self._finished_transfer_types: Set[FileTransfer.Type] = set()
+        self._thread_callback: Optional[Callable[[Any], None]] = None
+        self._thread_error_message = ""
 
         if self.temp_dir.exists():
             shutil.rmtree(self.temp_dir)
@@ -96,6 +164,7 @@ class CloudTransferrer(QObject):
         self.download_finished.connect(self._on_download_finished)
 
         self.network_manager.logout_success.connect(self._on_logout_success)
+        self._thread_finished.connect(self._on_thread_finished)
 
     def sync(
         self,
@@ -115,12 +184,29 @@ class CloudTransferrer(QObject):
                 key=lambda f: f.path.suffix in (".qgs", ".qgz"),
             )
         ]
-        # prepare the files to be uploaded, copy them in a temporary destination
         for project_file in files_to_upload_sorted:
             assert project_file.local_path
 
             project_file.flush()
 
+        # prepare the files to be delete, both locally and remotely
+        for project_file in files_to_delete:
+            self._files_to_delete[str(project_file.path.as_posix())] = project_file
+
+        # copying the files, diffing the GeoPackages, recompressing the photos and hashing
+        # the move candidates takes a while, so it runs in a separate thread, then the
+        # transfers start
+        self._run_in_thread(
+            lambda: self._prepare(files_to_upload_sorted, files_to_download),
+            lambda _result: self._queue_transfers(files_to_download),
+            self.tr("Failed to prepare the files to synchronize: {}"),
+        )
+
+    def _stage_uploads(self, files_to_upload: List[ProjectFile]) -> None:
+        """Copies the files to be uploaded in a temporary destination, along with the changesets of the GeoPackages."""
+        for project_file in files_to_upload:
+            assert project_file.local_path
+
             temp_filename = self.temp_dir.joinpath(
                 FileTransfer.Type.UPLOAD.value, project_file.name
             )
@@ -130,9 +216,34 @@ class CloudTransferrer(QObject):
             self.total_upload_bytes += project_file.local_size or 0
             self._files_to_upload[str(project_file.path.as_posix())] = project_file
 
-        # prepare the files to be delete, both locally and remotely
-        for project_file in files_to_delete:
-            self._files_to_delete[str(project_file.path.as_posix())] = project_file
+            changeset_filename = self._create_changeset(project_file, temp_filename)
+            if changeset_filename is not None:
+                self._changesets[project_file.name] = changeset_filename
+
+    def _prepare(
+        self,
+        files_to_upload_sorted: List[ProjectFile],
+        files_to_download: List[ProjectFile],
+    ) -> None:
+        """Stages the files to be uploaded, recompresses the photos and plans the moves, runs in a separate thread."""
+        self._stage_uploads(files_to_upload_sorted)
+
+        # aborted while preparing the files, nothing has been transferred
+        if self.is_aborted:
+            return
+
+        if self.is_image_recompression_enabled:
+            self._recompress_images(files_to_upload_sorted)
+
+        if self.is_aborted:
+            return
+
+        if self.is_move_detection_enabled:
+            self._plan_moves(files_to_upload_sorted, files_to_download)
+
+    def _queue_transfers(self, files_to_download: List[ProjectFile]) -> None:
+        if self.is_aborted:
+            return
 
         # prepare the files to be downloaded, download them in a temporary destination
         for project_file in files_to_download:
@@ -141,28 +252,60 @@ class CloudTransferrer(QObject):
             )
             temp_filename.parent.mkdir(parents=True, exist_ok=True)
 
-            self.total_download_bytes += project_file.size or 0
             self._files_to_download[str(project_file.path.as_posix())] = project_file
 
+            if project_file.name not in self._relocated_files:
+                self.total_download_bytes += project_file.size or 0
+
+        # when pipelined, the transferrers share the maximum number of parallel requests
+        self.budget = (
+            TransferBudget(self.max_parallel_requests) if self.is_pipelined else None
+        )
+
         self.throttled_uploader = ThrottledFileTransferrer(
             self.network_manager,
             self.cloud_project,
             # note the .qgs/.qgz files are sorted in the end
             list(self._files_to_upload.values()),
             FileTransfer.Type.UPLOAD,
+            max_parallel_requests=self.max_parallel_requests,
+            is_batching_enabled=True,
+            budget=self.budget,
+            changesets=self._changesets,
+            copies=self._copies,
+            expected_sha256s=self._expected_sha256s,
         )
         self.throttled_deleter = ThrottledFileTransferrer(
             self.network_manager,
             self.cloud_project,
             list(self._files_to_delete.values()),
             FileTransfer.Type.DELETE,
+            max_parallel_requests=self.max_parallel_requests,
+            is_batching_enabled=True,
+            budget=self.budget,
         )
         self.throttled_downloader = ThrottledFileTransferrer(
             self.network_manager,
             self.cloud_project,
-            list(self._files_to_download.values()),
+            # the relocated files are already in the temporary destination
+            [
+                f
+                for f in self._files_to_download.values()
+                if f.name not in self._relocated_files
+            ],
             FileTransfer.Type.DOWNLOAD,
+            max_parallel_requests=self.max_parallel_requests,
+            is_archive_enabled=self.is_archive_download_enabled,
+            budget=self.budget,
         )
+
+        if self.is_pipelined:
+            # the project files are still the last, after the deletes too
+            self.throttled_uploader.project_file_prerequisites.append(
+                self.throttled_deleter
+            )
+            # the moved files are deleted once copied
+            self.throttled_deleter.copy_prerequisites.append(self.throttled_uploader)
         self.transfers_model = TransferFileLogsModel(
             [
                 self.throttled_uploader,
@@ -170,14 +313,255 @@ class CloudTransferrer(QObject):
                 self.throttled_downloader,
             ]
         )
+        self.prepared.emit()
 
         self._make_backup()
-        self._upload()
+
+        if self.budget is not None:
+            # the files to upload, delete and download are disjoint, so all run at once
+            with self.budget.hold():
+                self._upload()
+                self._delete()
+                self._download()
+        else:
+            self._upload()
+
+    def _create_changeset(
+        self, project_file: ProjectFile, filename: Path
+    ) -> Optional[Path]:
+        """Writes the rows changed in the GeoPackage since its baseline, if worth uploading instead of the whole file."""
+        if (
+            not self.is_changeset_upload_enabled
+            or not self.network_manager.is_changeset_upload_supported
+            or project_file.path.suffix != ".gpkg"
+        ):
+            return None
+
+        # the changeset only applies to the cloud file the baseline is a copy of
+        baseline_path = SyncManifest(self.cloud_project.local_dir).get_baseline(
+            project_file.name, project_file.sha256
+        )
+        if baseline_path is None:
+            return None
+
+        try:
+            changeset = create_changeset(baseline_path, filename)
+        except ChangesetError as err:
+            QgsMessageLog.logMessage(
+                self.tr('Cannot create the changeset of "{}": {}').format(
+                    project_file.name, err
+                ),
+                "QFieldSync",
+                Qgis.Info,
+            )
+            return None
+
+        changeset["base_sha256"] = project_file.sha256
+        changeset_filename = self.temp_dir.joinpath(
+            FileTransfer.Type.CHANGESET.value, project_file.name + ".json"
+        )
+        changeset_filename.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(changeset_filename, "w") as file:
+            json.dump(changeset, file)
+
+        # most rows changed, the whole file is not much larger
+        if changeset_filename.stat().st_size > filename.stat().st_size / 2:
+            changeset_filename.unlink()
+            return None
+
+        # the server applies the changeset on the same file as the baseline, so the
+        # SHA256 it answers with is checked against the same file rebuilt locally
+        rebuilt_filename = changeset_filename.with_name(project_file.path.name)
+        shutil.copyfile(baseline_path, rebuilt_filename)
+
+        try:
+            apply_changeset(rebuilt_filename, changeset)
+        except ChangesetError as err:
+            QgsMessageLog.logMessage(
+                self.tr('Cannot apply the changeset of "{}": {}').format(
+                    project_file.name, err
+                ),
+                "QFieldSync",
+                Qgis.Info,
+            )
+            changeset_filename.unlink()
+            rebuilt_filename.unlink()
+            return None
+
+        self._rebuilt_files[project_file.name] = rebuilt_filename
+        self._expected_sha256s[project_file.name] = get_file_sha256(rebuilt_filename)
+
+        return changeset_filename
+
+    def _recompress_images(self, files_to_upload: List[ProjectFile]) -> None:
+        """Downsizes and recompresses the photos of the attachment dirs to be uploaded.
+
+        Only the staged copies are recompressed, the local originals are kept. The
+        SHA256 of the originals is recorded in the sync manifest, so they are not
+        uploaded again on the next sync.
+        """
+        attachment_prefixes = tuple(
+            d.strip("/") + "/" for d in self.attachment_dirs if d.strip("/")
+        )
+        project_files = [
+            f
+            for f in files_to_upload
+            if f.path.suffix.lower() in IMAGE_SUFFIXES
+            and f.name.startswith(attachment_prefixes)
+            and f.name not in self._changesets
+        ]
+
+        if not project_files:
+            return
+
+        if not is_recompression_supported():
+            QgsMessageLog.logMessage(
+                self.tr(
+                    "Cannot recompress the photos before upload, Pillow is not installed"
+                ),
+                "QFieldSync",
+                Qgis.Info,
+            )
+            return
+
+        temp_filenames = [
+            self.temp_dir.joinpath(FileTransfer.Type.UPLOAD.value, f.name)
+            for f in project_files
+        ]
+        recompress_images(temp_filenames, self.image_max_size, self.image_quality)
+
+        for project_file, temp_filename in zip(project_files, temp_filenames):
+            local_size = project_file.local_size or 0
+            temp_size = temp_filename.stat().st_size
+
+            # the staged copy is only replaced by a smaller one
+            if temp_size >= local_size:
+                continue
+
+            assert project_file.local_path
+
+            self._recompressed_files[project_file.name] = get_file_sha256(
+                project_file.local_path
+            )
+            self.total_upload_bytes -= local_size - temp_size
+
+    def _plan_moves(
+        self, files_to_upload: List[ProjectFile], files_to_download: List[ProjectFile]
+    ) -> None:
+        """Finds the moved files, to be copied on the server or relocated locally rather than transferred again.
+
+        A file moved locally is uploaded, while the file with the same content on the
+        cloud is deleted, as it is gone locally. It is copied on the server instead, if
+        enabled and supported. A file moved on the cloud is downloaded, while the local file with the
+        same content is deleted, as it is gone on the cloud. The local file is relocated
+        instead. Only the files with the same size are hashed.
+        """
+        # the cloud files gone locally, by size and SHA256
+        cloud_sources: Dict[Tuple[Optional[int], str], str] = {}
+        # the local files gone on the cloud, by size
+        local_sources: Dict[Optional[int], List[ProjectFile]] = {}
+
+        for project_file in self._files_to_delete.values():
+            if (
+                project_file.checkout == ProjectFileCheckout.Cloud
+                and project_file.sha256
+            ):
+                cloud_sources[
+                    (project_file.size, project_file.sha256)
+                ] = project_file.name
+            elif (
+                project_file.checkout == ProjectFileCheckout.Local
+                and project_file.local_path_exists
+            ):
+                local_sources.setdefault(project_file.local_size, []).append(
+                    project_file
+                )
+
+        cloud_source_sizes = {size for size, _sha256 in cloud_sources}
+
+        for project_file in files_to_upload:
+            if (
+                not self.is_server_copy_enabled
+                or not self.network_manager.is_server_copy_supported
+            ):
+                break
+
+            # the project files trigger a job on the server, the changesets are small anyway
+            if (
+                project_file.local_size not in cloud_source_sizes
+                or project_file.path.suffix in (".qgs", ".qgz")
+                or project_file.name in self._changesets
+            ):
+                continue
+
+            temp_filename = self.temp_dir.joinpath(
+                FileTransfer.Type.UPLOAD.value, project_file.name
+            )
+            sha256 = get_file_sha256(temp_filename)
+            source = cloud_sources.get((project_file.local_size, sha256))
+
+            if source is not None:
+                self._copies[project_file.name] = source
+                self._expected_sha256s[project_file.name] = sha256
+
+        local_sha256s: Dict[str, str] = {}
+
+        for project_file in files_to_download:
+            for source_file in local_sources.get(project_file.size, []):
+                assert source_file.local_path
+
+                if source_file.name not in local_sha256s:
+                    local_sha256s[source_file.name] = get_file_sha256(
+                        source_file.local_path
+                    )
+
+                if local_sha256s[source_file.name] != project_file.sha256:
+                    continue
+
+                if self._relocate(source_file, project_file):
+                    break
+
+    def _relocate(self, source_file: ProjectFile, project_file: ProjectFile) -> bool:
+        """Puts the local file of the same content in the temporary destination of the download."""
+        assert source_file.local_path
+
+        temp_filename = self.temp_dir.joinpath(
+            FileTransfer.Type.DOWNLOAD.value, project_file.name
+        )
+        temp_filename.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            # the local file is deleted afterwards, so a hard link is enough, if possible
+            try:
+                os.link(source_file.local_path, temp_filename)
+            except OSError:
+                shutil.copyfile(source_file.local_path, temp_filename)
+        except OSError as err:
+            QgsMessageLog.logMessage(
+                self.tr('Cannot relocate "{}" to "{}", downloading it: {}').format(
+                    source_file.name, project_file.name, err
+                ),
+                "QFieldSync",
+                Qgis.Info,
+            )
+            return False
+
+        QgsMessageLog.logMessage(
+            self.tr('Relocated "{}" to "{}" rather than downloading it.').format(
+                source_file.name, project_file.name
+            ),
+            "QFieldSync",
+            Qgis.Info,
+        )
+        self._relocated_files[project_file.name] = source_file
+
+        return True
 
     def _upload(self) -> None:
         assert not self.is_upload_active, "Upload in progress"
-        assert not self.is_delete_active, "Delete in progress"
-        assert not self.is_download_active, "Download in progress"
+        assert self.is_pipelined or not self.is_delete_active, "Delete in progress"
+        assert self.is_pipelined or not self.is_download_active, "Download in progress"
         assert self.cloud_project.local_dir
 
         self.is_upload_active = True
@@ -209,9 +593,9 @@ class CloudTransferrer(QObject):
         return
 
     def _delete(self) -> None:
-        assert not self.is_upload_active, "Upload in progress"
+        assert self.is_pipelined or not self.is_upload_active, "Upload in progress"
         assert not self.is_delete_active, "Delete in progress"
-        assert not self.is_download_active, "Download in progress"
+        assert self.is_pipelined or not self.is_download_active, "Download in progress"
 
         self.is_delete_active = True
 
@@ -222,29 +606,32 @@ class CloudTransferrer(QObject):
             return
 
         self.throttled_deleter.error.connect(self._on_throttled_delete_error)
+        self.throttled_deleter.file_finished.connect(
+            self._on_throttled_delete_file_finished
+        )
         self.throttled_deleter.finished.connect(self._on_throttled_delete_finished)
+        # the local only files are deleted right away, so it might finish already
         self.throttled_deleter.transfer()
 
-        # in case all the files to delete were local only
-        if self.delete_files_finished == len(self._files_to_delete):
-            self.delete_finished.emit()
-
     def _on_throttled_delete_error(self, filename: str, error: str) -> None:
         self.throttled_deleter.abort()
 
+    def _on_throttled_delete_file_finished(self, _filename: str) -> None:
+        self.delete_files_finished += 1
+
     def _on_throttled_delete_finished(self) -> None:
         if self.delete_files_finished == len(self._files_to_delete):
             self.delete_finished.emit()
 
     def _download(self) -> None:
-        assert not self.is_upload_active, "Upload in progress"
-        assert not self.is_delete_active, "Delete in progress"
+        assert self.is_pipelined or not self.is_upload_active, "Upload in progress"
+        assert self.is_pipelined or not self.is_delete_active, "Delete in progress"
         assert not self.is_download_active, "Download in progress"
 
         self.is_download_active = True
 
-        # nothing to download
-        if len(self._files_to_download) == 0:
+        # nothing to download, e.g. all the files have been relocated
+        if len(self.throttled_downloader.transfers) == 0:
             self.download_progress.emit(1)
             self.download_finished.emit()
             return
@@ -270,12 +657,22 @@ class CloudTransferrer(QObject):
 
     def _on_upload_finished(self) -> None:
         self.is_upload_active = False
+        self._finished_transfer_types.add(FileTransfer.Type.UPLOAD)
         self._update_project_files_list()
-        self._delete()
+
+        if self.is_pipelined:
+            self._finish_if_done()
+        else:
+            self._delete()
 
     def _on_delete_finished(self) -> None:
         self.is_delete_active = False
-        self._download()
+        self._finished_transfer_types.add(FileTransfer.Type.DELETE)
+
+        if self.is_pipelined:
+            self._finish_if_done()
+        else:
+            self._download()
 
     def _on_download_finished(self) -> None:
         if not self.import_qfield_project():
@@ -286,23 +683,170 @@ class CloudTransferrer(QObject):
             )
 
         self.is_download_active = False
+        self._finished_transfer_types.add(FileTransfer.Type.DOWNLOAD)
+        self._finish_if_done()
+
+    def _finish_if_done(self) -> None:
+        if not self._finished_transfer_types.issuperset(
+            (
+                FileTransfer.Type.UPLOAD,
+                FileTransfer.Type.DELETE,
+                FileTransfer.Type.DOWNLOAD,
+            )
+        ):
+            return
+
+        if (
+            self.is_changeset_upload_enabled
+            or self.is_gpkg_fingerprint_enabled
+            or self.is_project_fingerprint_enabled
+            or self._recompressed_files
+        ) and not self.error_message:
+            transfers = [
+                transfer
+                for transferrer in (
+                    self.throttled_uploader,
+                    self.throttled_downloader,
+                    self.throttled_deleter,
+                )
+                for transfer in transferrer.transfers.values()
+                if transfer.is_finished
+                and not transfer.is_failed
+                and not transfer.is_aborted
+            ]
+            local_dir = self.cloud_project.local_dir
+            assert local_dir
+
+            # hashing and fingerprinting the transferred files takes a while
+            self._run_in_thread(
+                lambda: self._update_sync_manifest(local_dir, transfers),
+                lambda _result: self._finish(),
+                self.tr("Failed to record the synchronized files: {}"),
+            )
+            return
+
+        self._finish()
+
+    def _finish(self) -> None:
         self.is_finished = True
 
         if not self.is_project_list_update_active:
             self.finished.emit()
 
+    def _update_sync_manifest(
+        self, local_dir: str, transfers: List["FileTransfer"]
+    ) -> None:
+        """Records the synchronized GeoPackages, projects and recompressed photos, with the synchronized copy
+        of the GeoPackages as the baseline of the next changesets and their fingerprints."""
+        manifest = SyncManifest(local_dir)
+
+        for transfer in transfers:
+            if transfer.type == FileTransfer.Type.DELETE:
+                manifest.remove(transfer.filename)
+                continue
+
+            if not (
+                self._is_in_sync_manifest(transfer.file.path)
+                or transfer.filename in self._recompressed_files
+            ):
+                # e.g. a recompressed photo replaced by its cloud version
+                manifest.remove(transfer.filename)
+                continue
+
+            try:
+                fs_sha256 = get_file_sha256(transfer.fs_filename)
+                # the recompressed photos are synchronized with their local original
+                local_sha256 = self._recompressed_files.get(
+                    transfer.filename, fs_sha256
+                )
+                # the server applies the changesets on its own copy, which is not a byte copy anymore
+                cloud_sha256 = transfer.cloud_sha256 or fs_sha256
+                values = {}
+
+                try:
+                    # the uploaded files have usually been fingerprinted by `files_to_sync` already
+                    if transfer.file.path.suffix in (".qgs", ".qgz"):
+                        values["project_fingerprint"] = manifest.get_fingerprint(
+                            transfer.filename,
+                            "project_fingerprint",
+                            transfer.fs_filename,
+                            fs_sha256,
+                        )
+                    elif (
+                        self.is_gpkg_fingerprint_enabled
+                        and transfer.file.path.suffix == ".gpkg"
+                    ):
+                        values["gpkg_fingerprint"] = manifest.get_fingerprint(
+                            transfer.filename,
+                            "gpkg_fingerprint",
+                            transfer.fs_filename,
+                            fs_sha256,
+                        )
+                except (ChangesetError, ProjectFingerprintError) as err:
+                    QgsMessageLog.logMessage(
+                        self.tr('Cannot compute the fingerprint of "{}": {}').format(
+                            transfer.filename, err
+                        ),
+                        "QFieldSync",
+                        Qgis.Info,
+                    )
+
+                manifest.set(transfer.filename, local_sha256, cloud_sha256, **values)
+
+                if transfer.type == FileTransfer.Type.CHANGESET:
+                    # a byte copy of the cloud file, as the staged file is not anymore
+                    manifest.set_baseline(
+                        transfer.filename, self._rebuilt_files[transfer.filename]
+                    )
+                elif (
+                    self.is_changeset_upload_enabled
+                    and transfer.file.path.suffix == ".gpkg"
+                ):
+                    manifest.set_baseline(transfer.filename, transfer.fs_filename)
+                else:
+                    # a previous baseline is not the synchronized copy anymore
+                    manifest.baseline_path(transfer.filename).unlink(missing_ok=True)
+            except OSError as err:
+                manifest.remove(transfer.filename)
+                QgsMessageLog.logMessage(
+                    self.tr('Cannot record the synchronized state of "{}": {}').format(
+                        transfer.filename, err
+                    ),
+                    "QFieldSync",
+                    Qgis.Warning,
+                )
+
+        try:
+            manifest.save()
+        except OSError as err:
+            QgsMessageLog.logMessage(
+                self.tr("Cannot save the sync manifest: {}").format(err),
+                "QFieldSync",
+                Qgis.Warning,
+            )
+
+    def _is_in_sync_manifest(self, path: Path) -> bool:
+        if path.suffix == ".gpkg":
+            return self.is_changeset_upload_enabled or self.is_gpkg_fingerprint_enabled
+
+        if path.suffix in (".qgs", ".qgz"):
+            return self.is_project_fingerprint_enabled
+
+        return False
+
     def _update_project_files_list(self) -> None:
         self.is_project_list_update_active = True
 
+        # the files list must include the files just transferred
         reply = self.network_manager.projects_cache.get_project_files(
-            self.cloud_project.id
+            self.cloud_project.id, force=True
         )
         reply.finished.connect(lambda: self._on_update_project_files_list_finished())
 
     def _on_update_project_files_list_finished(self) -> None:
         self.is_project_list_update_active = False
 
-        if not self.is_download_active:
+        if self.is_finished:
             if self.error_message:
                 return
 
@@ -395,18 +939,59 @@ class CloudTransferrer(QObject):
 
         return False
 
+    def _run_in_thread(
+        self,
+        func: Callable[[], Any],
+        callback: Callable[[Any], None],
+        error_message: str,
+    ) -> None:
+        """Runs `func` in a separate thread, then `callback` with its result, or finishes with `error_message` if it fails."""
+
+        def run() -> None:
+            try:
+                result = func()
+            except Exception as err:
+                result = err
+
+            self._thread_finished.emit(result)
+
+        self._thread_callback = callback
+        self._thread_error_message = error_message
+        threading.Thread(target=run, daemon=True).start()
+
+    @pyqtSlot(object)
+    def _on_thread_finished(self, result: Any) -> None:
+        if isinstance(result, Exception):
+            self.error_message = self._thread_error_message.format(str(result))
+            self.error.emit(self.error_message, result)
+            self.is_finished = True
+            self.finished.emit()
+            return
+
+        assert self._thread_callback
+        self._thread_callback(result)
+
     def _on_logout_success(self) -> None:
         self.abort_requests()
 
 
 class FileTransfer(QObject):
     progress = pyqtSignal(int, int)
+    # emitted with the total number of retries of the transfer
+    retrying = pyqtSignal(int)
     finished = pyqtSignal()
 
     class Type(Enum):
         DOWNLOAD = "download"
         UPLOAD = "upload"
         DELETE = "delete"
+        # uploads only the rows changed in a GeoPackage, see `create_changeset`
+        CHANGESET = "changeset"
+        # copies a file already on the server, e.g. a moved file, see `copy_file`
+        COPY = "copy"
+
+    """HTTP status codes of the servers not supporting changeset uploads or copies."""
+    UNSUPPORTED_STATUS_CODES = (404, 405, 501)
 
     def __init__(
         self,
@@ -416,13 +1001,25 @@ class FileTransfer(QObject):
         file: ProjectFile,
         destination: Path,
         version: str = None,
+        changeset_filename: Optional[Path] = None,
+        copy_source: Optional[str] = None,
+        expected_sha256: Optional[str] = None,
     ) -> None:
         super(QObject, self).__init__()
 
         self.network_manager = network_manager
         self.cloud_project = cloud_project
-        self.replies: List[QNetworkReply] = []
-        self.redirects: List[QUrl] = []
+        # only the reply of the last request is kept, the redirected ones are released
+        self._reply: Optional[CloudReply] = None
+        self._redirect_url: Optional[QUrl] = None
+        # whether the last reply has been redirected and the redirect is not followed yet
+        self._is_redirect = False
+        self._released_retries_count = 0
+        # finished within a batch, an archive or a delta transfer, so possibly before or
+        # without a reply of its own
+        self._is_finished_without_reply = False
+        # the transfer of the changed chunks only, tried once before the whole file
+        self._delta: Optional[DeltaFileTransfer] = None
         self.file = file
         self.filename = file.name
         # filesystem filename
@@ -436,6 +1033,19 @@ class FileTransfer(QObject):
         self.is_local_delete_finished = False
         self.type = type
         self.version = version
+        # the changeset of a changeset upload, the whole `destination` is uploaded if it fails
+        self.changeset_filename = changeset_filename
+        # the file on the server with the same content, copied by a copy, the whole `destination` is uploaded if it fails
+        self.copy_source = copy_source
+        # the SHA256 the server must answer with once the changeset is applied or the copy made, the whole `destination` is uploaded otherwise
+        self.expected_sha256 = expected_sha256
+        # the SHA256 of the new version, as given by the server once a changeset is applied
+        self.cloud_sha256: Optional[str] = None
+
+        assert (self.type == FileTransfer.Type.CHANGESET) == (
+            changeset_filename is not None
+        )
+        assert (self.type == FileTransfer.Type.COPY) == (copy_source is not None)
 
         if self.file.checkout == ProjectFileCheckout.Local or (
             self.file.checkout & ProjectFileCheckout.Cloud
@@ -451,13 +1061,30 @@ class FileTransfer(QObject):
             return
 
         self.is_aborted = True
+
+        if self._reply is None and self._delta is not None:
+            self._delta.abort()
+            return
+
         self.last_reply.abort()
 
     def transfer(self) -> None:
+        if self._should_transfer_delta():
+            self._delta = DeltaFileTransfer(
+                self.network_manager, self.cloud_project, self
+            )
+            self._delta.progress.connect(self._on_progress)
+            self._delta.finished.connect(self._on_delta_finished)
+            self._delta.transfer()
+            return
+
+        # the file transfers are sent from the network worker thread, see `CloudReply`
         if self.type == FileTransfer.Type.DOWNLOAD:
             if self.is_redirect:
                 reply = self.network_manager.get(
-                    self.last_redirect_url, str(self.fs_filename)
+                    self.last_redirect_url,
+                    str(self.fs_filename),
+                    priority=CloudRequestPriority.BULK,
                 )
             else:
                 params = {"version": self.version} if self.version else {}
@@ -465,11 +1092,29 @@ class FileTransfer(QObject):
                     f"files/{self.cloud_project.id}/{self.filename}/",
                     local_filename=str(self.fs_filename),
                     params=params,
+                    priority=CloudRequestPriority.BULK,
                 )
         elif self.type == FileTransfer.Type.UPLOAD:
             reply = self.network_manager.cloud_upload_files(
                 "files/" + self.cloud_project.id + "/" + self.filename,
                 filenames=[str(self.fs_filename)],
+                priority=CloudRequestPriority.BULK,
+            )
+        elif self.type == FileTransfer.Type.CHANGESET:
+            reply = self.network_manager.upload_file_changeset(
+                self.cloud_project.id,
+                self.filename,
+                str(self.changeset_filename),
+                priority=CloudRequestPriority.BULK,
+            )
+        elif self.type == FileTransfer.Type.COPY:
+            assert self.copy_source
+
+            reply = self.network_manager.copy_file(
+                self.cloud_project.id,
+                self.copy_source,
+                self.filename,
+                priority=CloudRequestPriority.BULK,
             )
         elif self.type == FileTransfer.Type.DELETE:
             if self.is_local_delete:
@@ -485,18 +1130,75 @@ class FileTransfer(QObject):
                 return
 
             reply = self.network_manager.delete_file(
-                self.cloud_project.id + "/" + self.filename + "/"
+                self.cloud_project.id + "/" + self.filename + "/",
+                priority=CloudRequestPriority.BULK,
             )
         else:
             raise NotImplementedError()
 
-        self.replies.append(reply)
+        self._set_reply(reply)
+
+        # connected to slots rather than lambdas, so the signals of the reply are queued
+        # to the thread of this transfer
+        reply.redirected.connect(self._on_redirected)
+        reply.retrying.connect(self._on_retrying)
+        reply.downloadProgress.connect(self._on_progress)
+        reply.uploadProgress.connect(self._on_progress)
+        reply.finished.connect(self._on_finished)
+
+    def _should_transfer_delta(self) -> bool:
+        # tried once, the whole file is transferred if it fails
+        if self._delta is not None or not self.network_manager.is_delta_sync_supported:
+            return False
+
+        # there must be a version on the cloud and a local file to get the chunks from
+        if (self.file.size or 0) < DeltaFileTransfer.MIN_FILE_SIZE:
+            return False
+
+        if self.type == FileTransfer.Type.UPLOAD:
+            local_path = self.fs_filename
+        elif self.type == FileTransfer.Type.DOWNLOAD:
+            # the chunks are only listed for the latest version
+            if self.version or self.is_redirect:
+                return False
+
+            local_path = self.file.local_path
+        else:
+            return False
+
+        return (
+            local_path is not None
+            and local_path.is_file()
+            and local_path.stat().st_size >= DeltaFileTransfer.MIN_FILE_SIZE
+        )
+
+    @pyqtSlot()
+    def _on_delta_finished(self) -> None:
+        assert self._delta
 
-        reply.redirected.connect(lambda *args: self._on_redirected(*args))
-        reply.downloadProgress.connect(lambda *args: self._on_progress(*args))
-        reply.uploadProgress.connect(lambda *args: self._on_progress(*args))
-        reply.finished.connect(lambda *args: self._on_finished(*args))
+        if self._delta.error is None or self.is_aborted:
+            if self._delta.error is None:
+                size = self.fs_filename.stat().st_size
+                self._on_progress(size, size)
 
+            self.error = self._delta.error
+            self._is_finished_without_reply = True
+            self.finished.emit()
+            return
+
+        QgsMessageLog.logMessage(
+            self.tr(
+                'Transferring the changes of "{}" failed, transferring the whole file: {}'
+            ).format(self.filename, self._delta.error),
+            "QFieldSync",
+            Qgis.Info,
+        )
+
+        self.bytes_transferred = 0
+        self.bytes_total = 0
+        self.transfer()
+
+    @pyqtSlot(int, int)
     def _on_progress(self, bytes_transferred: int, bytes_total: int) -> None:
         # there are always at least a few bytes to send, so ignore this situation
         if bytes_transferred < self.bytes_transferred or bytes_total < self.bytes_total:
@@ -507,10 +1209,22 @@ class FileTransfer(QObject):
 
         self.progress.emit(bytes_transferred, bytes_total)
 
+    @pyqtSlot(int, int)
+    def _on_retrying(self, _retries_count: int, _delay_ms: int) -> None:
+        # the new attempt starts transferring from the beginning
+        self.bytes_transferred = 0
+        self.bytes_total = 0
+
+        self.retrying.emit(self.retries_count)
+
+    @pyqtSlot(QUrl)
     def _on_redirected(self, url: QUrl) -> None:
-        self.redirects.append(url)
+        self.network_manager.add_storage_url(url)
+        self._redirect_url = url
+        self._is_redirect = True
         self.last_reply.abort()
 
+    @pyqtSlot()
     def _on_finished(self) -> None:
         if self.is_redirect:
             if self.type == FileTransfer.Type.DOWNLOAD:
@@ -519,6 +1233,10 @@ class FileTransfer(QObject):
             else:
                 raise NotImplementedError("Redirects on upload are not supported")
 
+        if self.type in (FileTransfer.Type.CHANGESET, FileTransfer.Type.COPY):
+            self._on_server_side_upload_finished()
+            return
+
         try:
             self.network_manager.handle_response(self.last_reply, False)
 
@@ -534,55 +1252,175 @@ class FileTransfer(QObject):
             if self.fs_filename.is_file():
                 self.fs_filename.unlink()
 
-        self.finished.emit()
+        # the outcome of the reply is kept for the logs
+        self.last_reply.release()
 
-    @property
-    def last_reply(self) -> QNetworkReply:
-        if not self.replies:
-            raise ValueError("There are no replies yet!")
+        self.finished.emit()
 
-        return self.replies[-1]
+    def _on_server_side_upload_finished(self) -> None:
+        """Finishes a changeset upload or a copy, or falls back to the upload of the whole file."""
+        try:
+            payload = self.network_manager.json_object(self.last_reply)
+            err = self._check_server_side_upload(payload)
+            # answered for another file, the request has been taken for something else
+            is_unsupported = (
+                not isinstance(payload, dict) or payload.get("name") != self.filename
+            )
+        except CloudException as cloud_err:
+            if self.is_aborted:
+                self.error = cloud_err
+                self.last_reply.release()
+                self.finished.emit()
+                return
 
-    @property
-    def last_redirect_url(self) -> QUrl:
-        if not self.replies:
-            raise ValueError("There are no redirects!")
+            err = cloud_err
+            is_unsupported = cloud_err.httpCode in self.UNSUPPORTED_STATUS_CODES
 
-        return self.redirects[-1]
+        if err is not None:
+            if self.type == FileTransfer.Type.CHANGESET:
+                if is_unsupported:
+                    self.network_manager.is_changeset_upload_supported = False
 
-    @property
-    def is_started(self) -> bool:
-        return self.is_local_delete_finished or len(self.replies) > 0
+                msg = self.tr(
+                    'Uploading the changeset of "{}" failed, uploading the whole file: {}'
+                ).format(self.filename, err)
+            else:
+                if is_unsupported:
+                    self.network_manager.is_server_copy_supported = False
 
-    @property
-    def is_finished(self) -> bool:
-        if self.is_aborted:
-            return True
+                msg = self.tr(
+                    'Copying "{}" to "{}" on the server failed, uploading the whole file: {}'
+                ).format(self.copy_source, self.filename, err)
 
-        if self.is_local_delete_finished:
-            return True
+            QgsMessageLog.logMessage(msg, "QFieldSync", Qgis.Info)
 
-        if not self.replies:
-            return False
+            # the whole file is uploaded instead, e.g. when the cloud file has changed
+            self.type = FileTransfer.Type.UPLOAD
+            self.bytes_transferred = 0
+            self.bytes_total = 0
+            self.transfer()
+            return
 
-        if self.is_redirect:
-            return False
+        self.cloud_sha256 = payload.get("sha256")
 
-        return self.replies[-1].isFinished()
+        # nothing has been sent, but the file is on the server as if it had been
+        if self.type == FileTransfer.Type.COPY:
+            size = self.fs_filename.stat().st_size
+            self._on_progress(size, size)
 
-    @property
-    def is_redirect(self) -> bool:
-        if not self.replies:
-            return False
+        self.last_reply.release()
+        self.finished.emit()
 
-        return len(self.replies) == len(self.redirects)
+    def _check_server_side_upload(self, payload: Any) -> Optional[Exception]:
+        """Returns why the answer to a changeset upload or a copy is not the expected one, if so.
 
-    @property
-    def is_failed(self) -> bool:
-        if self.is_local_delete and self.error:
-            return True
+        The servers without support for them might take the request for the upload of
+        another file, e.g. "<filename>/copy", and answer with its name instead.
+        """
+        if not isinstance(payload, dict) or payload.get("name") != self.filename:
+            return Exception(
+                self.tr('The server did not answer with "{}"').format(self.filename)
+            )
 
-        if not self.replies:
+        if payload.get("sha256") != self.expected_sha256:
+            return Exception(
+                self.tr('The server answered with another SHA256 for "{}"').format(
+                    self.filename
+                )
+            )
+
+        return None
+
+    def start_in_batch(self, reply: CloudReply) -> None:
+        """Marks the transfer as sent within a batch, see `FileTransferBatch`."""
+        self._set_reply(reply)
+
+    def finish_in_batch(self, error: Optional[Exception]) -> None:
+        """Finishes the transfer with its outcome within the batch."""
+        self.error = error
+        self._is_finished_without_reply = True
+
+        if self.error is None:
+            self.bytes_transferred = self.bytes_total
+
+        self.finished.emit()
+
+    def detach_from_batch(self) -> None:
+        """Makes the transfer not started again, to be sent on its own."""
+        self._set_reply(None)
+        self._is_finished_without_reply = False
+        self.bytes_transferred = 0
+        self.bytes_total = 0
+
+    def _set_reply(self, reply: Optional[CloudReply]) -> None:
+        if self._reply is not None:
+            self._released_retries_count += self._reply.retries_count
+            self._reply.release()
+
+        self._reply = reply
+        self._is_redirect = False
+
+    @property
+    def retries_count(self) -> int:
+        if self._reply is None:
+            return self._released_retries_count
+
+        return self._released_retries_count + self._reply.retries_count
+
+    @property
+    def last_reply(self) -> CloudReply:
+        if self._reply is None:
+            raise ValueError("There are no replies yet!")
+
+        return self._reply
+
+    @property
+    def last_redirect_url(self) -> QUrl:
+        if self._redirect_url is None:
+            raise ValueError("There are no redirects!")
+
+        return self._redirect_url
+
+    @property
+    def is_started(self) -> bool:
+        return (
+            self.is_local_delete_finished
+            or self._reply is not None
+            or self._delta is not None
+        )
+
+    @property
+    def is_finished(self) -> bool:
+        if self.is_aborted:
+            return True
+
+        if self.is_local_delete_finished:
+            return True
+
+        if self._is_finished_without_reply:
+            return True
+
+        if self._reply is None:
+            return False
+
+        if self.is_redirect:
+            return False
+
+        return self._reply.isFinished()
+
+    @property
+    def is_redirect(self) -> bool:
+        return self._is_redirect
+
+    @property
+    def is_failed(self) -> bool:
+        if self.is_local_delete and self.error:
+            return True
+
+        if self._is_finished_without_reply:
+            return self.error is not None
+
+        if self._reply is None:
             return False
 
         return self.last_reply.isFinished() and (
@@ -590,13 +1428,759 @@ class FileTransfer(QObject):
         )
 
 
+class DeltaFileTransfer(QObject):
+    """Uploads or downloads only the chunks of a file changed since its latest version on the cloud.
+
+    The local file and the cloud file are cut into content-defined chunks, see
+    `chunk_file`, so the chunks not touched by an edit are found on both sides, even
+    when bytes have been inserted or removed before them. Once the chunks of the
+    cloud file are received:
+
+    - uploads send the recipe of the new version along with the new chunks only;
+    - downloads get the missing chunks with range requests, then assemble the new
+      version from them and the chunks of the local file.
+
+    Reading and writing the files runs in a separate thread. When the server does not
+    support it or anything fails, `error` is set and the whole file has to be
+    transferred instead.
+    """
+
+    finished = pyqtSignal()
+    progress = pyqtSignal(int, int)
+    # emitted from the thread reading and writing the files, with its result or exception
+    _thread_finished = pyqtSignal(object)
+
+    """Files smaller than this are transferred whole, as listing their chunks would save little."""
+    MIN_FILE_SIZE = 8 * 1024 * 1024
+
+    """Missing chunks up to this many bytes apart are downloaded within the same range."""
+    MAX_RANGE_GAP = 256 * 1024
+
+    """Maximum number of range requests of a download, the ranges are merged until they fit."""
+    MAX_RANGES_COUNT = 8
+
+    """HTTP status codes of the servers not supporting delta transfers."""
+    UNSUPPORTED_STATUS_CODES = (404, 405, 501)
+
+    def __init__(
+        self,
+        network_manager: CloudNetworkAccessManager,
+        cloud_project: CloudProject,
+        file_transfer: "FileTransfer",
+    ) -> None:
+        super(DeltaFileTransfer, self).__init__()
+
+        self.network_manager = network_manager
+        self.cloud_project = cloud_project
+        self.file_transfer = file_transfer
+        self.type = file_transfer.type
+        self.error: Optional[Exception] = None
+        # the bytes of the changed chunks only, to be sent or received
+        self.bytes_total = 0
+        self.is_aborted = False
+        self.is_finished = False
+        self._reply: Optional[CloudReply] = None
+        self._cloud_file: Optional[ChunkedFile] = None
+        self._local_file: Optional[ChunkedFile] = None
+        self._chunking: Dict[str, int] = {}
+        self._thread_callback: Optional[Callable[[Any], None]] = None
+        # the chunks of the cloud file missing from the local file, in order
+        self._missing_chunks: List[Chunk] = []
+        # the downloaded ranges as (offset, size, filename), in order
+        self._ranges: List[Tuple[int, int, Path]] = []
+        self._ranges_bytes_total = 0
+        self._ranges_bytes_received = 0
+        self._range_idx = 0
+        self._temp_filenames: List[Path] = []
+        self._temp_dir = Path(cloud_project.local_dir).joinpath(".qfieldsync", "delta")
+
+        assert self.type in (FileTransfer.Type.UPLOAD, FileTransfer.Type.DOWNLOAD)
+
+        self._thread_finished.connect(self._on_thread_finished)
+
+    def abort(self) -> None:
+        if self.is_finished:
+            return
+
+        self.is_aborted = True
+
+        # a running thread cannot be interrupted, its result is ignored once finished
+        if self._reply is not None and not self._reply.isFinished():
+            self._reply.abort()
+
+    def transfer(self) -> None:
+        reply = self.network_manager.get_file_chunks(
+            self.cloud_project.id,
+            self.file_transfer.filename,
+            priority=CloudRequestPriority.BULK,
+        )
+        reply.finished.connect(self._on_chunks_finished)
+
+        self._set_reply(reply)
+
+    @pyqtSlot()
+    def _on_chunks_finished(self) -> None:
+        try:
+            payload = self._handle_response(True)
+            self._cloud_file = ChunkedFile.from_json(payload)
+            self._chunking = {
+                key: int(payload.get("chunking", {})[key])
+                for key in ("min_size", "avg_size", "max_size")
+            }
+        except (CloudException, KeyError, TypeError, ValueError) as err:
+            self._finish(err)
+            return
+
+        if self.type == FileTransfer.Type.UPLOAD:
+            self._run_in_thread(self._write_delta, self._upload_delta)
+        else:
+            assert self.file_transfer.file.local_path
+            self._run_in_thread(
+                lambda: chunk_file(
+                    self.file_transfer.file.local_path, **self._chunking
+                ),
+                self._download_ranges,
+            )
+
+    def _write_delta(self) -> Tuple[str, Dict[str, Any]]:
+        assert self._cloud_file
+
+        local_file = chunk_file(self.file_transfer.fs_filename, **self._chunking)
+        cloud_hashes = {chunk.sha256 for chunk in self._cloud_file.chunks}
+
+        if not any(chunk.sha256 in cloud_hashes for chunk in local_file.chunks):
+            raise Exception("The file has no chunk in common with its cloud version")
+
+        delta_filename = self._create_temp_file()
+
+        # the new chunks are written in the order of the recipe
+        with open(self.file_transfer.fs_filename, "rb") as source, open(
+            delta_filename, "wb"
+        ) as delta:
+            for chunk in local_file.chunks:
+                if chunk.sha256 not in cloud_hashes:
+                    source.seek(chunk.offset)
+                    delta.write(source.read(chunk.size))
+
+        recipe = {
+            "base_sha256": self._cloud_file.sha256,
+            "sha256": local_file.sha256,
+            "size": local_file.size,
+            "chunks": [
+                {
+                    "sha256": chunk.sha256,
+                    "size": chunk.size,
+                    "is_new": chunk.sha256 not in cloud_hashes,
+                }
+                for chunk in local_file.chunks
+            ],
+        }
+
+        return str(delta_filename), recipe
+
+    def _upload_delta(self, result: Tuple[str, Dict[str, Any]]) -> None:
+        delta_filename, recipe = result
+
+        reply = self.network_manager.upload_file_delta(
+            self.cloud_project.id,
+            self.file_transfer.filename,
+            delta_filename,
+            recipe,
+            priority=CloudRequestPriority.BULK,
+        )
+        # connected to slots rather than lambdas, so the signals of the reply are queued
+        # to the thread of this transfer
+        reply.uploadProgress.connect(self._on_progress)
+        reply.finished.connect(self._on_delta_uploaded)
+
+        self._set_reply(reply)
+
+    @pyqtSlot()
+    def _on_delta_uploaded(self) -> None:
+        try:
+            self._handle_response(False)
+        except CloudException as err:
+            self._finish(err)
+            return
+
+        self._finish(None)
+
+    def _download_ranges(self, local_file: ChunkedFile) -> None:
+        assert self._cloud_file
+
+        self._local_file = local_file
+        local_hashes = {chunk.sha256 for chunk in local_file.chunks}
+        missing_chunks = self._missing_chunks
+        missing_hashes = set()
+
+        # the chunks repeated within the file are downloaded once
+        for chunk in self._cloud_file.chunks:
+            if chunk.sha256 not in local_hashes and chunk.sha256 not in missing_hashes:
+                missing_chunks.append(chunk)
+                missing_hashes.add(chunk.sha256)
+
+        if self._cloud_file.chunks and not any(
+            chunk.sha256 in local_hashes for chunk in self._cloud_file.chunks
+        ):
+            self._finish(
+                Exception("The file has no chunk in common with its cloud version")
+            )
+            return
+
+        max_gap = self.MAX_RANGE_GAP
+        ranges = plan_ranges(missing_chunks, max_gap)
+
+        while len(ranges) > self.MAX_RANGES_COUNT:
+            max_gap *= 2
+            ranges = plan_ranges(missing_chunks, max_gap)
+
+        self._ranges = [
+            (offset, size, self._create_temp_file()) for offset, size in ranges
+        ]
+        self._ranges_bytes_total = sum(size for _offset, size, _path in self._ranges)
+        self._download_next_range()
+
+    def _download_next_range(self) -> None:
+        if self._range_idx == len(self._ranges):
+            self._run_in_thread(self._assemble, lambda _result: self._finish(None))
+            return
+
+        offset, size, filename = self._ranges[self._range_idx]
+
+        reply = self.network_manager.get_file_range(
+            self.cloud_project.id,
+            self.file_transfer.filename,
+            offset,
+            size,
+            str(filename),
+            priority=CloudRequestPriority.BULK,
+        )
+        reply.downloadProgress.connect(self._on_range_progress)
+        reply.finished.connect(self._on_range_finished)
+
+        self._set_reply(reply)
+
+    @pyqtSlot(int, int)
+    def _on_range_progress(self, bytes_received: int, _bytes_total: int) -> None:
+        self._on_progress(
+            self._ranges_bytes_received + bytes_received, self._ranges_bytes_total
+        )
+
+    @pyqtSlot()
+    def _on_range_finished(self) -> None:
+        _offset, size, filename = self._ranges[self._range_idx]
+
+        try:
+            self._handle_response(False)
+
+            # servers ignoring the range send the whole file
+            status_code = self._reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            if status_code != 206 or filename.stat().st_size != size:
+                raise Exception("The server did not send the requested range")
+        except Exception as err:
+            self._finish(err)
+            return
+
+        self._ranges_bytes_received += size
+        self._range_idx += 1
+        self._download_next_range()
+
+    def _assemble(self) -> None:
+        assert self._cloud_file
+        assert self._local_file
+        assert self.file_transfer.file.local_path
+
+        local_chunks = {chunk.sha256: chunk for chunk in self._local_file.chunks}
+        # the range file and the offset within it of each downloaded chunk
+        downloaded_chunks: Dict[str, Tuple[Path, int]] = {}
+        range_idx = 0
+
+        # the ranges are in order and cover all the missing chunks
+        for chunk in self._missing_chunks:
+            while sum(self._ranges[range_idx][:2]) <= chunk.offset:
+                range_idx += 1
+
+            offset, _size, filename = self._ranges[range_idx]
+            downloaded_chunks[chunk.sha256] = (filename, chunk.offset - offset)
+
+        file_hash = hashlib.sha256()
+
+        with open(self.file_transfer.file.local_path, "rb") as local, open(
+            self.file_transfer.fs_filename, "wb"
+        ) as destination:
+            for chunk in self._cloud_file.chunks:
+                if chunk.sha256 in local_chunks:
+                    local.seek(local_chunks[chunk.sha256].offset)
+                    data = local.read(chunk.size)
+                else:
+                    filename, offset = downloaded_chunks[chunk.sha256]
+                    with open(filename, "rb") as range_file:
+                        range_file.seek(offset)
+                        data = range_file.read(chunk.size)
+
+                file_hash.update(data)
+                destination.write(data)
+
+        if file_hash.hexdigest() != self._cloud_file.sha256:
+            raise Exception("The assembled file does not match its cloud version")
+
+    @pyqtSlot(int, int)
+    def _on_progress(self, bytes_transferred: int, bytes_total: int) -> None:
+        self.bytes_total = bytes_total
+        self.progress.emit(bytes_transferred, bytes_total)
+
+    def _set_reply(self, reply: CloudReply) -> None:
+        if self._reply is not None:
+            self._reply.release()
+
+        self._reply = reply
+
+    def _handle_response(self, should_parse_json: bool) -> Any:
+        assert self._reply
+
+        try:
+            return self.network_manager.handle_response(self._reply, should_parse_json)
+        except CloudException as err:
+            if err.httpCode in self.UNSUPPORTED_STATUS_CODES:
+                self.network_manager.is_delta_sync_supported = False
+
+            raise
+
+    def _run_in_thread(
+        self, func: Callable[[], Any], callback: Callable[[Any], None]
+    ) -> None:
+        def run() -> None:
+            try:
+                result = func()
+            except Exception as err:
+                result = err
+
+            self._thread_finished.emit(result)
+
+        self._thread_callback = callback
+        threading.Thread(target=run, daemon=True).start()
+
+    @pyqtSlot(object)
+    def _on_thread_finished(self, result: Any) -> None:
+        if self.is_aborted:
+            self._finish(Exception("The transfer has been aborted"))
+        elif isinstance(result, Exception):
+            self._finish(result)
+        else:
+            assert self._thread_callback
+            self._thread_callback(result)
+
+    def _create_temp_file(self) -> Path:
+        self._temp_dir.mkdir(parents=True, exist_ok=True)
+
+        fd, filename = tempfile.mkstemp(dir=self._temp_dir)
+        os.close(fd)
+
+        self._temp_filenames.append(Path(filename))
+
+        return Path(filename)
+
+    def _finish(self, error: Optional[Exception]) -> None:
+        self.error = error
+        self.is_finished = True
+
+        if self._reply is not None:
+            self._reply.release()
+
+        for filename in self._temp_filenames:
+            filename.unlink(missing_ok=True)
+
+        if (
+            error is not None
+            and self.type == FileTransfer.Type.DOWNLOAD
+            and self.file_transfer.fs_filename.is_file()
+        ):
+            self.file_transfer.fs_filename.unlink()
+
+        self.finished.emit()
+
+
+class FileTransferBatch(QObject):
+    """Uploads or deletes the files of several transfers of the same type in a single request.
+
+    Once finished, the transfers that succeeded are finished, while the others are
+    listed in `failed_transfers`, to be sent again on their own.
+    """
+
+    finished = pyqtSignal()
+
+    """HTTP status codes of the servers not supporting batch requests."""
+    UNSUPPORTED_STATUS_CODES = (404, 405, 501)
+
+    def __init__(
+        self,
+        network_manager: CloudNetworkAccessManager,
+        cloud_project: CloudProject,
+        transfers: List[FileTransfer],
+    ) -> None:
+        super(FileTransferBatch, self).__init__()
+
+        self.network_manager = network_manager
+        self.cloud_project = cloud_project
+        self.transfers = transfers
+        self.type = transfers[0].type
+        self.failed_transfers: List[FileTransfer] = []
+        self.is_started = False
+        self.is_finished = False
+        self._reply: Optional[CloudReply] = None
+        self._sizes = []
+
+        assert self.type in (FileTransfer.Type.UPLOAD, FileTransfer.Type.DELETE)
+        assert all(transfer.type == self.type for transfer in transfers)
+
+        if self.type == FileTransfer.Type.UPLOAD:
+            self._sizes = [
+                transfer.fs_filename.stat().st_size for transfer in transfers
+            ]
+
+    def transfer(self) -> None:
+        self.is_started = True
+
+        if self.type == FileTransfer.Type.UPLOAD:
+            reply = self.network_manager.upload_files(
+                self.cloud_project.id,
+                {
+                    transfer.filename: str(transfer.fs_filename)
+                    for transfer in self.transfers
+                },
+                priority=CloudRequestPriority.BULK,
+            )
+        else:
+            reply = self.network_manager.delete_files(
+                self.cloud_project.id,
+                [transfer.filename for transfer in self.transfers],
+                priority=CloudRequestPriority.BULK,
+            )
+
+        for transfer in self.transfers:
+            transfer.start_in_batch(reply)
+
+        reply.uploadProgress.connect(self._on_progress)
+        reply.retrying.connect(self._on_retrying)
+        reply.finished.connect(self._on_finished)
+
+        self._reply = reply
+
+    @pyqtSlot(int, int)
+    def _on_progress(self, bytes_sent: int, _bytes_total: int) -> None:
+        # the files are sent in order, so each one has been sent up to its offset
+        offset = 0
+        for transfer, size in zip(self.transfers, self._sizes):
+            transfer._on_progress(min(max(bytes_sent - offset, 0), size), size)
+            offset += size
+
+    @pyqtSlot(int, int)
+    def _on_retrying(self, retries_count: int, delay_ms: int) -> None:
+        for transfer in self.transfers:
+            transfer._on_retrying(retries_count, delay_ms)
+
+    @pyqtSlot()
+    def _on_finished(self) -> None:
+        reply = self._reply
+        results: Dict[str, Optional[str]] = {}
+
+        try:
+            results = self.network_manager.parse_file_results(
+                self.network_manager.json_array(reply)
+            )
+        except CloudException as err:
+            if reply.error() == QNetworkReply.OperationCanceledError:
+                for transfer in self.transfers:
+                    transfer.finish_in_batch(err)
+
+                self._finish()
+                return
+
+            if err.httpCode in self.UNSUPPORTED_STATUS_CODES:
+                if self.type == FileTransfer.Type.UPLOAD:
+                    self.network_manager.is_upload_batch_supported = False
+                else:
+                    self.network_manager.is_delete_batch_supported = False
+            else:
+                QgsMessageLog.logMessage(
+                    self.tr("Batch {} of {} files failed: {}").format(
+                        self.type.value, len(self.transfers), err
+                    ),
+                    "QFieldSync",
+                    Qgis.Info,
+                )
+
+        for transfer in self.transfers:
+            if transfer.filename in results and results[transfer.filename] is None:
+                transfer.finish_in_batch(None)
+            else:
+                # only the failed files are sent again, on their own
+                transfer.detach_from_batch()
+                self.failed_transfers.append(transfer)
+
+        self._finish()
+
+    def _finish(self) -> None:
+        self.is_finished = True
+        self._reply.release()
+        self.finished.emit()
+
+
+class ProjectArchiveTransfer(QObject):
+    """Downloads the files of several transfers at once, as a single streamed archive of the project.
+
+    The archive is extracted while it is received, in the thread of the reply. Each
+    file is finished as soon as it is extracted and its SHA256 matches the one of the
+    cloud file. Once finished, the files missing from the archive or not matching are
+    listed in `failed_transfers`, to be downloaded again on their own.
+    """
+
+    finished = pyqtSignal()
+    # emitted from the thread of the reply with the name and SHA256 of each extracted file
+    _file_extracted = pyqtSignal(str, str)
+
+    """HTTP status codes of the servers not supporting project archives."""
+    UNSUPPORTED_STATUS_CODES = (404, 405, 501)
+
+    def __init__(
+        self,
+        network_manager: CloudNetworkAccessManager,
+        cloud_project: CloudProject,
+        transfers: List[FileTransfer],
+    ) -> None:
+        super(ProjectArchiveTransfer, self).__init__()
+
+        self.network_manager = network_manager
+        self.cloud_project = cloud_project
+        self.transfers = transfers
+        self.type = FileTransfer.Type.DOWNLOAD
+        self.failed_transfers: List[FileTransfer] = []
+        self.is_started = False
+        self.is_finished = False
+        self._reply: Optional[CloudReply] = None
+        self._transfers_by_name = {
+            transfer.filename: transfer for transfer in transfers
+        }
+        # only used from the thread of the reply until it is finished
+        self._extractor = TarStreamExtractor(self._get_destination)
+        self._extract_error: Optional[Exception] = None
+
+        assert all(transfer.type == self.type for transfer in transfers)
+
+        self._file_extracted.connect(self._on_file_extracted)
+
+    def transfer(self) -> None:
+        self.is_started = True
+
+        reply = self.network_manager.get_project_archive(
+            self.cloud_project.id,
+            priority=CloudRequestPriority.BULK,
+        )
+
+        for transfer in self.transfers:
+            transfer.start_in_batch(reply)
+
+        # direct connections, so the archive is extracted in the thread of the reply and
+        # the files are extracted before the `finished` slots are called
+        reply.readyRead.connect(lambda: self._extract(reply), Qt.DirectConnection)
+        reply.data_finished.connect(lambda: self._extract(reply), Qt.DirectConnection)
+        reply.retrying.connect(self._on_retrying)
+        reply.finished.connect(self._on_finished)
+
+        self._reply = reply
+
+    def _get_destination(self, name: str) -> Optional[Path]:
+        # the files not to be downloaded are skipped
+        transfer = self._transfers_by_name.get(name)
+
+        if transfer is None:
+            return None
+
+        return transfer.fs_filename
+
+    def _extract(self, reply: CloudReply) -> None:
+        if self._extract_error is not None:
+            return
+
+        status_code = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+
+        # redirects and error responses are not archives, nor the incomplete ones
+        if (
+            reply.error() != QNetworkReply.NoError
+            or not status_code
+            or not 200 <= status_code < 300
+        ):
+            if reply.isFinished():
+                self._extractor.abort()
+
+            return
+
+        try:
+            extracted_files = self._extractor.feed(reply.readAll().data())
+
+            if reply.isFinished():
+                self._extractor.close()
+        except (OSError, TarStreamError) as err:
+            self._extract_error = err
+            self._extractor.abort()
+            reply.abort()
+            return
+
+        for name, sha256 in extracted_files:
+            self._file_extracted.emit(name, sha256)
+
+    @pyqtSlot(str, str)
+    def _on_file_extracted(self, name: str, sha256: str) -> None:
+        transfer = self._transfers_by_name[name]
+
+        if transfer.is_finished:
+            return
+
+        if transfer.file.sha256 and transfer.file.sha256 != sha256:
+            QgsMessageLog.logMessage(
+                self.tr(
+                    'File "{}" in the project archive does not match the cloud file, downloading it on its own'
+                ).format(name),
+                "QFieldSync",
+                Qgis.Info,
+            )
+            transfer.fs_filename.unlink()
+            return
+
+        size = transfer.fs_filename.stat().st_size
+        transfer._on_progress(size, size)
+        transfer.finish_in_batch(None)
+
+    @pyqtSlot(int, int)
+    def _on_retrying(self, retries_count: int, delay_ms: int) -> None:
+        for transfer in self.transfers:
+            if not transfer.is_finished:
+                transfer._on_retrying(retries_count, delay_ms)
+
+    @pyqtSlot()
+    def _on_finished(self) -> None:
+        reply = self._reply
+
+        try:
+            self.network_manager.handle_response(reply, False)
+        except CloudException as err:
+            if reply.error() == QNetworkReply.OperationCanceledError and (
+                self._extract_error is None
+            ):
+                for transfer in self.transfers:
+                    if not transfer.is_finished:
+                        transfer.finish_in_batch(err)
+
+                self._finish()
+                return
+
+            if err.httpCode in self.UNSUPPORTED_STATUS_CODES:
+                self.network_manager.is_archive_download_supported = False
+            elif self._extract_error is None:
+                QgsMessageLog.logMessage(
+                    self.tr("Project archive download failed: {}").format(err),
+                    "QFieldSync",
+                    Qgis.Info,
+                )
+
+        if self._extract_error is not None:
+            QgsMessageLog.logMessage(
+                self.tr("Project archive extraction failed: {}").format(
+                    self._extract_error
+                ),
+                "QFieldSync",
+                Qgis.Info,
+            )
+
+        for transfer in self.transfers:
+            if not transfer.is_finished:
+                # the files not extracted from the archive are downloaded on their own
+                transfer.detach_from_batch()
+                self.failed_transfers.append(transfer)
+
+        self._finish()
+
+    def _finish(self) -> None:
+        self.is_finished = True
+        self._reply.release()
+        self.finished.emit()
+
+
+class TransferBudget:
+    """Maximum number of parallel requests shared by several throttled file transferrers.
+
+    The transferrers take turns to send their next request, so the uploads, deletes and
+    downloads progress at the same time, while never exceeding the maximum together.
+    """
+
+    def __init__(self, max_parallel_requests: int = 8) -> None:
+        self.max_parallel_requests = max_parallel_requests
+        self.transferrers: List["ThrottledFileTransferrer"] = []
+        self._is_held = False
+        self._is_transferring = False
+
+    @property
+    def active_requests_count(self) -> int:
+        return sum(
+            transferrer.active_requests_count for transferrer in self.transferrers
+        )
+
+    @property
+    def has_free_slot(self) -> bool:
+        return self.active_requests_count < self.max_parallel_requests
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """Starts no request until the end of the block, so the transferrers started within it take turns from the first request."""
+        self._is_held = True
+
+        try:
+            yield
+        finally:
+            self._is_held = False
+
+        self.transfer()
+
+    def transfer(self) -> None:
+        # the local deletes finish right away, the loop below then starts the next ones
+        if self._is_held or self._is_transferring:
+            return
+
+        self._is_transferring = True
+
+        try:
+            is_started = True
+
+            while is_started:
+                is_started = False
+
+                for transferrer in self.transferrers:
+                    if not self.has_free_slot:
+                        return
+
+                    if transferrer.is_transfer_started and transferrer._start_next():
+                        is_started = True
+        finally:
+            self._is_transferring = False
+
+
 class ThrottledFileTransferrer(QObject):
     error = pyqtSignal(str, str)
     finished = pyqtSignal()
     aborted = pyqtSignal()
     file_finished = pyqtSignal(str)
+    file_retrying = pyqtSignal(str, int)
     progress = pyqtSignal(str, int, int)
 
+    """Files up to this size are uploaded in batches, when batching is enabled."""
+    BATCH_FILE_MAX_SIZE = 1024 * 1024
+    """Maximum total size of the files of a batch."""
+    BATCH_MAX_SIZE = 8 * 1024 * 1024
+    """Maximum number of files of a batch."""
+    BATCH_MAX_FILES_COUNT = 100
+    """Maximum number of files deleted by a batch."""
+    BATCH_MAX_DELETE_FILES_COUNT = 1000
+
     def __init__(
         self,
         network_manager,
@@ -604,6 +2188,12 @@ class ThrottledFileTransferrer(QObject):
         files: List[ProjectFile],
         transfer_type: FileTransfer.Type,
         max_parallel_requests: int = 8,
+        is_batching_enabled: bool = False,
+        is_archive_enabled: bool = False,
+        budget: Optional[TransferBudget] = None,
+        changesets: Optional[Dict[str, Path]] = None,
+        copies: Optional[Dict[str, str]] = None,
+        expected_sha256s: Optional[Dict[str, str]] = None,
     ) -> None:
         super(QObject, self).__init__()
 
@@ -613,45 +2203,301 @@ class ThrottledFileTransferrer(QObject):
         self.files = files
         self.filenames = [f.name for f in files]
         self.max_parallel_requests = max_parallel_requests
+        # the maximum number of parallel requests is shared with other transferrers, if any
+        self.budget = budget
+        # the project files are uploaded once these transferrers are finished too, see `_can_start`
+        self.project_file_prerequisites: List[ThrottledFileTransferrer] = []
+        # the files are deleted once copied by the copies of these transferrers, see `_can_start`
+        self.copy_prerequisites: List[ThrottledFileTransferrer] = []
+        # the number of copies not finished yet, by copied filename
+        self.pending_copy_sources: Dict[str, int] = {}
+        # small files are uploaded and files are deleted several at once, see `FileTransferBatch`
+        self.is_batching_enabled = is_batching_enabled and transfer_type in (
+            FileTransfer.Type.UPLOAD,
+            FileTransfer.Type.DELETE,
+        )
+        self.batch_file_max_size = self.BATCH_FILE_MAX_SIZE
+        self.batch_max_size = self.BATCH_MAX_SIZE
+        self.batch_max_files_count = (
+            self.BATCH_MAX_DELETE_FILES_COUNT
+            if transfer_type == FileTransfer.Type.DELETE
+            else self.BATCH_MAX_FILES_COUNT
+        )
+        self.batches: List[FileTransferBatch] = []
+        # all the files are downloaded as a single archive, see `ProjectArchiveTransfer`
+        self.is_archive_enabled = (
+            is_archive_enabled and transfer_type == FileTransfer.Type.DOWNLOAD
+        )
+        self.archive: Optional[ProjectArchiveTransfer] = None
+        # the batches and the transfers sent on their own, in sending order, built on the first `transfer`
+        self._queue: Optional[
+            List[Union[FileTransfer, FileTransferBatch, ProjectArchiveTransfer]]
+        ] = None
+        self._is_transferring = False
         self.finished_count = 0
         self.temp_dir = Path(cloud_project.local_dir).joinpath(".qfieldsync")
         self.transfer_type = transfer_type
 
         for file in self.files:
+            # the uploads of GeoPackages with a changeset send only the changed rows
+            changeset_filename = (changesets or {}).get(file.name)
+            # the uploads of files moved locally copy the file already on the server
+            copy_source = (copies or {}).get(file.name)
+
+            if changeset_filename is not None:
+                transfer_type = FileTransfer.Type.CHANGESET
+            elif copy_source is not None:
+                transfer_type = FileTransfer.Type.COPY
+            else:
+                transfer_type = self.transfer_type
+
             transfer = FileTransfer(
                 self.network_manager,
                 self.cloud_project,
-                self.transfer_type,
+                transfer_type,
                 file,
                 self.temp_dir.joinpath(str(self.transfer_type.value), file.name),
+                changeset_filename=changeset_filename,
+                copy_source=copy_source,
+                expected_sha256=(expected_sha256s or {}).get(file.name),
             )
+
+            if copy_source is not None:
+                self.pending_copy_sources[copy_source] = (
+                    self.pending_copy_sources.get(copy_source, 0) + 1
+                )
+
+            # bind the current `transfer` as default argument, the loop variable changes
             transfer.progress.connect(
-                lambda *args: self._on_transfer_progress(transfer, *args)
+                lambda *args, transfer=transfer: self._on_transfer_progress(
+                    transfer, *args
+                )
+            )
+            transfer.retrying.connect(
+                lambda retries_count, transfer=transfer: self.file_retrying.emit(
+                    transfer.filename, retries_count
+                )
             )
             transfer.finished.connect(
-                lambda *args: self._on_transfer_finished(transfer, *args)
+                lambda *args, transfer=transfer: self._on_transfer_finished(
+                    transfer, *args
+                )
             )
 
             assert file.name not in self.transfers
 
             self.transfers[file.name] = transfer
 
+        if self.budget is not None:
+            self.budget.transferrers.append(self)
+
+    @property
+    def is_transfer_started(self) -> bool:
+        return self._queue is not None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.finished_count == len(self.transfers)
+
+    @property
+    def active_requests_count(self) -> int:
+        """The number of batches and transfers started and waiting for a response."""
+        if self._queue is None:
+            return 0
+
+        return sum(1 for t in self._queue if t.is_started and not t.is_finished)
+
     def transfer(self):
-        transfers_count = 0
+        if self._queue is None:
+            self._queue = self._build_queue()
+
+        if self.budget is not None:
+            self.budget.transfer()
+            return
+
+        # the local deletes finish right away, the loop below then starts the next ones
+        if self._is_transferring:
+            return
+
+        self._is_transferring = True
+
+        try:
+            while (
+                self.active_requests_count < self.max_parallel_requests
+                and self._start_next()
+            ):
+                pass
+        finally:
+            self._is_transferring = False
+
+    def _start_next(self) -> bool:
+        """Starts the next batch or transfer of the queue, returns whether one has been started."""
+        assert self._queue is not None
+
+        for transfer in self._queue:
+            # skip a started request, either finished or still waiting for a response
+            if transfer.is_started or transfer.is_finished:
+                continue
+
+            # the next ones might start, e.g. the deletes not waiting for a copy
+            if not self._can_start(transfer):
+                continue
+
+            transfer.transfer()
+            return True
+
+        return False
+
+    def _can_start(
+        self, transfer: Union[FileTransfer, FileTransferBatch, ProjectArchiveTransfer]
+    ) -> bool:
+        if self._is_copy_source_delete(transfer):
+            return False
+
+        if not self._is_project_file_upload(transfer):
+            return True
+
+        # the project files trigger a job on the server, so they are uploaded strictly
+        # once all the other files are uploaded, and deleted
+        for other_transfer in self._queue:
+            if not (
+                other_transfer.is_finished
+                or self._is_project_file_upload(other_transfer)
+            ):
+                return False
+
+        return all(
+            transferrer.is_finished for transferrer in self.project_file_prerequisites
+        )
+
+    def _is_copy_source_delete(
+        self, transfer: Union[FileTransfer, FileTransferBatch, ProjectArchiveTransfer]
+    ) -> bool:
+        """Checks whether the transfer deletes a file still to be copied on the server."""
+        if isinstance(transfer, FileTransfer):
+            transfers = [transfer]
+        elif isinstance(transfer, FileTransferBatch):
+            transfers = transfer.transfers
+        else:
+            return False
+
+        return any(
+            t.type == FileTransfer.Type.DELETE
+            and t.filename in transferrer.pending_copy_sources
+            for transferrer in self.copy_prerequisites
+            for t in transfers
+        )
+
+    def _is_project_file_upload(
+        self, transfer: Union[FileTransfer, FileTransferBatch, ProjectArchiveTransfer]
+    ) -> bool:
+        return (
+            isinstance(transfer, FileTransfer)
+            and transfer.type == FileTransfer.Type.UPLOAD
+            and transfer.file.path.suffix in (".qgs", ".qgz")
+        )
+
+    def _build_queue(
+        self,
+    ) -> List[Union[FileTransfer, FileTransferBatch, ProjectArchiveTransfer]]:
+        if (
+            self.is_archive_enabled
+            and self.network_manager.is_archive_download_supported
+            and len(self.transfers) > 1
+        ):
+            self.archive = ProjectArchiveTransfer(
+                self.network_manager,
+                self.cloud_project,
+                list(self.transfers.values()),
+            )
+            self.archive.finished.connect(lambda: self._on_batch_finished(self.archive))
+
+            # the files not extracted from the archive are added once it is finished
+            return [self.archive]
+
+        if self.transfer_type == FileTransfer.Type.UPLOAD:
+            is_batch_supported = self.network_manager.is_upload_batch_supported
+        else:
+            is_batch_supported = self.network_manager.is_delete_batch_supported
+
+        if not self.is_batching_enabled or not is_batch_supported:
+            return list(self.transfers.values())
+
+        queue: List[Union[FileTransfer, FileTransferBatch]] = []
+        batch_transfers: List[FileTransfer] = []
+        batch_size = 0
 
         for transfer in self.transfers.values():
-            if transfer.is_finished:
+            if self.transfer_type == FileTransfer.Type.DELETE:
+                size = 0
+                # local files are deleted right away, without any request
+                is_sent_alone = transfer.is_local_delete
+            else:
+                size = transfer.fs_filename.stat().st_size
+                # the project files trigger a job on the server, so they are always sent on their own
+                is_sent_alone = (
+                    size > self.batch_file_max_size
+                    or transfer.file.path.suffix in (".qgs", ".qgz")
+                    or transfer.type
+                    in (FileTransfer.Type.CHANGESET, FileTransfer.Type.COPY)
+                )
+
+            if is_sent_alone:
+                queue.append(transfer)
                 continue
 
-            transfers_count += 1
+            if batch_transfers and (
+                batch_size + size > self.batch_max_size
+                or len(batch_transfers) == self.batch_max_files_count
+            ):
+                queue.append(self._create_batch(batch_transfers))
+                batch_transfers = []
+                batch_size = 0
+
+            batch_transfers.append(transfer)
+            batch_size += size
+
+        if batch_transfers:
+            queue.append(self._create_batch(batch_transfers))
+
+        # the batches are sent before the files sent on their own, so the project files stay the last
+        queue.sort(key=lambda t: isinstance(t, FileTransfer))
+
+        return queue
 
-            # skip a started request but still waiting for a response
-            if not transfer.is_started:
-                transfer.transfer()
+    def _create_batch(
+        self, transfers: List[FileTransfer]
+    ) -> Union[FileTransfer, FileTransferBatch]:
+        # a single file is sent on its own, as usual
+        if len(transfers) == 1:
+            return transfers[0]
 
-            if transfers_count == self.max_parallel_requests:
+        batch = FileTransferBatch(self.network_manager, self.cloud_project, transfers)
+        batch.finished.connect(lambda: self._on_batch_finished(batch))
+        self.batches.append(batch)
+
+        return batch
+
+    def _on_batch_finished(
+        self, batch: Union[FileTransferBatch, ProjectArchiveTransfer]
+    ) -> None:
+        assert self._queue is not None
+
+        # the files not transferred within the batch are sent again on their own, still
+        # before the project files not sent yet
+        idx = len(self._queue)
+        for i, transfer in enumerate(self._queue):
+            if (
+                isinstance(transfer, FileTransfer)
+                and transfer.file.path.suffix in (".qgs", ".qgz")
+                and not transfer.is_started
+            ):
+                idx = i
                 break
 
+        self._queue[idx:idx] = batch.failed_transfers
+        self.transfer()
+
     def abort(self) -> None:
         for transfer in self.transfers.values():
             transfer.abort()
@@ -664,6 +2510,13 @@ class ThrottledFileTransferrer(QObject):
         self.progress.emit(transfer.filename, bytes_received_sum, bytes_total_sum)
 
     def _on_transfer_finished(self, transfer: FileTransfer) -> None:
+        # also when the copy fell back to an upload, the source is not needed anymore
+        if transfer.copy_source is not None:
+            self.pending_copy_sources[transfer.copy_source] -= 1
+
+            if not self.pending_copy_sources[transfer.copy_source]:
+                del self.pending_copy_sources[transfer.copy_source]
+
         self.transfer()
 
         if transfer.error:
@@ -671,7 +2524,11 @@ class ThrottledFileTransferrer(QObject):
                 msg = self.tr('Downloading file "{}" failed!').format(
                     transfer.fs_filename
                 )
-            elif transfer.type == FileTransfer.Type.UPLOAD:
+            elif transfer.type in (
+                FileTransfer.Type.UPLOAD,
+                FileTransfer.Type.CHANGESET,
+                FileTransfer.Type.COPY,
+            ):
                 msg = self.tr('Uploading file "{}" failed!').format(
                     transfer.fs_filename
                 )
@@ -689,6 +2546,10 @@ class ThrottledFileTransferrer(QObject):
         self.file_finished.emit(transfer.filename)
 
         if self.finished_count == len(self.transfers):
+            # the project files uploaded by another transferrer might wait for this one
+            if self.budget is not None:
+                self.budget.transfer()
+
             self.finished.emit()
             return
 
@@ -707,6 +2568,7 @@ class TransferFileLogsModel(QAbstractListModel):
                 self.transfers.append(transfer)
 
             transferrer.file_finished.connect(self._on_updated_transfer)
+            transferrer.file_retrying.connect(self._on_updated_transfer)
             transferrer.error.connect(self._on_updated_transfer)
             transferrer.progress.connect(self._on_updated_transfer)
 
@@ -718,7 +2580,13 @@ class TransferFileLogsModel(QAbstractListModel):
             return None
 
         if role == Qt.DisplayRole:
-            return self._data_string(self.transfers[index.row()])
+            transfer = self.transfers[index.row()]
+            text = self._data_string(transfer)
+
+            if transfer.retries_count:
+                text += self.tr(" (retried {} time(s))").format(transfer.retries_count)
+
+            return text
 
         return None
 
@@ -758,6 +2626,44 @@ class TransferFileLogsModel(QAbstractListModel):
                 )
             else:
                 return self.tr('File to download "{}"'.format(transfer.filename))
+        elif transfer.type == FileTransfer.Type.CHANGESET:
+            if transfer.is_aborted:
+                return self.tr('Aborted "{}" upload'.format(transfer.filename))
+            elif transfer.is_failed:
+                return self.tr(
+                    'Failed to upload "{}": {}'.format(transfer.filename, error_msg)
+                )
+            elif transfer.is_finished:
+                return self.tr('Uploaded changes of "{}"'.format(transfer.filename))
+            elif transfer.is_started:
+                return self.tr('Uploading changes of "{}"'.format(transfer.filename))
+            else:
+                return self.tr('Changes to upload "{}"'.format(transfer.filename))
+        elif transfer.type == FileTransfer.Type.COPY:
+            if transfer.is_aborted:
+                return self.tr('Aborted "{}" upload'.format(transfer.filename))
+            elif transfer.is_failed:
+                return self.tr(
+                    'Failed to upload "{}": {}'.format(transfer.filename, error_msg)
+                )
+            elif transfer.is_finished:
+                return self.tr(
+                    'Copied "{}" to "{}" on the cloud'.format(
+                        transfer.copy_source, transfer.filename
+                    )
+                )
+            elif transfer.is_started:
+                return self.tr(
+                    'Copying "{}" to "{}" on the cloud'.format(
+                        transfer.copy_source, transfer.filename
+                    )
+                )
+            else:
+                return self.tr(
+                    'File to copy from "{}" "{}"'.format(
+                        transfer.copy_source, transfer.filename
+                    )
+                )
         elif transfer.type == FileTransfer.Type.UPLOAD:
             if transfer.is_aborted:
                 return self.tr('Aborted "{}" upload'.format(transfer.filename))
@@ -788,7 +2694,9 @@ class TransferFileLogsModel(QAbstractListModel):
                     )
                 elif transfer.is_failed:
                     return self.tr(
-                        'Failed delete "{}" on the cloud'.format(transfer.filename)
+                        'Failed delete "{}" on the cloud: {}'.format(
+                            transfer.filename, error_msg
+                        )
                     )
                 elif transfer.is_finished:
                     return self.tr(
@@ -1,8 +1,12 @@
 from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from qgis.PyQt.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
 
 from qfieldsync.setting_manager import (
     Bool,
     Dictionary,
+    Integer,
     Scope,
     SettingManager,
     String,
@@ -28,11 +32,128 @@ class Preferences(SettingManager):
         self.add_setting(Dictionary("dirsToCopy", Scope.Project, {}))
         self.add_setting(Stringlist("attachmentDirs", Scope.Project, ["DCIM"]))
         self.add_setting(Dictionary("qfieldCloudProjectLocalDirs", Scope.Global, {}))
-        self.add_setting(Dictionary("qfieldCloudLastProjectFiles", Scope.Global, {}))
         self.add_setting(String("qfieldCloudServerUrl", Scope.Global, ""))
         self.add_setting(String("qfieldCloudAuthcfg", Scope.Global, ""))
         self.add_setting(Bool("qfieldCloudRememberMe", Scope.Global, True))
+        self.add_setting(Bool("qfieldCloudHttp2", Scope.Global, False))
+        self.add_setting(Bool("qfieldCloudPipelinedSync", Scope.Global, False))
+        self.add_setting(Bool("qfieldCloudGpkgFingerprint", Scope.Global, False))
+        self.add_setting(Bool("qfieldCloudChangesetUpload", Scope.Global, False))
+        self.add_setting(Bool("qfieldCloudServerCopy", Scope.Global, False))
+        self.add_setting(Bool("qfieldCloudImageRecompression", Scope.Global, False))
+        self.add_setting(Integer("qfieldCloudImageMaxSize", Scope.Global, 2048))
+        self.add_setting(Integer("qfieldCloudImageQuality", Scope.Global, 85))
         self.add_setting(
             String("cloudDirectory", Scope.Global, str(home.joinpath("QField/cloud")))
         )
         self.add_setting(Bool("firstRun", Scope.Global, True))
+
+
+class PreferencesCache(QObject):
+    """In-process cache of the frequently accessed global preferences.
+
+    The values are read from QSettings once and then served from memory. Changes are
+    applied to the memory copy immediately and written to QSettings after a short
+    delay, so a burst of changes results in a single write per setting.
+    """
+
+    """Settings served from the cache, all of them are global."""
+    CACHED_SETTINGS = ("qfieldCloudProjectLocalDirs",)
+
+    """Delay before the changed values are written to QSettings."""
+    FLUSH_DELAY_MS = 1000
+
+    """Emitted with the setting name and the changed dictionary key whenever a cached value changes.
+    The key is empty when the whole value changed."""
+    value_changed = pyqtSignal(str, str)
+
+    def __init__(self) -> None:
+        super(PreferencesCache, self).__init__()
+        self._preferences: Optional[Preferences] = None
+        self._values: Dict[str, Any] = {}
+        self._dirty_names: Set[str] = set()
+        self._flush_timer: Optional[QTimer] = None
+
+    def value(self, name: str) -> Any:
+        """Returns a copy of the setting value, modify it only through `set_value`."""
+        value = self._get(name)
+
+        if isinstance(value, (dict, list)):
+            return value.copy()
+
+        return value
+
+    def set_value(self, name: str, value: Any) -> None:
+        if name not in self.CACHED_SETTINGS:
+            self._get_preferences().set_value(name, value)
+            return
+
+        if self._get(name) == value:
+            return
+
+        self._values[name] = value
+        self._mark_dirty(name)
+
+    def project_local_dirs(self) -> Dict[str, str]:
+        return self.value("qfieldCloudProjectLocalDirs")
+
+    def project_local_dir(self, project_id: str) -> Optional[str]:
+        return self._get("qfieldCloudProjectLocalDirs").get(project_id)
+
+    def set_project_local_dir(self, project_id: str, local_dir: Optional[str]) -> None:
+        local_dirs = self._get("qfieldCloudProjectLocalDirs")
+
+        if project_id in local_dirs and local_dirs[project_id] == local_dir:
+            return
+
+        local_dirs[project_id] = local_dir
+        self._mark_dirty("qfieldCloudProjectLocalDirs", project_id)
+
+    def flush(self) -> None:
+        """Writes the pending changes to QSettings."""
+        if self._flush_timer:
+            self._flush_timer.stop()
+
+        dirty_names = self._dirty_names
+        self._dirty_names = set()
+
+        for name in dirty_names:
+            self._get_preferences().set_value(name, self._values[name])
+
+    def _get_preferences(self) -> Preferences:
+        # created lazily, as the module might be imported before the application is started
+        if self._preferences is None:
+            self._preferences = Preferences()
+
+        return self._preferences
+
+    def _get(self, name: str) -> Any:
+        if name not in self.CACHED_SETTINGS:
+            return self._get_preferences().value(name)
+
+        if name not in self._values:
+            self._values[name] = self._get_preferences().value(name)
+
+        return self._values[name]
+
+    def _mark_dirty(self, name: str, key: str = "") -> None:
+        self._dirty_names.add(name)
+
+        if self._flush_timer is None:
+            self._flush_timer = QTimer(self)
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.setInterval(self.FLUSH_DELAY_MS)
+            self._flush_timer.timeout.connect(self.flush)
+
+            app = QCoreApplication.instance()
+            if app:
+                app.aboutToQuit.connect(self.flush)
+
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+        self.value_changed.emit(name, key)
+
+
+# Modules are evaluated only once, therefore it works as a poor man version of singleton.
+preferences_cache = PreferencesCache()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from qfieldsync.utils.gpkg_changeset import ChangesetError, get_fingerprint
+from qfieldsync.utils.project_fingerprint import (
+    ProjectFingerprintError,
+    get_project_fingerprint,
+)
+
+# the fingerprints of the files rewritten without any meaningful change, by entry key
+FINGERPRINT_FUNCTIONS: Dict[str, Callable[[Path], Any]] = {
+    "gpkg_fingerprint": get_fingerprint,
+    "project_fingerprint": get_project_fingerprint,
+}
+
+
+class SyncManifest:
+    """The state of the project files as of their last synchronization, kept in the local directory of the project.
+
+    Each entry gives the SHA256 of the local file and of the cloud file once they were
+    synchronized, which might differ when the cloud file is not a byte copy of the
+    local file, e.g. once a changeset has been applied by the server. Copies of the
+    synchronized files, the baselines, are kept for some of them. The GeoPackages and
+    the QGIS projects might also have a fingerprint of their meaningful content, see
+    `get_fingerprint` and `get_project_fingerprint`. The last fingerprint computed for
+    each file is kept along with the SHA256 it has been computed for, so the same
+    bytes are never fingerprinted twice.
+
+    It is stored in the `.qfieldsync_manifest` directory rather than in `.qfieldsync`,
+    which is emptied at the start of every synchronization.
+    """
+
+    DIRNAME = ".qfieldsync_manifest"
+    FILENAME = "manifest.json"
+    VERSION = 1
+
+    def __init__(self, local_dir: Union[str, Path]) -> None:
+        self.dirname = Path(local_dir).joinpath(self.DIRNAME)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # whether entries changed since the manifest has been loaded or saved
+        self.is_modified = False
+
+        try:
+            with open(self.dirname.joinpath(self.FILENAME)) as file:
+                payload = json.load(file)
+
+            if payload.get("version") == self.VERSION:
+                self._entries = payload["files"]
+        except (OSError, ValueError, KeyError):
+            # a missing or unreadable manifest only means nothing is known about the files
+            pass
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(name)
+
+    def set(self, name: str, local_sha256: str, cloud_sha256: str, **values) -> None:
+        """Records the state of a synchronized file, along with other `values` about it."""
+        self._entries[name] = {
+            "local_sha256": local_sha256,
+            "cloud_sha256": cloud_sha256,
+            **values,
+        }
+        self.is_modified = True
+
+    def remove(self, name: str) -> None:
+        if self._entries.pop(name, None) is not None:
+            self.is_modified = True
+
+        baseline_path = self.baseline_path(name)
+        if baseline_path.exists():
+            baseline_path.unlink()
+
+    def is_synchronized(
+        self,
+        name: str,
+        local_sha256: Optional[str],
+        cloud_sha256: Optional[str],
+        local_path: Optional[Path] = None,
+    ) -> bool:
+        """Checks whether neither the local nor the cloud file changed since the last synchronization.
+
+        A file with other bytes but the same fingerprint has not changed, e.g. a vacuumed
+        GeoPackage or a project saved again by QGIS. Its new SHA256 is then recorded, so
+        its fingerprint is not computed again.
+        """
+        entry = self._entries.get(name)
+
+        if (
+            entry is None
+            or local_sha256 is None
+            or entry["cloud_sha256"] != cloud_sha256
+        ):
+            return False
+
+        if entry["local_sha256"] == local_sha256:
+            return True
+
+        if local_path is None or not self._has_same_fingerprint(
+            name, local_path, local_sha256
+        ):
+            return False
+
+        entry["local_sha256"] = local_sha256
+        self.is_modified = True
+
+        return True
+
+    def get_fingerprint(
+        self, name: str, key: str, local_path: Path, local_sha256: str
+    ) -> Any:
+        """Returns the fingerprint of the file, computed only if not known yet for its SHA256.
+
+        Raises `ChangesetError` or `ProjectFingerprintError` if it cannot be computed.
+        """
+        entry = self._entries.get(name)
+        cache = entry.get("fingerprint_cache") if entry else None
+
+        if cache and cache["sha256"] == local_sha256 and cache["key"] == key:
+            return cache["value"]
+
+        fingerprint = FINGERPRINT_FUNCTIONS[key](local_path)
+
+        if entry is not None:
+            entry["fingerprint_cache"] = {
+                "sha256": local_sha256,
+                "key": key,
+                "value": fingerprint,
+            }
+            self.is_modified = True
+
+        return fingerprint
+
+    def _has_same_fingerprint(
+        self, name: str, local_path: Path, local_sha256: str
+    ) -> bool:
+        entry = self._entries[name]
+
+        for key in FINGERPRINT_FUNCTIONS:
+            if entry.get(key) is None:
+                continue
+
+            try:
+                return (
+                    self.get_fingerprint(name, key, local_path, local_sha256)
+                    == entry[key]
+                )
+            except (ChangesetError, ProjectFingerprintError):
+                return False
+
+        return False
+
+    def baseline_path(self, name: str) -> Path:
+        return self.dirname.joinpath("baselines", name)
+
+    def get_baseline(self, name: str, cloud_sha256: Optional[str]) -> Optional[Path]:
+        """Returns the baseline copy of the file, if the cloud file did not change since."""
+        entry = self._entries.get(name)
+        baseline_path = self.baseline_path(name)
+
+        if (
+            entry is None
+            or entry["cloud_sha256"] != cloud_sha256
+            or not baseline_path.is_file()
+        ):
+            return None
+
+        return baseline_path
+
+    def set_baseline(self, name: str, filename: Union[str, Path]) -> None:
+        """Moves the file to become the baseline copy of the synchronized file."""
+        baseline_path = self.baseline_path(name)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+
+        os.replace(filename, baseline_path)
+
+    def save(self) -> None:
+        self.dirname.mkdir(parents=True, exist_ok=True)
+
+        # written aside first, so an interrupted write does not lose the previous state
+        temp_filename = self.dirname.joinpath(self.FILENAME + ".tmp")
+        with open(temp_filename, "w") as file:
+            json.dump({"version": self.VERSION, "files": self._entries}, file)
+
+        os.replace(temp_filename, self.dirname.joinpath(self.FILENAME))
+
+        self.is_modified = False
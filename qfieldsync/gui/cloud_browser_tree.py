@@ -77,8 +77,17 @@ class QFieldCloudRootItem(QgsDataCollectionItem):
 
         self.network_manager.login_finished.connect(lambda: self.update_icon())
         self.network_manager.token_changed.connect(lambda: self.update_icon())
+        self.network_manager.projects_cache.projects_added.connect(
+            lambda project_ids: self.on_projects_added(project_ids)
+        )
+        self.network_manager.projects_cache.projects_removed.connect(
+            lambda project_ids: self.on_projects_removed(project_ids)
+        )
+        self.network_manager.projects_cache.projects_changed.connect(
+            lambda project_ids: self.on_projects_changed(project_ids)
+        )
         self.network_manager.projects_cache.projects_updated.connect(
-            lambda: self.refreshing_cloud_projects()
+            lambda: self.on_projects_updated()
         )
 
     def capabilities2(self):
@@ -118,6 +127,31 @@ class QFieldCloudRootItem(QgsDataCollectionItem):
         self.depopulate()
         self.refresh()
 
+    def populated_groups(self) -> List["QFieldCloudGroupItem"]:
+        return [
+            child
+            for child in self.children()
+            if isinstance(child, QFieldCloudGroupItem)
+            and child.state() == QgsDataItem.Populated
+        ]
+
+    def on_projects_added(self, project_ids: List[str]):
+        for group in self.populated_groups():
+            group.add_projects(project_ids)
+
+    def on_projects_removed(self, project_ids: List[str]):
+        for group in self.populated_groups():
+            group.remove_projects(project_ids)
+
+    def on_projects_changed(self, project_ids: List[str]):
+        for group in self.populated_groups():
+            group.update_projects(project_ids)
+
+    def on_projects_updated(self):
+        # the projects list has been reset, e.g. after signing out
+        if self.network_manager.projects_cache.projects is None:
+            self.refreshing_cloud_projects()
+
     def update_icon(self):
         if self.network_manager.has_token():
             self.setIcon(
@@ -159,15 +193,63 @@ class QFieldCloudGroupItem(QgsDataCollectionItem):
             projects = self.network_manager.projects_cache.projects
 
         for project in self.network_manager.projects_cache.projects:
-            if (self.project_type == "public" and not project.is_private) or (
-                self.project_type == "private" and project.is_private
-            ):
+            if self.accepts_project(project):
                 item = QFieldCloudProjectItem(self, project)
                 item.setState(QgsDataItem.Populated)
                 items.append(item)
 
         return items
 
+    def accepts_project(self, project: CloudProject) -> bool:
+        return (self.project_type == "public" and not project.is_private) or (
+            self.project_type == "private" and project.is_private
+        )
+
+    def add_projects(self, project_ids: List[str]) -> None:
+        for project_id in project_ids:
+            project = self.network_manager.projects_cache.find_project(project_id)
+
+            if not project or not self.accepts_project(project):
+                continue
+
+            item = QFieldCloudProjectItem(self, project)
+            item.setState(QgsDataItem.Populated)
+            self.addChildItem(item, True)
+
+    def remove_projects(self, project_ids: List[str]) -> None:
+        # all the projects are removed on logout, a set keeps the lookups constant
+        project_ids_set = set(project_ids)
+
+        for child in self.children():
+            if (
+                isinstance(child, QFieldCloudProjectItem)
+                and child.project_id in project_ids_set
+            ):
+                self.deleteChildItem(child)
+
+    def update_projects(self, project_ids: List[str]) -> None:
+        # keeps the order of the projects, with constant lookups and removals
+        missing_project_ids = dict.fromkeys(project_ids)
+
+        for child in self.children():
+            if not isinstance(child, QFieldCloudProjectItem):
+                continue
+
+            if child.project_id not in missing_project_ids:
+                continue
+
+            del missing_project_ids[child.project_id]
+            project = self.network_manager.projects_cache.find_project(child.project_id)
+
+            # the privacy of the project might have changed, so it belongs to another group now
+            if not project or not self.accepts_project(project):
+                self.deleteChildItem(child)
+                continue
+
+            child.update_project(project)
+
+        self.add_projects(list(missing_project_ids))
+
 
 class QFieldCloudProjectItem(QgsDataItem):
     """QFieldCloud project item."""
@@ -181,6 +263,10 @@ class QFieldCloudProjectItem(QgsDataItem):
         )
         self.project_id = project.id
         project = parent.network_manager.projects_cache.find_project(self.project_id)
+        self.update_project(project)
+
+    def update_project(self, project: CloudProject) -> None:
+        self.setName(project.name)
         self.setIcon(
             QIcon(
                 str(
@@ -139,16 +139,17 @@ class CloudCreateProjectWidget(QWidget, WidgetUi):
             self.cloudifyInfoLabel.setEnabled(True)
 
     def cloudify_project(self):
-        for cloud_project in self.network_manager.projects_cache.projects:
-            if cloud_project.name == self.get_cloud_project_name():
-                QMessageBox.warning(
-                    None,
-                    self.tr("Warning"),
-                    self.tr(
-                        "The project name is already present in your QFieldCloud repository, please pick a different name."
-                    ),
-                )
-                return
+        if self.network_manager.projects_cache.has_project_name(
+            self.get_cloud_project_name()
+        ):
+            QMessageBox.warning(
+                None,
+                self.tr("Warning"),
+                self.tr(
+                    "The project name is already present in your QFieldCloud repository, please pick a different name."
+                ),
+            )
+            return
 
         if get_qgis_files_within_dir(self.localDirLineEdit.text()):
             QMessageBox.warning(
@@ -220,6 +221,7 @@ class CloudCreateProjectWidget(QWidget, WidgetUi):
             True,
         )
         reply.finished.connect(lambda: self.on_create_project_finished(reply))
+        reply.finished.connect(reply.release)
 
     def on_create_project_finished(self, reply):
         try:
@@ -255,7 +257,8 @@ class CloudCreateProjectWidget(QWidget, WidgetUi):
     def after_project_creation_action(self, project_id: str):
         QApplication.restoreOverrideCursor()
 
-        self.network_manager.projects_cache.refresh()
+        # the running refresh might not include the new project yet
+        self.network_manager.projects_cache.refresh(force=True)
 
         self.finished.emit(project_id)
 
@@ -349,6 +352,7 @@ class CloudCreateProjectWidget(QWidget, WidgetUi):
             self.network_manager.auth().config("username")
         )
         reply.finished.connect(lambda: self.on_refresh_project_owners_finished(reply))
+        reply.finished.connect(reply.release)
 
     def on_refresh_project_owners_finished(self, reply):
         items = [
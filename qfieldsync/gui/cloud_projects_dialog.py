@@ -22,7 +22,7 @@
 """
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from qgis.core import Qgis, QgsApplication, QgsProject
 from qgis.PyQt.QtCore import (
@@ -116,6 +116,9 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
         self.network_manager = network_manager
         self._current_cloud_project_id = project.id if project else None
         self._suggest_upload_files = False
+        self._project_files_tree_stack = []
+        self._project_files_tree_last_name = ""
+        self._project_files_tree_is_sorted = True
         self.transfer_dialog = None
         self.project_transfer = None
 
@@ -242,6 +245,15 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
         self.network_manager.projects_cache.projects_error.connect(
             lambda err: self.on_projects_cached_projects_error(err)
         )
+        self.network_manager.projects_cache.projects_added.connect(
+            lambda project_ids: self.on_projects_cached_projects_added(project_ids)
+        )
+        self.network_manager.projects_cache.projects_removed.connect(
+            lambda project_ids: self.on_projects_cached_projects_removed(project_ids)
+        )
+        self.network_manager.projects_cache.projects_changed.connect(
+            lambda project_ids: self.on_projects_cached_projects_changed(project_ids)
+        )
         self.network_manager.projects_cache.projects_updated.connect(
             lambda: self.on_projects_cached_projects_updated()
         )
@@ -253,6 +265,12 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
                 project_id, error
             )
         )
+        self.network_manager.projects_cache.project_files_received.connect(
+            lambda project_id,
+            project_files: self.on_projects_cached_project_files_received(
+                project_id, project_files
+            )
+        )
         self.network_manager.projects_cache.project_files_updated.connect(
             lambda project_id: self.on_projects_cached_project_files_updated(project_id)
         )
@@ -308,22 +326,69 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
         self.createButton.setEnabled(True)
 
     def on_projects_cached_projects_started(self) -> None:
-        self.projectsStack.setEnabled(False)
+        # the already listed projects stay usable, they are updated in place
+        if self.projectsTable.rowCount() == 0:
+            self.projectsStack.setEnabled(False)
+
         self.set_feedback("Loading projects list…", Qt.blue)
 
     def on_projects_cached_projects_error(self, error: str) -> None:
         self.projectsStack.setEnabled(True)
         self.set_feedback(error)
 
+    def on_projects_cached_projects_added(self, project_ids: List[str]) -> None:
+        self.projectsStack.setEnabled(True)
+        self.projectsTable.setSortingEnabled(False)
+
+        for project_id in project_ids:
+            cloud_project = self.network_manager.projects_cache.find_project(project_id)
+
+            if cloud_project:
+                self.add_project_row(cloud_project)
+
+        self.projectsTable.setSortingEnabled(True)
+
+    def on_projects_cached_projects_removed(self, project_ids: List[str]) -> None:
+        # all the projects are removed on logout, a set keeps the lookups constant
+        project_ids_set = set(project_ids)
+
+        for row_idx in reversed(range(self.projectsTable.rowCount())):
+            cloud_project = self.projectsTable.item(row_idx, 0).data(Qt.UserRole)
+
+            if cloud_project.id in project_ids_set:
+                self.projectsTable.removeRow(row_idx)
+
+    def on_projects_cached_projects_changed(self, project_ids: List[str]) -> None:
+        project_ids_set = set(project_ids)
+        self.projectsTable.setSortingEnabled(False)
+
+        for row_idx in range(self.projectsTable.rowCount()):
+            cloud_project = self.projectsTable.item(row_idx, 0).data(Qt.UserRole)
+
+            if cloud_project.id in project_ids_set:
+                self.set_project_row(row_idx, cloud_project)
+
+        self.projectsTable.setSortingEnabled(True)
+
     def on_projects_cached_projects_updated(self) -> None:
         self.projectsStack.setEnabled(True)
         self.projects_refreshed.emit()
-        self.show_projects()
+
+        # the projects list has been reset or there is nothing to show
+        if not self.network_manager.projects_cache.projects:
+            self.show_projects()
+            return
+
+        self.set_feedback(None)
+        self.on_projects_table_rendered()
 
     def on_projects_cached_project_files_started(self, project_id: str) -> None:
         self.projectFilesTab.setEnabled(False)
         self.set_feedback(None)
 
+        if self.current_cloud_project and self.current_cloud_project.id == project_id:
+            self.clear_project_files_tree()
+
     def on_projects_cached_project_files_error(
         self, project_id: str, error: str
     ) -> None:
@@ -352,6 +417,18 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
 
             self.expand_state(child, should_expand)
 
+    def on_projects_cached_project_files_received(
+        self, project_id: str, project_files: List[ProjectFile]
+    ) -> None:
+        if (
+            not self.current_cloud_project
+            or self.current_cloud_project.id != project_id
+        ):
+            return
+
+        self.projectFilesTab.setEnabled(True)
+        self.add_project_files_tree_items(project_files)
+
     def on_projects_cached_project_files_updated(self, project_id: str) -> None:
         if (
             not self.current_cloud_project
@@ -361,21 +438,42 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
 
         self.projectFilesTab.setEnabled(True)
 
+        # the files are usually received already sorted, otherwise build the tree again from the sorted files
+        if self._project_files_tree_is_sorted:
+            return
+
+        self.clear_project_files_tree()
+        self.add_project_files_tree_items(
+            self.current_cloud_project.get_files(ProjectFileCheckout.Cloud)
+        )
+
+    def clear_project_files_tree(self) -> None:
+        self.projectFilesTree.clear()
+        self._project_files_tree_stack = []
+        self._project_files_tree_last_name = ""
+        self._project_files_tree_is_sorted = True
+
+    def add_project_files_tree_items(self, project_files: List[ProjectFile]) -> None:
         # NOTE algorithmic part
         # ##########
         # The "cloud_files" objects are assumed to be sorted alphabetically by name.
         # First split filenames into parts. For example: '/home/ninja.file' will result into ['home', 'ninja.file'] parts.
         # Then store pairs of the part and the corresponding QTreeWidgetItem in a stack.
         # Pop and push to the stack when the current filename part does not match the previous one.
+        # The stack is kept between calls, so the files can be added as they are received.
         # ##########
-        stack = []
+        stack = self._project_files_tree_stack
 
-        for project_file in self.current_cloud_project.get_files(
-            ProjectFileCheckout.Cloud
-        ):
-            assert isinstance(project_file.versions, list)
+        for project_file in project_files:
+            if project_file.name < self._project_files_tree_last_name:
+                self._project_files_tree_is_sorted = False
+
+            self._project_files_tree_last_name = project_file.name
+
+            versions = project_file.versions
+            assert isinstance(versions, list)
 
-            parts = tuple(project_file.path.parts)
+            parts = project_file.parts
             for part_idx, part in enumerate(parts):
                 if len(stack) > part_idx and stack[part_idx][0] == part:
                     continue
@@ -401,8 +499,8 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
                     item.setTextAlignment(1, Qt.AlignRight)
                     item.setText(2, project_file.created_at)
 
-                    versions_count = len(project_file.versions)
-                    for version_idx, version_obj in enumerate(project_file.versions):
+                    versions_count = len(versions)
+                    for version_idx, version_obj in enumerate(versions):
                         version_item = QTreeWidgetItem()
 
                         version_item.setData(0, Qt.UserRole, version_obj)
@@ -446,6 +544,8 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
                     item.setExpanded(True)
 
                     # TODO make a fancy button that marks all the child items as checked or not
+
+        self._project_files_tree_stack = stack
         # NOTE END algorithmic part
 
     @closure
@@ -563,70 +663,11 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
         self.projectsTable.setEnabled(True)
 
         for cloud_project in self.network_manager.projects_cache.projects:
-            if (
-                self.projectsType.currentIndex() != 1
-                and cloud_project.user_role_origin == "public"
-            ) or (
-                self.projectsType.currentIndex() == 1
-                and cloud_project.user_role_origin != "public"
-            ):
-                continue
-
-            count = self.projectsTable.rowCount()
-            self.projectsTable.insertRow(count)
+            self.add_project_row(cloud_project)
 
-            item = QTableWidgetItem(cloud_project.name)
-
-            if cloud_project.status == "ok":
-                color = QColor("#87af87")
-            elif cloud_project.status == "busy":
-                color = QColor("#9e6a03")
-            elif cloud_project.status == "failed":
-                color = QColor("#dc3545")
-            else:
-                raise NotImplementedError()
-
-            pm = QPixmap(40, 20)
-            pm.fill(Qt.transparent)
-            painter = QPainter(pm)
-            painter.setPen(QPen(color, 8, Qt.SolidLine))
-            painter.setBrush(QBrush(color, Qt.SolidPattern))
-            painter.drawEllipse(30, 10, 5, 5)
-            icon = QIcon(
-                str(
-                    Path(__file__).parent.joinpath(
-                        "../resources/cloud_project.svg"
-                        if cloud_project.local_dir
-                        else "../resources/cloud_project_remote.svg"
-                    )
-                )
-            )
-            painter.drawPixmap(0, 0, icon.pixmap(pm.size()))
-            del painter
-
-            item.setData(Qt.UserRole, cloud_project)
-            item.setData(Qt.EditRole, cloud_project.name)
-            item.setData(
-                Qt.DecorationRole,
-                pm,
-            )
-
-            tooltip = self.tr("Cloud status: {}. \nLocal status: ").format(
-                cloud_project.status
-            )
-
-            if bool(cloud_project.local_dir):
-                tooltip += self.tr('Project stored at "{}".').format(
-                    str(cloud_project.local_dir)
-                )
-            else:
-                tooltip += self.tr("No local dir configured.")
-
-            item.setToolTip(tooltip)
-
-            self.projectsTable.setItem(count, 0, item)
-            self.projectsTable.setItem(count, 1, QTableWidgetItem(cloud_project.owner))
+        self.on_projects_table_rendered()
 
+    def on_projects_table_rendered(self) -> None:
         self.projectsTable.sortByColumn(1, Qt.AscendingOrder)
         self.projectsTable.sortByColumn(0, Qt.AscendingOrder)
         self.projectsTable.setSortingEnabled(True)
@@ -637,6 +678,74 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
 
             self.sync()
 
+    def add_project_row(self, cloud_project: CloudProject) -> None:
+        """Appends a project row, the caller is responsible to disable the table sorting while adding rows."""
+        if (
+            self.projectsType.currentIndex() != 1
+            and cloud_project.user_role_origin == "public"
+        ) or (
+            self.projectsType.currentIndex() == 1
+            and cloud_project.user_role_origin != "public"
+        ):
+            return
+
+        count = self.projectsTable.rowCount()
+        self.projectsTable.insertRow(count)
+        self.set_project_row(count, cloud_project)
+
+    def set_project_row(self, row_idx: int, cloud_project: CloudProject) -> None:
+        item = QTableWidgetItem(cloud_project.name)
+
+        if cloud_project.status == "ok":
+            color = QColor("#87af87")
+        elif cloud_project.status == "busy":
+            color = QColor("#9e6a03")
+        elif cloud_project.status == "failed":
+            color = QColor("#dc3545")
+        else:
+            raise NotImplementedError()
+
+        pm = QPixmap(40, 20)
+        pm.fill(Qt.transparent)
+        painter = QPainter(pm)
+        painter.setPen(QPen(color, 8, Qt.SolidLine))
+        painter.setBrush(QBrush(color, Qt.SolidPattern))
+        painter.drawEllipse(30, 10, 5, 5)
+        icon = QIcon(
+            str(
+                Path(__file__).parent.joinpath(
+                    "../resources/cloud_project.svg"
+                    if cloud_project.local_dir
+                    else "../resources/cloud_project_remote.svg"
+                )
+            )
+        )
+        painter.drawPixmap(0, 0, icon.pixmap(pm.size()))
+        del painter
+
+        item.setData(Qt.UserRole, cloud_project)
+        item.setData(Qt.EditRole, cloud_project.name)
+        item.setData(
+            Qt.DecorationRole,
+            pm,
+        )
+
+        tooltip = self.tr("Cloud status: {}. \nLocal status: ").format(
+            cloud_project.status
+        )
+
+        if bool(cloud_project.local_dir):
+            tooltip += self.tr('Project stored at "{}".').format(
+                str(cloud_project.local_dir)
+            )
+        else:
+            tooltip += self.tr("No local dir configured.")
+
+        item.setToolTip(tooltip)
+
+        self.projectsTable.setItem(row_idx, 0, item)
+        self.projectsTable.setItem(row_idx, 1, QTableWidgetItem(cloud_project.owner))
+
     def sync(self) -> None:
         assert self.current_cloud_project is not None
         self.show_sync_popup()
@@ -825,6 +934,7 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
             self.projectsStack.setEnabled(False)
             reply = self.network_manager.delete_project(self.current_cloud_project.id)
             reply.finished.connect(lambda: self.on_delete_project_reply_finished(reply))
+            reply.finished.connect(reply.release)
 
     def on_delete_project_reply_finished(self, reply: QNetworkReply) -> None:
         self.projectsStack.setEnabled(True)
@@ -835,7 +945,7 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
             self.set_feedback(self.tr("Project delete failed: {}").format(str(err)))
             return
 
-        self.network_manager.projects_cache.refresh()
+        self.network_manager.projects_cache.refresh(force=True)
 
     def on_projects_table_cell_double_clicked(self) -> None:
         self.show_project_form()
@@ -850,7 +960,7 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
 
         self.projectsStack.setCurrentWidget(self.projectsFormPage)
         self.projectTabs.setCurrentWidget(self.projectFormTab)
-        self.projectFilesTree.clear()
+        self.clear_project_files_tree()
         self.projectNameLineEdit.setEnabled(True)
         self.projectDescriptionTextEdit.setEnabled(True)
 
@@ -890,6 +1000,12 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
             self.projectNameLineEdit.setEnabled(False)
             self.projectDescriptionTextEdit.setEnabled(False)
 
+        # a running request shares its reply without sending the files received so far again
+        self.add_project_files_tree_items(
+            self.network_manager.projects_cache.get_received_project_files(
+                self.current_cloud_project.id
+            )
+        )
         self.network_manager.projects_cache.get_project_files(
             self.current_cloud_project.id
         )
@@ -941,6 +1057,7 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
                 cloud_project_data["description"],
             )
             reply.finished.connect(lambda: self.on_update_project_finished(reply))
+            reply.finished.connect(reply.release)
 
             should_update_online = True
 
@@ -1061,7 +1178,7 @@ class CloudProjectsDialog(QDialog, CloudProjectsDialogUi):
         self.projectsStack.setCurrentWidget(self.projectsListPage)
         self.set_feedback(None)
 
-        self.network_manager.projects_cache.refresh()
+        self.network_manager.projects_cache.refresh(force=True)
 
     def on_projects_table_selection_changed(self) -> None:
         if self.projectsTable.selectionModel().hasSelection():
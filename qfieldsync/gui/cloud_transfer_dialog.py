@@ -21,16 +21,17 @@
  ***************************************************************************/
 """
 import os
+import threading
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Dict, List
+from typing import Any, Callable, Dict, List
 
 from libqfieldsync.offline_converter import ExportType
 from libqfieldsync.project_checker import ProjectChecker
 from libqfieldsync.utils.file_utils import get_unique_empty_dirname
 from libqfieldsync.utils.qgis import get_qgis_files_within_dir
-from qgis.core import QgsProject
+from qgis.core import Qgis, QgsMessageLog, QgsProject
 from qgis.PyQt.QtCore import QDir, Qt, QUrl, pyqtSignal
 from qgis.PyQt.QtGui import QDesktopServices, QShowEvent
 from qgis.PyQt.QtWidgets import (
@@ -72,6 +73,8 @@ class ProjectFileAction(Enum):
 
 class CloudTransferDialog(QDialog, CloudTransferDialogUi):
     project_synchronized = pyqtSignal()
+    # emitted from the thread comparing the local and the cloud files, with the files to sync or the exception
+    _files_to_sync_found = pyqtSignal(object)
 
     instance = None
 
@@ -119,6 +122,12 @@ class CloudTransferDialog(QDialog, CloudTransferDialogUi):
         self.cloud_project = cloud_project
         self.project_transfer = None
         self.is_project_download = False
+        # the files differing locally and on the cloud, see `CloudProject.files_to_sync`
+        self.files_to_sync: List[ProjectFile] = []
+        self._files_to_sync_found.connect(self._on_files_to_sync_found)
+
+        # the handshakes are done while the user looks at the files to synchronize
+        self.network_manager.warm_up(with_bulk=True)
 
         self.filesTree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.filesTree.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
@@ -315,14 +324,62 @@ class CloudTransferDialog(QDialog, CloudTransferDialogUi):
             self.openProjectCheck.setVisible(False)
             return
 
-        if len(list(self.cloud_project.files_to_sync)) == 0:
+        cloud_project = self.cloud_project
+
+        # hashing and fingerprinting the local files takes a while, so it runs in a
+        # separate thread while the files fetching page is still shown
+        def run() -> None:
+            try:
+                result = list(cloud_project.files_to_sync)
+            except Exception as err:
+                result = err
+
+            self._files_to_sync_found.emit(result)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _on_files_to_sync_found(self, result: Any) -> None:
+        assert self.cloud_project
+
+        if isinstance(result, Exception):
+            self.show_end_page(
+                self.tr("Failed to compare the local and the cloud files: {}").format(
+                    result
+                )
+            )
+            self.openProjectCheck.setChecked(False)
+            self.openProjectCheck.setVisible(False)
+            return
+
+        files_to_sync = result
+        self.files_to_sync = files_to_sync
+        suppressed_names = [
+            project_file.name
+            for project_file in self.cloud_project.suppressed_project_files
+        ]
+
+        for name in suppressed_names:
+            QgsMessageLog.logMessage(
+                self.tr(
+                    'The upload of "{}" is skipped, the project has only been saved again without any change.'
+                ).format(name),
+                "QFieldSync",
+                Qgis.Info,
+            )
+
+        if len(files_to_sync) == 0:
             files_total = len(self.cloud_project.get_files())
             if files_total > 0:
-                self.show_end_page(
-                    self.tr(
-                        "The locally stored cloud project is already synchronized with QFieldCloud, no action is required."
-                    )
+                message = self.tr(
+                    "The locally stored cloud project is already synchronized with QFieldCloud, no action is required."
                 )
+
+                if suppressed_names:
+                    message += " " + self.tr(
+                        "The project file {} has been saved again without any change, it is not uploaded."
+                    ).format(", ".join(f'"{name}"' for name in suppressed_names))
+
+                self.show_end_page(message)
             else:
                 self.show_end_page(
                     self.tr(
@@ -343,11 +400,45 @@ class CloudTransferDialog(QDialog, CloudTransferDialogUi):
             self.network_manager,
             self.cloud_project,
         )
+        # the first checkout gets all the files, so they are downloaded as a single archive
+        self.project_transfer.is_archive_download_enabled = self.is_project_download
+        self.project_transfer.is_pipelined = bool(
+            self.preferences.value("qfieldCloudPipelinedSync")
+        )
+        # the baselines double the disk space of the GeoPackages, so only kept on request
+        self.project_transfer.is_changeset_upload_enabled = bool(
+            self.preferences.value("qfieldCloudChangesetUpload")
+        )
+        self.project_transfer.is_gpkg_fingerprint_enabled = bool(
+            self.preferences.value("qfieldCloudGpkgFingerprint")
+        )
+        self.project_transfer.is_project_fingerprint_enabled = True
+        self.project_transfer.is_move_detection_enabled = True
+        # the servers without copies might take them for uploads, so they are only made on request
+        self.project_transfer.is_server_copy_enabled = bool(
+            self.preferences.value("qfieldCloudServerCopy")
+        )
+        # the photos are only recompressed on request, the originals are kept locally
+        self.project_transfer.is_image_recompression_enabled = bool(
+            self.preferences.value("qfieldCloudImageRecompression")
+        )
+        self.project_transfer.image_max_size = self.preferences.value(
+            "qfieldCloudImageMaxSize"
+        )
+        self.project_transfer.image_quality = self.preferences.value(
+            "qfieldCloudImageQuality"
+        )
+        # the attachment dirs are project settings, only known for the open project
+        if self.cloud_project.is_current_qgis_project:
+            self.project_transfer.attachment_dirs = self.preferences.value(
+                "attachmentDirs"
+            )
         self.project_transfer.error.connect(self.on_error)
         self.project_transfer.upload_progress.connect(self.on_upload_transfer_progress)
         self.project_transfer.download_progress.connect(
             self.on_download_transfer_progress
         )
+        self.project_transfer.prepared.connect(self.on_transfer_prepared)
         self.project_transfer.finished.connect(self.on_transfer_finished)
 
         self.explanationLabel.setVisible(False)
@@ -416,8 +507,8 @@ class CloudTransferDialog(QDialog, CloudTransferDialogUi):
         # ##########
         stack = []
 
-        for project_file in self.project_transfer.cloud_project.files_to_sync:
-            parts = tuple(project_file.path.parts)
+        for project_file in self.files_to_sync:
+            parts = project_file.parts
             for part_idx, part in enumerate(parts):
                 if len(stack) > part_idx and stack[part_idx][0] == part:
                     continue
@@ -559,11 +650,6 @@ class CloudTransferDialog(QDialog, CloudTransferDialogUi):
                 files["to_upload"], files["to_download"], files["to_delete"]
             )
 
-            assert self.project_transfer.transfers_model
-
-            self.detailedLogListView.setModel(self.project_transfer.transfers_model)
-            self.detailedLogListView.setModelColumn(0)
-
     def traverse_tree_item(
         self, item: QTreeWidgetItem, files: Dict[str, List[ProjectFile]]
     ) -> None:
@@ -672,6 +758,13 @@ class CloudTransferDialog(QDialog, CloudTransferDialogUi):
     def on_download_transfer_progress(self, fraction: float) -> None:
         self.downloadProgressBar.setValue(int(fraction * 100))
 
+    def on_transfer_prepared(self) -> None:
+        assert self.project_transfer
+        assert self.project_transfer.transfers_model
+
+        self.detailedLogListView.setModel(self.project_transfer.transfers_model)
+        self.detailedLogListView.setModelColumn(0)
+
     def on_transfer_finished(self) -> None:
         assert self.project_transfer
 
@@ -53,6 +53,16 @@ class PreferencesWidget(WidgetUi, QgsOptionsPageWidget, SettingDialog):
             QgsFileWidget.GetDirectory
         )
 
+        self.qfieldCloudImageRecompression.toggled.connect(
+            self._update_image_recompression_widgets
+        )
+        self._update_image_recompression_widgets()
+
+    def _update_image_recompression_widgets(self):
+        enabled = self.qfieldCloudImageRecompression.isChecked()
+        self.qfieldCloudImageMaxSize.setEnabled(enabled)
+        self.qfieldCloudImageQuality.setEnabled(enabled)
+
     def apply(self):
         self.set_values_from_widgets()
         self.qfieldSync.update_button_visibility()
@@ -30,6 +30,7 @@ from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction
 
 from qfieldsync.core import Preferences
+from qfieldsync.core.preferences import preferences_cache
 from qfieldsync.core.cloud_api import CloudNetworkAccessManager
 from qfieldsync.gui.cloud_browser_tree import (
     QFieldCloudItemGuiProvider,
@@ -368,6 +369,9 @@ class QFieldSync(object):
             )
         self.iface.unregisterOptionsWidgetFactory(self.options_factory)
 
+        self.network_manager.stop_bulk_thread()
+        preferences_cache.flush()
+
     def show_preferences_dialog(self):
         self.iface.showOptionsDialog(
             self.iface.mainWindow(), currentPage="QFieldPreferences"
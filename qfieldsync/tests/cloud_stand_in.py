@@ -0,0 +1,834 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+import io
+import json
+import re
+import ssl
+import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlparse
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:
+    h2 = None
+
+from qgis.PyQt.QtCore import QEventLoop, QTimer
+
+from qfieldsync.utils.chunking import (
+    DEFAULT_AVG_CHUNK_SIZE,
+    DEFAULT_MAX_CHUNK_SIZE,
+    DEFAULT_MIN_CHUNK_SIZE,
+    chunk_stream,
+)
+from qfieldsync.utils.gpkg_changeset import ChangesetError, apply_changeset
+
+API_PREFIX = "/api/v1/"
+
+
+class Fault:
+    """A failure the stand-in server responds with instead of handling the request.
+
+    The `response` is either an HTTP status code, "reset" to close the connection
+    without any response, "stall" to keep the connection silent for `duration_s` and
+    then close it, or "trickle" to send a successful response slowly, in small chunks
+    spread over `duration_s`.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        path_pattern: str,
+        response: Union[int, str],
+        count: int = 1,
+        retry_after: Optional[str] = None,
+        duration_s: float = 0,
+    ) -> None:
+        self.method = method
+        self.path_re = re.compile(path_pattern)
+        self.response = response
+        self.count = count
+        self.retry_after = retry_after
+        self.duration_s = duration_s
+
+
+class CloudStandInServer:
+    """Minimal local stand-in of the QFieldCloud API used by the plugin, with fault injection.
+
+    Keeps the projects and the file versions in memory. Runs in a background thread,
+    so the Qt event loop of the tests can keep running.
+
+    With `tls`, the server uses a self-signed certificate and also speaks HTTP/2 when
+    the client negotiates it and the `h2` package is installed.
+    """
+
+    def __init__(self, tls: bool = False) -> None:
+        self.projects: List[Dict] = []
+        # whether the lists are paginated with the `X-Next-Page` header, as QFieldCloud does
+        self.is_next_page_header_supported = False
+        # file versions' contents by project id and filename, the latest last
+        self.files: Dict[str, Dict[str, List[bytes]]] = {}
+        self.faults: List[Fault] = []
+        # method and path of all the received requests
+        self.requests: List[Tuple[str, str]] = []
+        # the HTTP versions of the received requests
+        self.protocols: List[str] = []
+        # passwords by username
+        self.users: Dict[str, str] = {}
+        # usernames by valid token
+        self.tokens: Dict[str, str] = {}
+        # the delay before each HTTP/1.1 response, as with a distant server
+        self.latency_s = 0.0
+        # the highest number of requests handled at the same time so far
+        self.max_concurrent_requests = 0
+        self._concurrent_requests = 0
+        # whether the requests other than login are rejected without a valid token
+        self.is_auth_required = False
+        # whether several files can be uploaded or deleted in a single request
+        self.is_upload_batch_supported = True
+        self.is_delete_batch_supported = True
+        # the number of times a file is still rejected within batch uploads, by filename
+        self.batch_upload_failures: Dict[str, int] = {}
+        # whether all the files of a project can be downloaded as a single archive
+        self.is_archive_download_supported = True
+        # the contents served within the project archives instead of the latest version, by filename
+        self.archive_contents: Dict[str, bytes] = {}
+        # whether only the changed chunks of files are transferred, see `chunk_file`
+        self.is_delta_sync_supported = True
+        # whether the row changes of GeoPackages can be uploaded, see `create_changeset`
+        self.is_changeset_upload_supported = True
+        # whether files can be copied within a project, see `copy_file`
+        self.is_server_copy_supported = True
+        # whether the unsupported changeset uploads and copies are taken for the upload
+        # of another file, e.g. "<filename>/copy", rather than rejected
+        self.is_unsupported_action_uploaded = False
+        self.chunking = {
+            "min_size": DEFAULT_MIN_CHUNK_SIZE,
+            "avg_size": DEFAULT_AVG_CHUNK_SIZE,
+            "max_size": DEFAULT_MAX_CHUNK_SIZE,
+        }
+        self._lock = threading.Lock()
+        self._tempdir: Optional[tempfile.TemporaryDirectory] = None
+        ssl_context = None
+
+        if tls:
+            self._tempdir = tempfile.TemporaryDirectory()
+            ssl_context = create_ssl_context(self._tempdir.name)
+
+        self._server = _StandInHTTPServer(self, ssl_context)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        scheme = "https" if self._server.ssl_context else "http"
+
+        return "{}://{}:{}/".format(scheme, *self._server.server_address)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+        if self._tempdir:
+            self._tempdir.cleanup()
+
+    def add_fault(self, fault: Fault) -> None:
+        with self._lock:
+            self.faults.append(fault)
+
+    def count_requests(self, method: str, path_pattern: str) -> int:
+        path_re = re.compile(path_pattern)
+
+        with self._lock:
+            return len(
+                [1 for m, path in self.requests if m == method and path_re.search(path)]
+            )
+
+    def handle_request(
+        self,
+        method: str,
+        path: str,
+        headers: Dict[str, str],
+        body: bytes,
+        query: str = "",
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Handles an API request, returns the status code, headers and body of the response.
+
+        The names of the request `headers` are lowercase.
+        """
+        if not path.startswith(API_PREFIX):
+            return json_response(404, {"detail": "Not found"})
+
+        parts = [p for p in path[len(API_PREFIX) :].split("/") if p]
+        content_type = headers.get("content-type", "")
+
+        if method == "POST" and parts == ["auth", "login"]:
+            return self._login(json.loads(body))
+
+        username = self._authenticate(headers)
+
+        if self.is_auth_required and username is None:
+            return json_response(401, {"detail": "Invalid token."})
+
+        if method == "GET" and parts == ["auth", "user"]:
+            if username is None:
+                return json_response(401, {"detail": "Invalid token."})
+
+            return json_response(200, {"username": username, "avatar_url": ""})
+        elif method == "GET" and parts == ["projects"]:
+            return self._projects_page(parse_qs(query))
+        elif (
+            method == "GET"
+            and len(parts) == 3
+            and parts[::2] == ["projects", "archive"]
+        ):
+            return self._project_archive(parts[1])
+        elif method == "GET" and len(parts) == 2 and parts[0] == "files":
+            return json_response(200, self._files_payload(parts[1]))
+        elif method == "POST" and len(parts) == 2 and parts[0] == "files":
+            return self._upload_files(parts[1], content_type, body)
+        elif method == "DELETE" and len(parts) == 2 and parts[0] == "files":
+            return self._delete_files(parts[1], json.loads(body or b"{}"))
+        elif len(parts) > 2 and parts[0] == "files":
+            return self._handle_file(
+                method, parts[1], "/".join(parts[2:]), headers, body
+            )
+
+        return json_response(404, {"detail": "Not found"})
+
+    def _login(self, payload: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        username = payload.get("username")
+
+        with self._lock:
+            if username not in self.users or self.users[username] != payload.get(
+                "password"
+            ):
+                return json_response(400, {"detail": "Invalid credentials."})
+
+            token = f"token-{len(self.tokens) + 1}"
+            self.tokens[token] = username
+
+        return json_response(
+            200, {"username": username, "avatar_url": "", "token": token}
+        )
+
+    def _projects_page(
+        self, params: Dict[str, List[str]]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Returns the page of projects from `offset`, all of them without pagination."""
+        if not self.is_next_page_header_supported or "limit" not in params:
+            return json_response(200, self.projects)
+
+        limit = int(params["limit"][0])
+        offset = int(params.get("offset", ["0"])[0])
+        status, headers, body = json_response(
+            200, self.projects[offset : offset + limit]
+        )
+
+        if offset + limit < len(self.projects):
+            headers["X-Next-Page"] = "{}{}projects/?limit={}&offset={}".format(
+                self.url.rstrip("/"), API_PREFIX, limit, offset + limit
+            )
+
+        return status, headers, body
+
+    def _authenticate(self, headers: Dict[str, str]) -> Optional[str]:
+        """Returns the user of the token in the `Authorization` header."""
+        authorization = headers.get("authorization", "")
+
+        if not authorization.startswith("Token "):
+            return None
+
+        with self._lock:
+            return self.tokens.get(authorization[len("Token ") :])
+
+    def _handle_file(
+        self,
+        method: str,
+        project_id: str,
+        filename: str,
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        content_type = headers.get("content-type", "")
+
+        with self._lock:
+            project_files = self.files.setdefault(project_id, {})
+            name, _sep, action = filename.rpartition("/")
+
+            if (
+                self.is_unsupported_action_uploaded
+                and method == "POST"
+                and (
+                    (action == "changeset" and not self.is_changeset_upload_supported)
+                    or (action == "copy" and not self.is_server_copy_supported)
+                )
+            ):
+                project_files.setdefault(filename, []).append(body)
+
+                return json_response(201, {"name": filename})
+            elif method == "POST" and action == "changeset" and name in project_files:
+                if not self.is_changeset_upload_supported:
+                    return json_response(404, {"detail": "Not found"})
+
+                return self._apply_changeset(
+                    name, project_files[name], content_type, body
+                )
+            elif method == "POST" and action == "copy" and name in project_files:
+                if not self.is_server_copy_supported:
+                    return json_response(404, {"detail": "Not found"})
+
+                content = project_files[name][-1]
+                destination = json.loads(body)["destination"]
+                project_files.setdefault(destination, []).append(content)
+
+                return json_response(
+                    201,
+                    {
+                        "name": destination,
+                        "sha256": hashlib.sha256(content).hexdigest(),
+                    },
+                )
+            elif action in ("chunks", "delta") and name in project_files:
+                if not self.is_delta_sync_supported:
+                    return json_response(404, {"detail": "Not found"})
+
+                if method == "GET" and action == "chunks":
+                    chunked_file = chunk_stream(
+                        io.BytesIO(project_files[name][-1]), **self.chunking
+                    )
+
+                    return json_response(
+                        200, {**chunked_file.to_json(), "chunking": self.chunking}
+                    )
+                elif method == "POST" and action == "delta":
+                    return self._apply_delta(
+                        name, project_files[name], content_type, body
+                    )
+            elif method == "GET":
+                if filename not in project_files:
+                    return json_response(404, {"detail": "Not found"})
+
+                content = project_files[filename][-1]
+                range_match = re.fullmatch(
+                    r"bytes=(\d+)-(\d+)", headers.get("range", "")
+                )
+
+                if range_match and self.is_delta_sync_supported:
+                    start = int(range_match.group(1))
+                    end = min(int(range_match.group(2)), len(content) - 1)
+                    content_range = "bytes {}-{}/{}".format(start, end, len(content))
+
+                    return (
+                        206,
+                        {"Content-Range": content_range},
+                        content[start : end + 1],
+                    )
+
+                return 200, {}, content
+            elif method == "POST":
+                content = parse_multipart_file(content_type, body)
+                project_files.setdefault(filename, []).append(content)
+
+                return json_response(201, {"name": filename})
+            elif method == "DELETE":
+                if project_files.pop(filename, None) is None:
+                    return json_response(404, {"detail": "Not found"})
+
+                return 204, {}, b""
+
+        return json_response(405, {"detail": "Method not allowed"})
+
+    def _apply_delta(
+        self, name: str, versions: List[bytes], content_type: str, body: bytes
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Adds the version made of the chunks of the recipe, either from the latest version or new."""
+        recipe = parse_multipart_json(content_type, body)
+        delta = io.BytesIO(parse_multipart_file(content_type, body))
+        base = versions[-1]
+
+        if hashlib.sha256(base).hexdigest() != recipe["base_sha256"]:
+            return json_response(412, {"detail": "The latest version has changed"})
+
+        base_chunks = {
+            chunk.sha256: chunk
+            for chunk in chunk_stream(io.BytesIO(base), **self.chunking).chunks
+        }
+        content = b""
+
+        for chunk in recipe["chunks"]:
+            if chunk["is_new"]:
+                content += delta.read(chunk["size"])
+            elif chunk["sha256"] in base_chunks:
+                base_chunk = base_chunks[chunk["sha256"]]
+                content += base[base_chunk.offset : base_chunk.offset + base_chunk.size]
+            else:
+                return json_response(400, {"detail": "Unknown chunk"})
+
+        if (
+            len(content) != recipe["size"]
+            or hashlib.sha256(content).hexdigest() != recipe["sha256"]
+        ):
+            return json_response(400, {"detail": "The new version does not match"})
+
+        versions.append(content)
+
+        return json_response(201, {"name": name})
+
+    def _apply_changeset(
+        self, name: str, versions: List[bytes], content_type: str, body: bytes
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Adds the version made of the latest version with the changed rows applied."""
+        changeset = json.loads(parse_multipart_file(content_type, body))
+
+        if hashlib.sha256(versions[-1]).hexdigest() != changeset["base_sha256"]:
+            return json_response(412, {"detail": "The latest version has changed"})
+
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = Path(dirname, "changeset.gpkg")
+            filename.write_bytes(versions[-1])
+
+            try:
+                apply_changeset(filename, changeset)
+            except ChangesetError as err:
+                return json_response(400, {"detail": str(err)})
+
+            content = filename.read_bytes()
+
+        versions.append(content)
+
+        return json_response(
+            201, {"name": name, "sha256": hashlib.sha256(content).hexdigest()}
+        )
+
+    def _upload_files(
+        self, project_id: str, content_type: str, body: bytes
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        if not self.is_upload_batch_supported:
+            return json_response(405, {"detail": 'Method "POST" not allowed.'})
+
+        results = []
+
+        with self._lock:
+            project_files = self.files.setdefault(project_id, {})
+
+            for filename, content in parse_multipart_files(content_type, body):
+                if self.batch_upload_failures.get(filename, 0) > 0:
+                    self.batch_upload_failures[filename] -= 1
+                    results.append(
+                        {"name": filename, "status": 500, "detail": "Storage error"}
+                    )
+                    continue
+
+                project_files.setdefault(filename, []).append(content)
+                results.append({"name": filename, "status": 201})
+
+        return json_response(200, results)
+
+    def _delete_files(
+        self, project_id: str, payload: Dict
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        if not self.is_delete_batch_supported:
+            return json_response(405, {"detail": 'Method "DELETE" not allowed.'})
+
+        results = []
+
+        with self._lock:
+            project_files = self.files.setdefault(project_id, {})
+
+            for filename in payload.get("filenames", []):
+                if project_files.pop(filename, None) is None:
+                    results.append(
+                        {"name": filename, "status": 404, "detail": "Not found"}
+                    )
+                else:
+                    results.append({"name": filename, "status": 204})
+
+        return json_response(200, results)
+
+    def _project_archive(self, project_id: str) -> Tuple[int, Dict[str, str], bytes]:
+        if not self.is_archive_download_supported:
+            return json_response(404, {"detail": "Not found"})
+
+        archive = io.BytesIO()
+
+        with self._lock, tarfile.open(fileobj=archive, mode="w") as tar:
+            for filename, versions in sorted(self.files.get(project_id, {}).items()):
+                content = self.archive_contents.get(filename, versions[-1])
+                info = tarfile.TarInfo(filename)
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+
+        return 200, {"Content-Type": "application/x-tar"}, archive.getvalue()
+
+    def _pop_fault(self, method: str, path: str, protocol: str) -> Optional[Fault]:
+        with self._lock:
+            self.requests.append((method, path))
+            self.protocols.append(protocol)
+
+            for fault in self.faults:
+                if fault.method == method and fault.path_re.search(path):
+                    fault.count -= 1
+
+                    if fault.count == 0:
+                        self.faults.remove(fault)
+
+                    return fault
+
+        return None
+
+    def _files_payload(self, project_id: str) -> List[Dict]:
+        payload = []
+
+        for name, versions in sorted(self.files.get(project_id, {}).items()):
+            versions_payload = [
+                {
+                    "version_id": str(idx),
+                    "size": len(content),
+                    "sha256": hashlib.sha256(content).hexdigest(),
+                    "last_modified": "2026-01-01 00:00:00 UTC",
+                    "is_latest": idx == len(versions) - 1,
+                    "display": str(idx + 1),
+                }
+                for idx, content in reversed(list(enumerate(versions)))
+            ]
+            payload.append(
+                {
+                    "name": name,
+                    "size": versions_payload[0]["size"],
+                    "sha256": versions_payload[0]["sha256"],
+                    "last_modified": versions_payload[0]["last_modified"],
+                    "versions": versions_payload,
+                }
+            )
+
+        return payload
+
+    def _serve_h2(self, sock: ssl.SSLSocket) -> None:
+        """Serves an HTTP/2 connection, only status code faults are supported."""
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        conn.initiate_connection()
+        sock.sendall(conn.data_to_send())
+
+        requests: Dict[int, Tuple[Dict[str, str], bytearray]] = {}
+        # response data waiting for the flow control window, by stream id
+        pending: Dict[int, bytes] = {}
+
+        def send_pending(stream_id: int) -> None:
+            data = pending.pop(stream_id)
+
+            while data:
+                size = min(
+                    conn.local_flow_control_window(stream_id),
+                    conn.max_outbound_frame_size,
+                    len(data),
+                )
+
+                if size <= 0:
+                    pending[stream_id] = data
+                    return
+
+                conn.send_data(stream_id, data[:size], end_stream=size == len(data))
+                data = data[size:]
+
+        while True:
+            data = sock.recv(65535)
+
+            if not data:
+                return
+
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    requests[event.stream_id] = (dict(event.headers), bytearray())
+                elif isinstance(event, h2.events.DataReceived):
+                    requests[event.stream_id][1].extend(event.data)
+                    conn.acknowledge_received_data(
+                        event.flow_controlled_length, event.stream_id
+                    )
+                elif isinstance(event, h2.events.StreamEnded):
+                    headers, body = requests.pop(event.stream_id)
+                    method = headers[":method"]
+                    url = urlparse(headers[":path"])
+                    path = unquote(url.path)
+                    fault = self._pop_fault(method, path, "HTTP/2")
+
+                    if fault is not None and isinstance(fault.response, int):
+                        status, response_headers, response_body = json_response(
+                            fault.response, {"detail": "Injected fault"}
+                        )
+                    elif fault is not None:
+                        conn.reset_stream(event.stream_id)
+                        continue
+                    else:
+                        status, response_headers, response_body = self.handle_request(
+                            method, path, headers, bytes(body), url.query
+                        )
+
+                    conn.send_headers(
+                        event.stream_id,
+                        [
+                            (":status", str(status)),
+                            ("content-length", str(len(response_body))),
+                            *response_headers.items(),
+                        ],
+                        end_stream=not response_body,
+                    )
+
+                    if response_body:
+                        pending[event.stream_id] = response_body
+                        send_pending(event.stream_id)
+                elif isinstance(event, h2.events.WindowUpdated):
+                    stream_ids = (
+                        [event.stream_id] if event.stream_id else list(pending.keys())
+                    )
+
+                    for stream_id in stream_ids:
+                        if stream_id in pending:
+                            send_pending(stream_id)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    sock.sendall(conn.data_to_send())
+                    return
+
+            sock.sendall(conn.data_to_send())
+
+    def _make_handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+            def do_DELETE(self) -> None:
+                self._handle("DELETE")
+
+            def _handle(self, method: str) -> None:
+                path = unquote(urlparse(self.path).path)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                fault = stand_in._pop_fault(method, path, self.request_version)
+
+                with stand_in._lock:
+                    stand_in._concurrent_requests += 1
+                    stand_in.max_concurrent_requests = max(
+                        stand_in.max_concurrent_requests, stand_in._concurrent_requests
+                    )
+
+                try:
+                    time.sleep(stand_in.latency_s)
+                    self._respond(method, path, body, fault)
+                finally:
+                    with stand_in._lock:
+                        stand_in._concurrent_requests -= 1
+
+            def _respond(
+                self, method: str, path: str, body: bytes, fault: Optional[Fault]
+            ) -> None:
+                if fault is None:
+                    self._send(
+                        *stand_in.handle_request(
+                            method,
+                            path,
+                            {k.lower(): v for k, v in self.headers.items()},
+                            body,
+                            urlparse(self.path).query,
+                        )
+                    )
+                elif fault.response == "reset":
+                    self.close_connection = True
+                    self.connection.close()
+                elif fault.response == "stall":
+                    time.sleep(fault.duration_s)
+                    self.close_connection = True
+                    self.connection.close()
+                elif fault.response == "trickle":
+                    self._send_trickle(fault.duration_s)
+                else:
+                    headers = {}
+                    if fault.retry_after is not None:
+                        headers["Retry-After"] = fault.retry_after
+
+                    status, json_headers, json_body = json_response(
+                        fault.response, {"detail": "Injected fault"}
+                    )
+                    self._send(status, {**json_headers, **headers}, json_body)
+
+            def _send_trickle(self, duration_s: float) -> None:
+                chunks_count = 10
+
+                self.send_response(200)
+                self.send_header("Content-Length", str(chunks_count * 1000))
+                self.end_headers()
+
+                for _i in range(chunks_count):
+                    self.wfile.write(b"x" * 1000)
+                    self.wfile.flush()
+                    time.sleep(duration_s / chunks_count)
+
+            def _send(self, status: int, headers: Dict[str, str], body: bytes) -> None:
+                self.send_response(status)
+
+                for name, value in headers.items():
+                    self.send_header(name, value)
+
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, stand_in: CloudStandInServer, ssl_context: Optional[ssl.SSLContext]
+    ) -> None:
+        self.stand_in = stand_in
+        self.ssl_context = ssl_context
+
+        super().__init__(("127.0.0.1", 0), stand_in._make_handler())
+
+    def finish_request(self, request, client_address) -> None:
+        if not self.ssl_context:
+            super().finish_request(request, client_address)
+            return
+
+        # the TLS handshake is done in the thread of the connection
+        with self.ssl_context.wrap_socket(request, server_side=True) as tls_request:
+            if tls_request.selected_alpn_protocol() == "h2":
+                self.stand_in._serve_h2(tls_request)
+            else:
+                super().finish_request(tls_request, client_address)
+
+
+def create_ssl_context(dirname: str) -> ssl.SSLContext:
+    """Creates a server TLS context with a self-signed certificate for 127.0.0.1."""
+    certfile = str(Path(dirname, "cert.pem"))
+    keyfile = str(Path(dirname, "key.pem"))
+
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=127.0.0.1",
+            "-keyout",
+            keyfile,
+            "-out",
+            certfile,
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ssl_context.load_cert_chain(certfile, keyfile)
+    ssl_context.set_alpn_protocols(["h2", "http/1.1"] if h2 else ["http/1.1"])
+
+    return ssl_context
+
+
+def json_response(status: int, payload: Any) -> Tuple[int, Dict[str, str], bytes]:
+    return status, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+
+
+def parse_multipart_files(content_type: str, body: bytes) -> List[Tuple[str, bytes]]:
+    """Returns the filenames and contents of the "file" parts of a multipart form data body."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    assert match, "No boundary in the multipart content type"
+
+    files = []
+    for part in body.split(b"--" + match.group(1).encode()):
+        headers, _sep, content = part.partition(b"\r\n\r\n")
+
+        if b'name="file"' in headers:
+            filename_match = re.search(rb'filename="([^"]*)"', headers)
+            filename = filename_match.group(1).decode() if filename_match else ""
+            files.append((filename, content[: -len(b"\r\n")]))
+
+    return files
+
+
+def parse_multipart_json(content_type: str, body: bytes) -> Any:
+    """Returns the payload of the "json" part of a multipart form data body."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    assert match, "No boundary in the multipart content type"
+
+    for part in body.split(b"--" + match.group(1).encode()):
+        headers, _sep, content = part.partition(b"\r\n\r\n")
+
+        if b'name="json"' in headers:
+            return json.loads(content[: -len(b"\r\n")])
+
+    raise Exception("No JSON in the multipart body")
+
+
+def parse_multipart_file(content_type: str, body: bytes) -> bytes:
+    """Returns the content of the "file" part of a multipart form data body."""
+    files = parse_multipart_files(content_type, body)
+
+    if not files:
+        raise Exception("No file in the multipart body")
+
+    return files[0][1]
+
+
+def wait_for_reply(reply, timeout_ms: int = 20000) -> None:
+    """Runs the Qt event loop until the reply is finished."""
+    if reply.isFinished():
+        return
+
+    wait_for_signal(reply.finished, timeout_ms)
+
+
+def wait_for_signal(signal, timeout_ms: int = 20000) -> None:
+    """Runs the Qt event loop until the signal is emitted."""
+    loop = QEventLoop()
+    signal.connect(loop.quit)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec_()
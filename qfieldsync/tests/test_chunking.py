@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+import io
+import os
+
+from qgis.testing import unittest
+
+from qfieldsync.utils.chunking import (
+    DEFAULT_MAX_CHUNK_SIZE,
+    DEFAULT_MIN_CHUNK_SIZE,
+    Chunk,
+    ChunkedFile,
+    chunk_stream,
+    plan_ranges,
+)
+
+
+class ChunkingTest(unittest.TestCase):
+    def setUp(self):
+        self.data = os.urandom(2 * 1024 * 1024)
+
+    def test_chunks_cover_the_data(self):
+        chunked_file = chunk_stream(io.BytesIO(self.data))
+
+        self.assertEqual(chunked_file.size, len(self.data))
+        self.assertEqual(chunked_file.sha256, hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(
+            b"".join(
+                self.data[c.offset : c.offset + c.size] for c in chunked_file.chunks
+            ),
+            self.data,
+        )
+
+        for chunk in chunked_file.chunks[:-1]:
+            self.assertGreaterEqual(chunk.size, DEFAULT_MIN_CHUNK_SIZE)
+            self.assertLessEqual(chunk.size, DEFAULT_MAX_CHUNK_SIZE)
+
+    def test_insertion_changes_only_nearby_chunks(self):
+        edited_data = self.data[:1_000_000] + os.urandom(100) + self.data[1_000_000:]
+
+        chunks = chunk_stream(io.BytesIO(self.data)).chunks
+        edited_chunks = chunk_stream(io.BytesIO(edited_data)).chunks
+        hashes = {chunk.sha256 for chunk in chunks}
+        new_chunks = [c for c in edited_chunks if c.sha256 not in hashes]
+
+        self.assertGreater(len(edited_chunks), 10)
+        self.assertLessEqual(len(new_chunks), 2)
+
+    def test_empty_data(self):
+        chunked_file = chunk_stream(io.BytesIO(b""))
+
+        self.assertEqual(chunked_file.size, 0)
+        self.assertEqual(chunked_file.chunks, [])
+
+    def test_json_round_trip(self):
+        chunked_file = chunk_stream(io.BytesIO(self.data))
+
+        self.assertEqual(ChunkedFile.from_json(chunked_file.to_json()), chunked_file)
+
+    def test_json_with_inconsistent_size(self):
+        payload = chunk_stream(io.BytesIO(self.data)).to_json()
+        payload["size"] += 1
+
+        with self.assertRaises(ValueError):
+            ChunkedFile.from_json(payload)
+
+    def test_plan_ranges(self):
+        chunks = [Chunk(0, 10, "a"), Chunk(15, 10, "b"), Chunk(100, 10, "c")]
+
+        self.assertEqual(plan_ranges(chunks, 0), [(0, 10), (15, 10), (100, 10)])
+        self.assertEqual(plan_ranges(chunks, 5), [(0, 25), (100, 10)])
+        self.assertEqual(plan_ranges(chunks, 100), [(0, 110)])
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from qgis.core import QgsApplication
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
+from qgis.testing import start_app, unittest
+
+from qfieldsync.core.cloud_api import (
+    CloudNetworkAccessManager,
+    CloudRequestPriority,
+)
+from qfieldsync.tests.cloud_stand_in import (
+    CloudStandInServer,
+    wait_for_reply,
+    wait_for_signal,
+)
+
+start_app()
+
+
+class CloudTokenReuseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        auth_manager = QgsApplication.authManager()
+        auth_manager.setPasswordHelperEnabled(False)
+        auth_manager.setMasterPassword("masterpassword", True)
+
+    def setUp(self):
+        self.server = CloudStandInServer()
+        self.server.start()
+        self.server.users = {"user": "secret"}
+        self.server.tokens = {"valid-token": "user"}
+        self.server.is_auth_required = True
+
+        self.network_manager = CloudNetworkAccessManager()
+        self.network_manager.url = self.server.url
+
+    def tearDown(self):
+        self.network_manager.deleteLater()
+        self.server.stop()
+
+    def test_valid_token_reused_without_round_trip(self):
+        logins = []
+        self.network_manager.login_finished.connect(lambda: logins.append(True))
+
+        self.network_manager.login_with_token("user", "valid-token")
+
+        # logged in before any response from the server
+        self.assertTrue(self.network_manager.has_token())
+        self.assertEqual(logins, [True])
+        self.assertEqual(self.network_manager.user_details["username"], "user")
+
+        while self.network_manager.is_login_active:
+            wait_for_signal(self.network_manager.token_changed, 500)
+
+        self.assertTrue(self.network_manager.has_token())
+        self.assertEqual(self.server.count_requests("GET", r"/auth/user/$"), 1)
+        self.assertEqual(self.server.count_requests("POST", r"/auth/login/$"), 0)
+
+    def test_rejected_token_falls_back_to_password_login(self):
+        self.network_manager.set_auth(
+            self.server.url, username="user", password="secret"
+        )
+
+        self.network_manager.login_with_token("user", "expired-token")
+        wait_for_signal(self.network_manager.login_finished)
+
+        self.assertTrue(self.network_manager.has_token())
+        self.assertEqual(self.network_manager._token, "token-1")
+        self.assertEqual(self.server.count_requests("POST", r"/auth/login/$"), 1)
+
+    def test_login_warms_up_api_connection(self):
+        warmed_up_urls = []
+        connect_to_hosts = self.network_manager._connection_warmer.connect_to_hosts
+
+        def record_hosts(urls, is_http2_enabled):
+            warmed_up_urls.extend(url.toString() for url in urls)
+            connect_to_hosts(urls, is_http2_enabled)
+
+        self.network_manager._connection_warmer.connect_to_hosts = record_hosts
+
+        self.network_manager.login("user", "secret")
+        wait_for_signal(self.network_manager.login_finished)
+
+        self.assertTrue(self.network_manager.has_token())
+        self.assertEqual(warmed_up_urls, [self.network_manager.server_url])
+
+    def test_token_kept_when_server_unreachable(self):
+        self.server.stop()
+        self.network_manager.retry_policy.max_attempts = 1
+
+        self.network_manager.login_with_token("user", "valid-token")
+
+        while self.network_manager.is_login_active:
+            wait_for_signal(self.network_manager.token_changed, 500)
+
+        self.assertTrue(self.network_manager.has_token())
+
+
+class CloudReauthenticationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        auth_manager = QgsApplication.authManager()
+        auth_manager.setPasswordHelperEnabled(False)
+        auth_manager.setMasterPassword("masterpassword", True)
+
+    def setUp(self):
+        self.server = CloudStandInServer()
+        self.server.start()
+        self.server.users = {"user": "secret"}
+        self.server.is_auth_required = True
+
+        self.network_manager = CloudNetworkAccessManager()
+        self.network_manager.url = self.server.url
+
+    def tearDown(self):
+        self.network_manager.stop_bulk_thread()
+        self.network_manager.deleteLater()
+        self.server.stop()
+
+    def send_parallel_requests(self):
+        replies = [
+            self.network_manager.cloud_get("files/project-{}".format(i))
+            for i in range(8)
+        ]
+        replies += [
+            self.network_manager.cloud_get(
+                "files/bulk-project-{}".format(i),
+                priority=CloudRequestPriority.BULK,
+            )
+            for i in range(4)
+        ]
+
+        for reply in replies:
+            wait_for_reply(reply)
+
+        return replies
+
+    def test_parallel_rejected_requests_login_once(self):
+        self.network_manager.set_auth(
+            self.server.url, username="user", password="secret"
+        )
+        self.network_manager.set_token("expired-token")
+
+        replies = self.send_parallel_requests()
+
+        for reply in replies:
+            self.assertEqual(reply.error(), QNetworkReply.NoError)
+            self.assertEqual(
+                reply.attribute(QNetworkRequest.HttpStatusCodeAttribute), 200
+            )
+
+        self.assertEqual(self.server.count_requests("POST", r"/auth/login/$"), 1)
+        self.assertEqual(self.network_manager._token, "token-1")
+
+    def test_failed_login_rejects_waiting_requests(self):
+        self.network_manager.set_auth(
+            self.server.url, username="user", password="wrong"
+        )
+        self.network_manager.set_token("expired-token")
+
+        replies = self.send_parallel_requests()
+
+        for reply in replies:
+            self.assertEqual(
+                reply.attribute(QNetworkRequest.HttpStatusCodeAttribute), 401
+            )
+
+        self.assertEqual(self.server.count_requests("POST", r"/auth/login/$"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
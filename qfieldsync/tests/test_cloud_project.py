@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import gc
+import json
+import os
+import tracemalloc
+
+from qgis.testing import start_app, unittest
+
+from qfieldsync.core.cloud_project import ProjectFile
+
+start_app()
+
+BENCHMARK_FILES_COUNT = 200_000
+BENCHMARK_VERSIONS_COUNT = 5
+
+
+def get_files_response(files_count, versions_count):
+    files = []
+    for i in range(files_count):
+        versions = [
+            {
+                "size": 1024 + v,
+                "sha256": f"{i:032x}{v:032x}",
+                "version_id": f"{i:016x}-{v:04x}",
+                "last_modified": f"2026-01-{v + 1:02d} 00:00:00 UTC",
+                "is_latest": v == 0,
+                "display": str(versions_count - v),
+            }
+            for v in range(versions_count)
+        ]
+        files.append(
+            {
+                "name": f"DCIM/survey_{i % 20}/photo_{i}.jpg",
+                "size": versions[0]["size"],
+                "sha256": versions[0]["sha256"],
+                "last_modified": versions[0]["last_modified"],
+                "versions": versions,
+            }
+        )
+
+    # the files are parsed from JSON, so the memory layout matches the real responses
+    return json.dumps(files)
+
+
+def measure_memory(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        gc.collect()
+        size, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, size
+
+
+class ProjectFileTest(unittest.TestCase):
+    def test_versions(self):
+        project_file = ProjectFile(
+            {
+                "name": "DCIM/photo.jpg",
+                "size": 2,
+                "sha256": "bbb",
+                "versions": [
+                    {"version_id": "2", "size": 2, "last_modified": "2026-01-02"},
+                    {"version_id": "1", "size": 1, "last_modified": "2026-01-01"},
+                ],
+            },
+            "/tmp/project",
+        )
+
+        self.assertEqual(project_file.name, "DCIM/photo.jpg")
+        self.assertEqual(project_file.parts, ("DCIM", "photo.jpg"))
+        self.assertEqual(project_file.size, 2)
+        self.assertEqual(project_file.sha256, "bbb")
+        self.assertEqual(project_file.created_at, "2026-01-01")
+        self.assertEqual(project_file.updated_at, "2026-01-02")
+        self.assertEqual(
+            project_file.versions,
+            [
+                {"version_id": "2", "size": 2, "last_modified": "2026-01-02"},
+                {"version_id": "1", "size": 1, "last_modified": "2026-01-01"},
+            ],
+        )
+
+    def test_local_file(self):
+        project_file = ProjectFile({"name": "project.qgs"}, "/tmp/project")
+
+        self.assertIsNone(project_file.size)
+        self.assertIsNone(project_file.versions)
+        self.assertIsNone(project_file.created_at)
+        self.assertEqual(project_file.parts, ("project.qgs",))
+
+
+@unittest.skipUnless(
+    os.environ.get("QFIELDSYNC_BENCHMARK"),
+    "set QFIELDSYNC_BENCHMARK=1 to run the benchmarks",
+)
+class ProjectFileBenchmark(unittest.TestCase):
+    def test_memory(self):
+        response = get_files_response(BENCHMARK_FILES_COUNT, BENCHMARK_VERSIONS_COUNT)
+
+        # the raw parsed response was kept in memory before
+        _raw_files, raw_size = measure_memory(lambda: json.loads(response))
+
+        def parse_compact():
+            return [ProjectFile(f) for f in json.loads(response)]
+
+        project_files, compact_size = measure_memory(parse_compact)
+
+        self.assertEqual(len(project_files), BENCHMARK_FILES_COUNT)
+        self.assertLess(compact_size, raw_size)
+
+        print(
+            f"{BENCHMARK_FILES_COUNT} files with {BENCHMARK_VERSIONS_COUNT} versions: "
+            f"raw {raw_size / 2**20:.1f} MiB, compact {compact_size / 2**20:.1f} MiB"
+        )
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import time
+
+from qgis.testing import start_app, unittest
+
+from qfieldsync.core.cloud_api import CloudNetworkAccessManager
+from qfieldsync.gui.cloud_projects_dialog import CloudProjectsDialog
+from qfieldsync.tests.cloud_stand_in import CloudStandInServer, wait_for_reply
+
+start_app()
+
+BENCHMARK_PROJECTS_COUNT = 5000
+BENCHMARK_RUNS = 5
+
+
+def get_projects_payload(count):
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "name": f"project_{i}",
+            "owner": f"user_{i % 10}",
+            "description": "",
+            "private": True,
+            "created_at": "2026-01-01T00:00:00Z",
+            "updated_at": "2026-01-01T00:00:00Z",
+            "status": "ok",
+            "user_role": "admin",
+            "user_role_origin": "project_owner",
+        }
+        for i in range(count)
+    ]
+
+
+class CloudProjectsPaginationTest(unittest.TestCase):
+    def setUp(self):
+        self.server = CloudStandInServer()
+        self.server.start()
+        # the pages are lists, the next one is linked in the `X-Next-Page` header
+        self.server.is_next_page_header_supported = True
+        self.server.projects = get_projects_payload(7)
+
+        self.network_manager = CloudNetworkAccessManager()
+        self.network_manager.url = self.server.url
+
+    def tearDown(self):
+        self.network_manager.deleteLater()
+        self.server.stop()
+
+    def test_next_page_header_followed(self):
+        pages = []
+        reply = self.network_manager.get_projects(page_size=3)
+        reply.page_finished.connect(lambda results: pages.append(results))
+        wait_for_reply(reply)
+
+        self.assertIsNone(reply.error_exception)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.server.projects)
+
+    def test_next_page_header_followed_synchronously(self):
+        projects = self.network_manager.get_projects_not_async(page_size=3)
+
+        self.assertEqual(projects, self.server.projects)
+
+
+@unittest.skipUnless(
+    os.environ.get("QFIELDSYNC_BENCHMARK"),
+    "set QFIELDSYNC_BENCHMARK=1 to run the benchmarks",
+)
+class CloudProjectsDialogBenchmark(unittest.TestCase):
+    def test_show_projects(self):
+        network_manager = CloudNetworkAccessManager()
+        projects_cache = network_manager.projects_cache
+        projects_cache._merge_projects(get_projects_payload(BENCHMARK_PROJECTS_COUNT))
+
+        dlg = CloudProjectsDialog(network_manager)
+
+        durations = []
+        for _i in range(BENCHMARK_RUNS):
+            started_at = time.perf_counter()
+            dlg.show_projects()
+            durations.append(time.perf_counter() - started_at)
+
+        self.assertEqual(dlg.projectsTable.rowCount(), BENCHMARK_PROJECTS_COUNT)
+
+        print(
+            f"show_projects with {BENCHMARK_PROJECTS_COUNT} projects: "
+            f"min {min(durations):.3f}s, max {max(durations):.3f}s"
+        )
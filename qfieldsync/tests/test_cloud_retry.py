@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import gc
+import tempfile
+import time
+import weakref
+from pathlib import Path
+
+from qgis.core import QgsNetworkAccessManager
+from qgis.PyQt.QtCore import QCoreApplication, QThread
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
+from qgis.testing import start_app, unittest
+
+from qfieldsync.core.cloud_api import (
+    CloudNetworkAccessManager,
+    CloudRequestPriority,
+    CloudRetryPolicy,
+)
+from qfieldsync.tests.cloud_stand_in import CloudStandInServer, Fault, wait_for_reply
+
+start_app()
+
+PROJECT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+class CloudRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.server = CloudStandInServer()
+        self.server.start()
+        self.server.files[PROJECT_ID] = {"DCIM/a.jpg": [b"a" * 1000]}
+
+        self.network_manager = CloudNetworkAccessManager()
+        # talk to the stand-in server without storing its url in the settings
+        self.network_manager.url = self.server.url
+        self.network_manager.retry_policy = CloudRetryPolicy(
+            max_attempts=4, base_delay_ms=10, max_delay_ms=100
+        )
+
+    def tearDown(self):
+        self.network_manager.stop_bulk_thread()
+        self.network_manager.deleteLater()
+        self.server.stop()
+
+    def test_get_retried_after_temporary_errors(self):
+        self.server.add_fault(Fault("GET", r"/files/[^/]+/$", 503, count=2))
+
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertEqual(reply.retries_count, 2)
+        self.assertEqual(self.server.count_requests("GET", r"/files/[^/]+/$"), 3)
+
+        payload = self.network_manager.json_array(reply)
+        self.assertEqual([f["name"] for f in payload], ["DCIM/a.jpg"])
+
+    def test_get_retried_after_connection_reset(self):
+        self.server.add_fault(Fault("GET", r"/a\.jpg/$", "reset"))
+
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/DCIM/a.jpg/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertEqual(reply.retries_count, 1)
+        self.assertEqual(bytes(reply.readAll()), b"a" * 1000)
+
+    def test_retry_after_header_honored(self):
+        self.server.add_fault(
+            Fault("GET", r"/files/[^/]+/$", 429, count=1, retry_after="1")
+        )
+
+        started_at = time.monotonic()
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertEqual(reply.retries_count, 1)
+        self.assertGreaterEqual(time.monotonic() - started_at, 1)
+
+    def test_client_error_not_retried(self):
+        self.server.add_fault(Fault("GET", r"/files/[^/]+/$", 400))
+
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.attribute(QNetworkRequest.HttpStatusCodeAttribute), 400)
+        self.assertEqual(reply.retries_count, 0)
+        self.assertEqual(self.server.count_requests("GET", r"/files/[^/]+/$"), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        self.server.add_fault(Fault("GET", r"/files/[^/]+/$", 502, count=10))
+
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.attribute(QNetworkRequest.HttpStatusCodeAttribute), 502)
+        self.assertEqual(reply.retries_count, 3)
+        self.assertEqual(self.server.count_requests("GET", r"/files/[^/]+/$"), 4)
+
+    def test_non_idempotent_post_retried_only_when_not_processed(self):
+        self.server.add_fault(Fault("POST", r"/jobs/$", 502))
+
+        reply = self.network_manager.cloud_post("jobs")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.retries_count, 0)
+
+        self.server.add_fault(Fault("POST", r"/jobs/$", 503, count=2))
+
+        reply = self.network_manager.cloud_post("jobs")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.retries_count, 2)
+
+    def test_upload_retried_with_whole_body(self):
+        self.server.add_fault(Fault("POST", r"/b\.txt/$", "reset"))
+        self.server.add_fault(Fault("POST", r"/b\.txt/$", 500))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = str(Path(tmpdir, "b.txt"))
+            Path(filename).write_bytes(b"b" * 100_000)
+
+            reply = self.network_manager.cloud_upload_files(
+                f"files/{PROJECT_ID}/b.txt", filenames=[filename]
+            )
+            wait_for_reply(reply)
+
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertEqual(reply.retries_count, 2)
+        self.assertEqual(self.server.files[PROJECT_ID]["b.txt"], [b"b" * 100_000])
+
+    def test_stalled_request_aborted_and_retried(self):
+        self.network_manager.stall_timeout_ms = 300
+        self.server.add_fault(Fault("GET", r"/a\.jpg/$", "stall", duration_s=3))
+
+        started_at = time.monotonic()
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/DCIM/a.jpg/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertEqual(reply.retries_count, 1)
+        self.assertEqual(bytes(reply.readAll()), b"a" * 1000)
+        self.assertLess(time.monotonic() - started_at, 3)
+
+    def test_stalled_request_reported_as_timeout(self):
+        self.network_manager.stall_timeout_ms = 300
+        self.server.add_fault(
+            Fault("GET", r"/a\.jpg/$", "stall", count=4, duration_s=3)
+        )
+
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/DCIM/a.jpg/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.error(), QNetworkReply.TimeoutError)
+        self.assertEqual(reply.retries_count, 3)
+
+    def test_qgis_timeout_kept_and_retried(self):
+        timeout = QgsNetworkAccessManager.timeout()
+        QgsNetworkAccessManager.setTimeout(300)
+        self.server.add_fault(Fault("GET", r"/a\.jpg/$", "stall", duration_s=3))
+
+        try:
+            reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/DCIM/a.jpg/")
+            wait_for_reply(reply)
+
+            self.assertEqual(QgsNetworkAccessManager.timeout(), 300)
+        finally:
+            QgsNetworkAccessManager.setTimeout(timeout)
+
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertEqual(reply.retries_count, 1)
+
+    def test_slow_transfer_not_considered_stalled(self):
+        self.network_manager.stall_timeout_ms = 500
+        self.server.add_fault(Fault("GET", r"/a\.jpg/$", "trickle", duration_s=2))
+
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/DCIM/a.jpg/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertEqual(reply.retries_count, 0)
+        self.assertEqual(len(reply.readAll()), 10 * 1000)
+
+    def test_abort_while_waiting_for_retry(self):
+        self.network_manager.retry_policy = CloudRetryPolicy(base_delay_ms=60_000)
+        self.server.add_fault(Fault("GET", r"/files/[^/]+/$", 503))
+
+        retries = []
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+        reply.retrying.connect(lambda count, _delay_ms: retries.append(count))
+        reply.retrying.connect(reply.abort)
+        wait_for_reply(reply)
+
+        self.assertEqual(retries, [1])
+        self.assertTrue(reply.isFinished())
+        self.assertEqual(reply.error(), QNetworkReply.OperationCanceledError)
+
+    def test_bulk_reply_detached_from_its_thread(self):
+        reply = self.network_manager.cloud_get(
+            f"files/{PROJECT_ID}/DCIM/a.jpg/", priority=CloudRequestPriority.BULK
+        )
+        wait_for_reply(reply)
+
+        # the network reply stays in the thread of its network access manager
+        self.assertIs(reply.thread(), QThread.currentThread())
+        self.assertEqual(reply.findChildren(QNetworkReply), [])
+        self.assertEqual(reply.attribute(QNetworkRequest.HttpStatusCodeAttribute), 200)
+        self.assertEqual(bytes(reply.readAll()), b"a" * 1000)
+
+    def test_forced_get_not_shared(self):
+        self.server.latency_s = 0.2
+
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+        shared_reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+        forced_reply = self.network_manager.cloud_get(
+            f"files/{PROJECT_ID}/", force=True
+        )
+        # the later requests share the forced reply, which is the most recent
+        later_reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+
+        self.assertIs(shared_reply, reply)
+        self.assertIsNot(forced_reply, reply)
+        self.assertIs(later_reply, forced_reply)
+
+        wait_for_reply(reply)
+        wait_for_reply(forced_reply)
+
+        self.assertEqual(self.server.count_requests("GET", r"/files/[^/]+/$"), 2)
+
+    def test_unreleased_reply_deleted_with_its_last_reference(self):
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/DCIM/a.jpg/")
+        wait_for_reply(reply)
+        # the network manager lets go of the reply once the `finished` slots are called
+        QCoreApplication.processEvents()
+
+        reply_ref = weakref.ref(reply)
+        del reply
+        gc.collect()
+
+        self.assertIsNone(reply_ref())
+        self.assertEqual(self.network_manager.live_replies_count, 0)
+
+    def test_released_reply_keeps_its_outcome(self):
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/DCIM/a.jpg/")
+        wait_for_reply(reply)
+        reply.release()
+        QCoreApplication.processEvents()
+
+        self.assertTrue(reply.is_released)
+        self.assertTrue(reply.isFinished())
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertEqual(reply.attribute(QNetworkRequest.HttpStatusCodeAttribute), 200)
+        self.assertEqual(self.network_manager.live_replies_count, 0)
+        self.assertEqual(self.network_manager.buffered_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,1374 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import gc
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from qgis.PyQt.QtCore import QCoreApplication, QEvent, Qt, QThread
+from qgis.PyQt.QtNetwork import QNetworkReply
+from qgis.testing import start_app, unittest
+
+from qfieldsync.core import cloud_transferrer
+from qfieldsync.core.cloud_api import CloudNetworkAccessManager, CloudRetryPolicy
+from qfieldsync.core.cloud_project import CloudProject, ProjectFile
+from qfieldsync.core.cloud_transferrer import (
+    CloudTransferrer,
+    DeltaFileTransfer,
+    FileTransfer,
+    ThrottledFileTransferrer,
+    TransferFileLogsModel,
+)
+from qfieldsync.core.sync_manifest import SyncManifest
+from qfieldsync.tests import cloud_stand_in
+from qfieldsync.tests.cloud_stand_in import (
+    CloudStandInServer,
+    Fault,
+    wait_for_reply,
+    wait_for_signal,
+)
+from qfieldsync.tests.test_gpkg_changeset import (
+    create_geopackage,
+    dump_geopackage,
+    edit_geopackage,
+)
+from qfieldsync.tests.test_image_recompression import create_photo
+from qfieldsync.utils.gpkg_changeset import apply_changeset
+from qfieldsync.utils.image_recompression import is_recompression_supported
+
+start_app()
+
+PROJECT_ID = "00000000-0000-0000-0000-000000000001"
+
+BENCHMARK_FILES_COUNT = 5000
+BENCHMARK_FILE_SIZE = 2048
+
+SOAK_ROUNDS_COUNT = 10
+SOAK_FILES_COUNT = 20
+
+PIPELINE_BENCHMARK_FILES_COUNT = 100
+PIPELINE_BENCHMARK_LATENCY_S = 0.02
+
+MOVE_BENCHMARK_SIZE = 10 * 1024 * 1024 * 1024
+MOVE_BENCHMARK_FILE_SIZE = 64 * 1024 * 1024
+
+
+def create_sync_files(server, local_dir, files_count, upload_size):
+    """Creates local files to upload, cloud files to download and cloud files to delete."""
+    files_to_upload = []
+    files_to_download = []
+    files_to_delete = []
+    project_files = server.files.setdefault(PROJECT_ID, {})
+
+    for i in range(files_count):
+        name = f"DCIM/{i:03d}.jpg"
+        path = Path(local_dir, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(os.urandom(upload_size))
+        files_to_upload.append(ProjectFile({"name": name}, local_dir))
+
+        name = f"remote/{i:03d}.jpg"
+        content = os.urandom(2048)
+        project_files[name] = [content]
+        files_to_download.append(
+            ProjectFile(
+                {
+                    "name": name,
+                    "size": len(content),
+                    "sha256": hashlib.sha256(content).hexdigest(),
+                },
+                local_dir,
+            )
+        )
+
+        name = f"old/{i:03d}.jpg"
+        project_files[name] = [b"x"]
+        files_to_delete.append(ProjectFile({"name": name, "size": 1}, local_dir))
+
+    Path(local_dir, "project.qgs").write_bytes(b"<qgis/>")
+    files_to_upload.append(ProjectFile({"name": "project.qgs"}, local_dir))
+
+    return files_to_upload, files_to_download, files_to_delete
+
+
+def create_moved_files(server, local_dir, files_count, file_size, is_cloud_move):
+    """Creates files moved from `DCIM/` to `DCIM/2026/`, either locally or on the cloud.
+
+    The files are sparse, only their first bytes differ. The cloud files only have
+    their first bytes too, so the server does not keep them all in memory.
+    """
+    files_to_transfer = []
+    files_to_delete = []
+    project_files = server.files.setdefault(PROJECT_ID, {})
+
+    for i in range(files_count):
+        old_name = f"DCIM/{i:03d}.jpg"
+        new_name = f"DCIM/2026/{i:03d}.jpg"
+        header = f"image {i}".encode()
+        local_path = Path(local_dir, old_name if is_cloud_move else new_name)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(local_path, "wb") as file:
+            file.write(header)
+            file.truncate(file_size)
+
+        cloud_file = {
+            "name": new_name if is_cloud_move else old_name,
+            "size": file_size,
+            "sha256": hashlib.sha256(local_path.read_bytes()).hexdigest(),
+        }
+        project_files[cloud_file["name"]] = [
+            local_path.read_bytes() if file_size <= 1024 * 1024 else header
+        ]
+
+        if is_cloud_move:
+            files_to_transfer.append(ProjectFile(cloud_file, local_dir))
+            files_to_delete.append(ProjectFile({"name": old_name}, local_dir))
+        else:
+            files_to_transfer.append(ProjectFile({"name": new_name}, local_dir))
+            files_to_delete.append(ProjectFile(cloud_file, local_dir))
+
+    return files_to_transfer, files_to_delete
+
+
+def find_request_indices(server, method, path_pattern):
+    path_re = re.compile(path_pattern)
+
+    return [
+        idx
+        for idx, (m, path) in enumerate(server.requests)
+        if m == method and path_re.search(path)
+    ]
+
+
+class CloudTransferTestCase(unittest.TestCase):
+    """Runs each test against its own stand-in server, with the project checked out in a temporary directory."""
+
+    def setUp(self):
+        self.server = CloudStandInServer()
+        self.server.start()
+
+        self.network_manager = CloudNetworkAccessManager()
+        self.network_manager.url = self.server.url
+        self.network_manager.retry_policy = CloudRetryPolicy(base_delay_ms=10)
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cloud_project = CloudProject(
+            {
+                "id": PROJECT_ID,
+                "name": "project",
+                "owner": "user",
+                "local_dir": self.tmpdir.name,
+            }
+        )
+
+    def tearDown(self):
+        self.cloud_project.update_data({"local_dir": None})
+        self.network_manager.stop_bulk_thread()
+        self.network_manager.deleteLater()
+        self.server.stop()
+        self.tmpdir.cleanup()
+
+
+class FileTransferTest(CloudTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server.files[PROJECT_ID] = {"DCIM/a.jpg": [b"a" * 100_000]}
+
+    def transfer(self, transfer_type, filename, size=None):
+        transfer = FileTransfer(
+            self.network_manager,
+            self.cloud_project,
+            transfer_type,
+            ProjectFile({"name": filename, "size": size}),
+            Path(self.tmpdir.name, filename),
+        )
+
+        finished_threads = []
+        progress_threads = []
+        reply_threads = []
+        transfer.finished.connect(
+            lambda: finished_threads.append(QThread.currentThread())
+        )
+        # the reply is released once finished, so its thread is checked meanwhile
+        transfer.finished.connect(
+            lambda: reply_threads.append(transfer.last_reply.thread())
+        )
+        transfer.progress.connect(
+            lambda *args: progress_threads.append(QThread.currentThread())
+        )
+        transfer.transfer()
+        wait_for_signal(transfer.finished)
+
+        self.assertTrue(transfer.is_finished)
+        self.assertEqual(finished_threads, [QThread.currentThread()])
+        self.assertTrue(progress_threads)
+        self.assertTrue(all(t is QThread.currentThread() for t in progress_threads))
+        # the finished reply is handed back to the thread that created it
+        self.assertEqual(reply_threads, [QThread.currentThread()])
+        self.assertTrue(transfer.last_reply.is_released)
+
+        return transfer
+
+    def test_download_from_worker_thread(self):
+        transfer = self.transfer(FileTransfer.Type.DOWNLOAD, "DCIM/a.jpg", 100_000)
+
+        self.assertFalse(transfer.is_failed)
+        self.assertEqual(
+            Path(self.tmpdir.name, "DCIM/a.jpg").read_bytes(), b"a" * 100_000
+        )
+
+    def test_upload_from_worker_thread_with_retry(self):
+        self.server.add_fault(Fault("POST", r"/b\.txt/$", 503))
+        Path(self.tmpdir.name, "b.txt").write_bytes(b"b" * 100_000)
+
+        transfer = self.transfer(FileTransfer.Type.UPLOAD, "b.txt")
+
+        self.assertFalse(transfer.is_failed)
+        self.assertEqual(transfer.retries_count, 1)
+        self.assertEqual(self.server.files[PROJECT_ID]["b.txt"], [b"b" * 100_000])
+
+    def test_abort_from_gui_thread(self):
+        self.server.add_fault(Fault("GET", r"/a\.jpg/$", "stall", duration_s=3))
+
+        transfer = FileTransfer(
+            self.network_manager,
+            self.cloud_project,
+            FileTransfer.Type.DOWNLOAD,
+            ProjectFile({"name": "DCIM/a.jpg", "size": 100_000}),
+            Path(self.tmpdir.name, "DCIM/a.jpg"),
+        )
+        transfer.transfer()
+        transfer.abort()
+        wait_for_signal(transfer.finished)
+
+        self.assertTrue(transfer.is_finished)
+        self.assertTrue(transfer.last_reply.isFinished())
+        self.assertFalse(Path(self.tmpdir.name, "DCIM/a.jpg").exists())
+
+    def test_interactive_request_not_queued_behind_bulk_transfers(self):
+        bulk_count = 8
+        self.server.add_fault(
+            Fault("GET", r"/a\.jpg/$", "trickle", count=bulk_count, duration_s=5)
+        )
+
+        transfers = []
+        for i in range(bulk_count):
+            transfer = FileTransfer(
+                self.network_manager,
+                self.cloud_project,
+                FileTransfer.Type.DOWNLOAD,
+                ProjectFile({"name": "DCIM/a.jpg", "size": 100_000}),
+                Path(self.tmpdir.name, f"a_{i}.jpg"),
+            )
+            transfer.transfer()
+            transfers.append(transfer)
+
+        # wait until the bulk transfers hold the connections
+        started_at = time.monotonic()
+        while (
+            self.server.count_requests("GET", r"/a\.jpg/$") < 6
+            and time.monotonic() - started_at < 5
+        ):
+            QCoreApplication.processEvents()
+
+        started_at = time.monotonic()
+        reply = self.network_manager.cloud_get(f"files/{PROJECT_ID}/")
+        wait_for_reply(reply)
+
+        self.assertEqual(reply.error(), QNetworkReply.NoError)
+        self.assertLess(time.monotonic() - started_at, 0.5)
+        self.assertFalse(any(transfer.is_finished for transfer in transfers))
+
+        for transfer in transfers:
+            transfer.abort()
+
+
+class BatchUploadTest(CloudTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.contents = {f"DCIM/{i:02d}.jpg": os.urandom(1000) for i in range(25)}
+        self.contents["data.gpkg"] = os.urandom(10_000)
+        self.contents["project.qgs"] = b"<qgis/>"
+
+        for name, content in self.contents.items():
+            path = Path(self.tmpdir.name, ".qfieldsync", "upload", name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+
+    def upload(self):
+        transferrer = ThrottledFileTransferrer(
+            self.network_manager,
+            self.cloud_project,
+            [ProjectFile({"name": name}) for name in self.contents],
+            FileTransfer.Type.UPLOAD,
+            is_batching_enabled=True,
+        )
+        transferrer.batch_file_max_size = 5000
+        transferrer.batch_max_files_count = 10
+        finished_filenames = []
+        transferrer.file_finished.connect(finished_filenames.append)
+        transferrer.transfer()
+        wait_for_signal(transferrer.finished)
+
+        self.assertEqual(sorted(finished_filenames), sorted(self.contents))
+        self.assertFalse(any(t.is_failed for t in transferrer.transfers.values()))
+        self.assertEqual(
+            {
+                name: versions[-1]
+                for name, versions in self.server.files[PROJECT_ID].items()
+            },
+            self.contents,
+        )
+        self.assertEqual(self.server.count_requests("POST", r"/project\.qgs/$"), 1)
+        # the project file is uploaded strictly once all the other files are uploaded
+        self.assertRegex(self.server.requests[-1][1], r"/project\.qgs/$")
+
+        return transferrer
+
+    def test_small_files_uploaded_in_batches(self):
+        transferrer = self.upload()
+
+        self.assertEqual(len(transferrer.batches), 3)
+        self.assertEqual(
+            self.server.count_requests("POST", rf"/files/{PROJECT_ID}/$"), 3
+        )
+        self.assertEqual(self.server.count_requests("POST", r"\.jpg/$"), 0)
+        self.assertEqual(self.server.count_requests("POST", r"/data\.gpkg/$"), 1)
+
+    def test_failed_files_sent_again_on_their_own(self):
+        self.server.batch_upload_failures = {"DCIM/03.jpg": 1, "DCIM/17.jpg": 1}
+
+        self.upload()
+
+        self.assertEqual(
+            self.server.count_requests("POST", rf"/files/{PROJECT_ID}/$"), 3
+        )
+        self.assertEqual(self.server.count_requests("POST", r"\.jpg/$"), 2)
+        self.assertEqual(self.server.count_requests("POST", r"/03\.jpg/$"), 1)
+        self.assertEqual(self.server.count_requests("POST", r"/17\.jpg/$"), 1)
+
+    def test_fallback_without_server_support(self):
+        self.server.is_upload_batch_supported = False
+
+        self.upload()
+
+        self.assertFalse(self.network_manager.is_upload_batch_supported)
+        self.assertEqual(self.server.count_requests("POST", r"\.jpg/$"), 25)
+
+
+class BatchDeleteTest(CloudTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.filenames = [f"DCIM/old/{i:02d}.jpg" for i in range(30)]
+        self.server.files[PROJECT_ID] = {name: [b"x"] for name in self.filenames}
+
+    def delete(self):
+        transferrer = ThrottledFileTransferrer(
+            self.network_manager,
+            self.cloud_project,
+            [ProjectFile({"name": name, "size": 1}) for name in self.filenames],
+            FileTransfer.Type.DELETE,
+            is_batching_enabled=True,
+        )
+        model = TransferFileLogsModel([transferrer])
+        transferrer.transfer()
+        wait_for_signal(transferrer.finished)
+
+        self.assertEqual(transferrer.finished_count, len(self.filenames))
+
+        texts = [
+            model.data(model.index(row, 0, None), Qt.DisplayRole)
+            for row in range(model.rowCount(None))
+        ]
+
+        return transferrer, texts
+
+    def test_files_deleted_in_a_single_request(self):
+        transferrer, texts = self.delete()
+
+        self.assertEqual(len(transferrer.batches), 1)
+        self.assertEqual(
+            self.server.count_requests("DELETE", rf"/files/{PROJECT_ID}/$"), 1
+        )
+        self.assertEqual(self.server.count_requests("DELETE", r"\.jpg/$"), 0)
+        self.assertEqual(self.server.files[PROJECT_ID], {})
+        self.assertEqual(
+            texts,
+            [f'File "{name}" deleted on the cloud' for name in self.filenames],
+        )
+
+    def test_failed_files_reported_individually(self):
+        del self.server.files[PROJECT_ID]["DCIM/old/07.jpg"]
+
+        transferrer, texts = self.delete()
+
+        # only the failed file is sent again on its own
+        self.assertEqual(self.server.count_requests("DELETE", r"\.jpg/$"), 1)
+        self.assertTrue(transferrer.transfers["DCIM/old/07.jpg"].is_failed)
+        self.assertTrue(texts[7].startswith('Failed delete "DCIM/old/07.jpg"'))
+        self.assertEqual(
+            sum(1 for t in transferrer.transfers.values() if t.is_failed), 1
+        )
+
+    def test_fallback_without_server_support(self):
+        self.server.is_delete_batch_supported = False
+
+        transferrer, _texts = self.delete()
+
+        self.assertFalse(self.network_manager.is_delete_batch_supported)
+        self.assertEqual(self.server.count_requests("DELETE", r"\.jpg/$"), 30)
+        self.assertFalse(any(t.is_failed for t in transferrer.transfers.values()))
+        self.assertEqual(self.server.files[PROJECT_ID], {})
+
+
+class ArchiveDownloadTest(CloudTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.contents = {
+            f"DCIM/{i:02d}.jpg": bytes([i]) * (i * 1000) for i in range(20)
+        }
+        self.contents["data.gpkg"] = os.urandom(2 * 1024 * 1024)
+        self.contents["project.qgs"] = b"<qgis/>"
+        self.server.files[PROJECT_ID] = {
+            name: [b"old", content] for name, content in self.contents.items()
+        }
+
+    def download(self):
+        transferrer = ThrottledFileTransferrer(
+            self.network_manager,
+            self.cloud_project,
+            [
+                ProjectFile(
+                    {
+                        "name": name,
+                        "size": len(content),
+                        "sha256": hashlib.sha256(content).hexdigest(),
+                    }
+                )
+                for name, content in self.contents.items()
+            ],
+            FileTransfer.Type.DOWNLOAD,
+            is_archive_enabled=True,
+        )
+        model = TransferFileLogsModel([transferrer])
+        transferrer.transfer()
+        wait_for_signal(transferrer.finished)
+
+        self.assertEqual(transferrer.finished_count, len(self.contents))
+        self.assertFalse(any(t.is_failed for t in transferrer.transfers.values()))
+
+        for name, content in self.contents.items():
+            self.assertEqual(
+                Path(self.tmpdir.name, ".qfieldsync", "download", name).read_bytes(),
+                content,
+            )
+
+        texts = [
+            model.data(model.index(row, 0, None), Qt.DisplayRole)
+            for row in range(model.rowCount(None))
+        ]
+
+        self.assertEqual(
+            texts, [f'Downloaded "{name}"' for name in self.contents.keys()]
+        )
+
+        return transferrer
+
+    def test_files_downloaded_as_single_archive(self):
+        transferrer = self.download()
+
+        self.assertTrue(transferrer.archive.is_finished)
+        self.assertEqual(
+            self.server.count_requests("GET", rf"/projects/{PROJECT_ID}/archive/$"), 1
+        )
+        self.assertEqual(
+            self.server.count_requests("GET", rf"/files/{PROJECT_ID}/."), 0
+        )
+
+    def test_mismatching_file_downloaded_on_its_own(self):
+        self.server.archive_contents["DCIM/03.jpg"] = b"corrupted"
+
+        transferrer = self.download()
+
+        self.assertEqual(
+            transferrer.archive.failed_transfers, [transferrer.transfers["DCIM/03.jpg"]]
+        )
+        self.assertEqual(
+            self.server.count_requests("GET", rf"/files/{PROJECT_ID}/."), 1
+        )
+
+    def test_fallback_after_archive_failure(self):
+        self.server.add_fault(
+            Fault("GET", rf"/projects/{PROJECT_ID}/archive/$", "reset", count=100)
+        )
+
+        transferrer = self.download()
+
+        self.assertTrue(self.network_manager.is_archive_download_supported)
+        self.assertEqual(len(transferrer.archive.failed_transfers), len(self.contents))
+        self.assertEqual(
+            self.server.count_requests("GET", rf"/files/{PROJECT_ID}/."),
+            len(self.contents),
+        )
+
+    def test_fallback_without_server_support(self):
+        self.server.is_archive_download_supported = False
+
+        self.download()
+
+        self.assertFalse(self.network_manager.is_archive_download_supported)
+        self.assertEqual(
+            self.server.count_requests("GET", rf"/projects/{PROJECT_ID}/archive/$"), 1
+        )
+        self.assertEqual(
+            self.server.count_requests("GET", rf"/files/{PROJECT_ID}/."),
+            len(self.contents),
+        )
+
+
+class DeltaSyncTest(CloudTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cloud_content = os.urandom(2 * 1024 * 1024)
+        # a few bytes inserted in the middle and the end changed
+        self.local_content = (
+            self.cloud_content[:1_000_000]
+            + b"inserted"
+            + self.cloud_content[1_000_000:-1000]
+            + os.urandom(1000)
+        )
+        self.server.files[PROJECT_ID] = {"data.gpkg": [self.cloud_content]}
+
+        self.min_file_size = DeltaFileTransfer.MIN_FILE_SIZE
+        DeltaFileTransfer.MIN_FILE_SIZE = 1024 * 1024
+
+    def tearDown(self):
+        DeltaFileTransfer.MIN_FILE_SIZE = self.min_file_size
+        super().tearDown()
+
+    def transfer(self, transfer_type, local_content, cloud_content):
+        local_path = Path(self.tmpdir.name, "data.gpkg")
+        local_path.write_bytes(local_content)
+
+        if transfer_type == FileTransfer.Type.UPLOAD:
+            destination = local_path
+        else:
+            destination = Path(self.tmpdir.name, ".qfieldsync", "download", "data.gpkg")
+
+        transfer = FileTransfer(
+            self.network_manager,
+            self.cloud_project,
+            transfer_type,
+            ProjectFile(
+                {
+                    "name": "data.gpkg",
+                    "size": len(cloud_content),
+                    "sha256": hashlib.sha256(cloud_content).hexdigest(),
+                },
+                self.tmpdir.name,
+            ),
+            destination,
+        )
+        transfer.transfer()
+        wait_for_signal(transfer.finished)
+
+        self.assertTrue(transfer.is_finished)
+        self.assertFalse(transfer.is_failed)
+        self.assertEqual(transfer.bytes_transferred, transfer.bytes_total)
+
+        if transfer_type == FileTransfer.Type.UPLOAD:
+            self.assertEqual(
+                self.server.files[PROJECT_ID]["data.gpkg"][-1], local_content
+            )
+        else:
+            self.assertEqual(destination.read_bytes(), cloud_content)
+
+        # the temporary files of the delta are removed
+        self.assertEqual(
+            list(Path(self.tmpdir.name, ".qfieldsync", "delta").glob("*")), []
+        )
+
+        return transfer
+
+    def test_upload_only_new_chunks(self):
+        transfer = self.transfer(
+            FileTransfer.Type.UPLOAD, self.local_content, self.cloud_content
+        )
+
+        self.assertIsNone(transfer._delta.error)
+        self.assertEqual(
+            self.server.count_requests("POST", r"/files/.*/data.gpkg/delta/$"), 1
+        )
+        self.assertEqual(
+            self.server.count_requests("POST", r"/files/.*/data.gpkg/$"), 0
+        )
+        # only the chunks around the edits are sent
+        self.assertLess(transfer._delta.bytes_total, 500_000)
+
+    def test_download_only_missing_chunks(self):
+        transfer = self.transfer(
+            FileTransfer.Type.DOWNLOAD, self.local_content, self.cloud_content
+        )
+
+        self.assertIsNone(transfer._delta.error)
+        self.assertLess(transfer._delta.bytes_total, 500_000)
+        self.assertGreater(
+            self.server.count_requests("GET", r"/files/.*/data.gpkg$"), 0
+        )
+        self.assertEqual(self.server.count_requests("GET", r"/files/.*/data.gpkg/$"), 0)
+
+    def test_upload_fallback_without_server_support(self):
+        self.server.is_delta_sync_supported = False
+
+        self.transfer(FileTransfer.Type.UPLOAD, self.local_content, self.cloud_content)
+
+        self.assertFalse(self.network_manager.is_delta_sync_supported)
+        self.assertEqual(
+            self.server.count_requests("POST", r"/files/.*/data.gpkg/$"), 1
+        )
+
+    def test_upload_fallback_when_cloud_file_changed(self):
+        self.server.add_fault(Fault("POST", r"/data.gpkg/delta/$", 412))
+
+        transfer = self.transfer(
+            FileTransfer.Type.UPLOAD, self.local_content, self.cloud_content
+        )
+
+        self.assertIsNotNone(transfer._delta.error)
+        self.assertTrue(self.network_manager.is_delta_sync_supported)
+        self.assertEqual(
+            self.server.count_requests("POST", r"/files/.*/data.gpkg/$"), 1
+        )
+
+    def test_download_fallback_without_common_chunks(self):
+        transfer = self.transfer(
+            FileTransfer.Type.DOWNLOAD,
+            os.urandom(len(self.cloud_content)),
+            self.cloud_content,
+        )
+
+        self.assertIsNotNone(transfer._delta.error)
+        self.assertEqual(self.server.count_requests("GET", r"/files/.*/data.gpkg/$"), 1)
+
+
+class ChangesetUploadTest(CloudTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.local_path = Path(self.tmpdir.name, "data.gpkg")
+
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = Path(dirname, "data.gpkg")
+            create_geopackage(filename, 2000)
+            self.server.files[PROJECT_ID] = {"data.gpkg": [filename.read_bytes()]}
+
+        # the first checkout keeps the baseline of the GeoPackage
+        self.sync([], [self.cloud_file()])
+
+    def cloud_file(self):
+        content = self.server.files[PROJECT_ID]["data.gpkg"][-1]
+
+        return ProjectFile(
+            {
+                "name": "data.gpkg",
+                "size": len(content),
+                "sha256": hashlib.sha256(content).hexdigest(),
+            },
+            self.tmpdir.name,
+        )
+
+    def sync(self, files_to_upload, files_to_download):
+        transferrer = CloudTransferrer(self.network_manager, self.cloud_project)
+        transferrer.is_changeset_upload_enabled = True
+        transferrer.sync(files_to_upload, files_to_download, [])
+        wait_for_signal(transferrer.finished)
+
+        self.assertTrue(transferrer.is_finished)
+        self.assertIsNone(transferrer.error_message)
+
+        return transferrer
+
+    def upload(self):
+        edit_geopackage(self.local_path)
+        self.sync([self.cloud_file()], [])
+
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = Path(dirname, "data.gpkg")
+            filename.write_bytes(self.server.files[PROJECT_ID]["data.gpkg"][-1])
+
+            self.assertEqual(
+                dump_geopackage(filename), dump_geopackage(self.local_path)
+            )
+
+    def test_changed_rows_uploaded(self):
+        self.upload()
+
+        self.assertEqual(
+            self.server.count_requests("POST", r"/data\.gpkg/changeset/$"), 1
+        )
+        self.assertEqual(self.server.count_requests("POST", r"/data\.gpkg/$"), 0)
+
+        # the cloud file is not a byte copy of the local file, yet both are synchronized
+        cloud_file = self.cloud_file()
+        entry = SyncManifest(self.tmpdir.name).get("data.gpkg")
+
+        self.assertNotEqual(cloud_file.sha256, cloud_file.local_sha256)
+        self.assertEqual(entry["cloud_sha256"], cloud_file.sha256)
+        self.assertEqual(entry["local_sha256"], cloud_file.local_sha256)
+
+        self.cloud_project.update_data(
+            {
+                "cloud_files": [
+                    {
+                        "name": cloud_file.name,
+                        "size": cloud_file.size,
+                        "sha256": cloud_file.sha256,
+                    }
+                ]
+            }
+        )
+
+        self.assertEqual(list(self.cloud_project.files_to_sync), [])
+
+    def test_changeset_created_in_a_separate_thread(self):
+        edit_geopackage(self.local_path)
+
+        transferrer = CloudTransferrer(self.network_manager, self.cloud_project)
+        transferrer.is_changeset_upload_enabled = True
+        transferrer.sync([self.cloud_file()], [], [])
+
+        # the transfers are created once the changeset is written
+        self.assertIsNone(transferrer.transfers_model)
+
+        wait_for_signal(transferrer.prepared)
+
+        self.assertIsNotNone(transferrer.transfers_model)
+        self.assertIn("data.gpkg", transferrer._changesets)
+
+        wait_for_signal(transferrer.finished)
+
+        self.assertIsNone(transferrer.error_message)
+        self.assertEqual(
+            self.server.count_requests("POST", r"/data\.gpkg/changeset/$"), 1
+        )
+
+    def test_fallback_without_server_support(self):
+        self.server.is_changeset_upload_supported = False
+
+        self.upload()
+
+        self.assertFalse(self.network_manager.is_changeset_upload_supported)
+        self.assertEqual(self.server.count_requests("POST", r"/data\.gpkg/$"), 1)
+
+    def test_fallback_when_cloud_file_changed(self):
+        self.server.add_fault(Fault("POST", r"/data\.gpkg/changeset/$", 412))
+
+        self.upload()
+
+        self.assertTrue(self.network_manager.is_changeset_upload_supported)
+        self.assertEqual(self.server.count_requests("POST", r"/data\.gpkg/$"), 1)
+        self.assertEqual(
+            self.server.files[PROJECT_ID]["data.gpkg"][-1],
+            self.local_path.read_bytes(),
+        )
+
+    def test_fallback_when_changeset_taken_for_upload(self):
+        self.server.is_changeset_upload_supported = False
+        self.server.is_unsupported_action_uploaded = True
+
+        self.upload()
+
+        self.assertFalse(self.network_manager.is_changeset_upload_supported)
+        self.assertEqual(self.server.count_requests("POST", r"/data\.gpkg/$"), 1)
+
+    def test_fallback_when_rebuilt_file_differs(self):
+        # the file rebuilt locally differs, as if the server used another SQLite version
+        def apply_changeset_differently(filename, changeset):
+            apply_changeset(filename, changeset)
+            conn = sqlite3.connect(str(filename))
+
+            with conn:
+                conn.execute("UPDATE gpkg_contents SET last_change = '2000-01-01'")
+
+            conn.close()
+
+        cloud_transferrer.apply_changeset = apply_changeset_differently
+
+        try:
+            self.upload()
+        finally:
+            cloud_transferrer.apply_changeset = apply_changeset
+
+        self.assertTrue(self.network_manager.is_changeset_upload_supported)
+        self.assertEqual(self.server.count_requests("POST", r"/data\.gpkg/$"), 1)
+        self.assertEqual(
+            self.server.files[PROJECT_ID]["data.gpkg"][-1],
+            self.local_path.read_bytes(),
+        )
+
+    def test_changesets_uploaded_one_after_the_other(self):
+        self.upload()
+
+        conn = sqlite3.connect(str(self.local_path))
+
+        with conn:
+            conn.execute("UPDATE points SET name = 'renamed again' WHERE fid = 9")
+
+        conn.close()
+        self.sync([self.cloud_file()], [])
+
+        # the baseline is a byte copy of the cloud file the changeset is applied on
+        self.assertEqual(
+            self.server.count_requests("POST", r"/data\.gpkg/changeset/$"), 2
+        )
+        self.assertEqual(self.server.count_requests("POST", r"/data\.gpkg/$"), 0)
+
+
+class PipelinedSyncTest(CloudTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server.latency_s = 0.01
+
+    def sync(self, is_pipelined):
+        files_to_upload, files_to_download, files_to_delete = create_sync_files(
+            self.server, self.tmpdir.name, 10, 1536 * 1024
+        )
+        # a file only deleted locally
+        Path(self.tmpdir.name, "local.txt").write_bytes(b"x")
+        files_to_delete.append(ProjectFile({"name": "local.txt"}, self.tmpdir.name))
+
+        transferrer = CloudTransferrer(self.network_manager, self.cloud_project)
+        transferrer.is_pipelined = is_pipelined
+        transferrer.sync(files_to_upload, files_to_download, files_to_delete)
+        wait_for_signal(transferrer.finished, 60_000)
+
+        self.assertTrue(transferrer.is_finished)
+        self.assertIsNone(transferrer.error_message)
+        self.assertFalse(Path(self.tmpdir.name, "local.txt").exists())
+
+        for project_file in files_to_upload:
+            self.assertEqual(
+                self.server.files[PROJECT_ID][project_file.name][-1],
+                project_file.local_path.read_bytes(),
+            )
+
+        for project_file in files_to_download:
+            self.assertEqual(
+                project_file.local_path.read_bytes(),
+                self.server.files[PROJECT_ID][project_file.name][-1],
+            )
+
+        self.assertFalse(
+            any(name.startswith("old/") for name in self.server.files[PROJECT_ID])
+        )
+
+        # the project file is uploaded strictly after all the other uploads
+        project_file_idx = find_request_indices(self.server, "POST", r"/project\.qgs/$")
+        self.assertEqual(len(project_file_idx), 1)
+        self.assertEqual(
+            max(find_request_indices(self.server, "POST", r"/files/")),
+            project_file_idx[0],
+        )
+
+        return project_file_idx[0]
+
+    def test_sequential(self):
+        project_file_idx = self.sync(False)
+
+        self.assertGreater(
+            min(find_request_indices(self.server, "DELETE", r"/files/")),
+            project_file_idx,
+        )
+        self.assertGreater(
+            min(find_request_indices(self.server, "GET", r"/remote/")),
+            project_file_idx,
+        )
+
+    def test_pipelined(self):
+        project_file_idx = self.sync(True)
+
+        # the project file is still uploaded after the deletes
+        self.assertLess(
+            max(find_request_indices(self.server, "DELETE", r"/files/")),
+            project_file_idx,
+        )
+        # the downloads run while the files are uploaded, within the shared budget
+        self.assertLess(
+            min(find_request_indices(self.server, "GET", r"/remote/")),
+            project_file_idx,
+        )
+        # the files list is refreshed with an interactive request, outside of the budget
+        self.assertLessEqual(self.server.max_concurrent_requests, 8 + 1)
+
+
+class MoveDetectionTest(CloudTransferTestCase):
+    def sync(self, files_to_upload, files_to_download, files_to_delete):
+        transferrer = CloudTransferrer(self.network_manager, self.cloud_project)
+        transferrer.is_pipelined = True
+        transferrer.is_move_detection_enabled = True
+        transferrer.is_server_copy_enabled = True
+        transferrer.sync(files_to_upload, files_to_download, files_to_delete)
+        wait_for_signal(transferrer.finished)
+
+        self.assertTrue(transferrer.is_finished)
+        self.assertIsNone(transferrer.error_message)
+
+        return transferrer
+
+    def assert_moved_on_cloud(self, files_to_upload):
+        project_files = self.server.files[PROJECT_ID]
+
+        for project_file in files_to_upload:
+            self.assertEqual(
+                project_files[project_file.name][-1],
+                project_file.local_path.read_bytes(),
+            )
+
+        self.assertEqual(sorted(project_files), sorted(f.name for f in files_to_upload))
+
+    def test_moved_locally_copied_on_server(self):
+        files_to_upload, files_to_delete = create_moved_files(
+            self.server, self.tmpdir.name, 5, 4096, False
+        )
+        # not moved, a new file with other content
+        Path(self.tmpdir.name, "DCIM/2026/new.jpg").write_bytes(b"new")
+        files_to_upload.append(
+            ProjectFile({"name": "DCIM/2026/new.jpg"}, self.tmpdir.name)
+        )
+
+        self.sync(files_to_upload, [], files_to_delete)
+
+        self.assert_moved_on_cloud(files_to_upload)
+        self.assertEqual(self.server.count_requests("POST", r"/copy/$"), 5)
+        self.assertEqual(
+            self.server.count_requests("POST", r"/DCIM/2026/\d+\.jpg/$"), 0
+        )
+
+        # the files are deleted strictly after being copied
+        self.assertLess(
+            max(find_request_indices(self.server, "POST", r"/copy/$")),
+            min(find_request_indices(self.server, "DELETE", r"/files/")),
+        )
+
+    def test_fallback_without_server_support(self):
+        self.server.is_server_copy_supported = False
+        files_to_upload, files_to_delete = create_moved_files(
+            self.server, self.tmpdir.name, 5, 4096, False
+        )
+
+        self.sync(files_to_upload, [], files_to_delete)
+
+        self.assertFalse(self.network_manager.is_server_copy_supported)
+        self.assert_moved_on_cloud(files_to_upload)
+
+    def test_fallback_when_copy_taken_for_upload(self):
+        self.server.is_server_copy_supported = False
+        self.server.is_unsupported_action_uploaded = True
+        files_to_upload, files_to_delete = create_moved_files(
+            self.server, self.tmpdir.name, 5, 4096, False
+        )
+
+        self.sync(files_to_upload, [], files_to_delete)
+
+        self.assertFalse(self.network_manager.is_server_copy_supported)
+        self.assertEqual(
+            self.server.count_requests("POST", r"/DCIM/2026/\d+\.jpg/$"), 5
+        )
+
+        for project_file in files_to_upload:
+            self.assertEqual(
+                self.server.files[PROJECT_ID][project_file.name][-1],
+                project_file.local_path.read_bytes(),
+            )
+
+    def test_moved_on_cloud_relocated(self):
+        files_to_download, files_to_delete = create_moved_files(
+            self.server, self.tmpdir.name, 5, 4096, True
+        )
+
+        self.sync([], files_to_download, files_to_delete)
+
+        for project_file in files_to_download:
+            self.assertEqual(
+                project_file.local_path.read_bytes(),
+                self.server.files[PROJECT_ID][project_file.name][-1],
+            )
+
+        for project_file in files_to_delete:
+            self.assertFalse(project_file.local_path.exists())
+
+        self.assertEqual(self.server.count_requests("GET", r"/DCIM/"), 0)
+
+    def test_candidates_hashed_in_a_separate_thread(self):
+        files_to_upload, files_to_delete = create_moved_files(
+            self.server, self.tmpdir.name, 5, 4096, False
+        )
+        hashing_threads = []
+        get_file_sha256 = cloud_transferrer.get_file_sha256
+
+        def get_file_sha256_in_thread(filename):
+            hashing_threads.append(threading.current_thread())
+            return get_file_sha256(filename)
+
+        cloud_transferrer.get_file_sha256 = get_file_sha256_in_thread
+
+        try:
+            self.sync(files_to_upload, [], files_to_delete)
+        finally:
+            cloud_transferrer.get_file_sha256 = get_file_sha256
+
+        self.assertTrue(hashing_threads)
+        self.assertNotIn(threading.main_thread(), hashing_threads)
+        self.assertEqual(self.server.count_requests("POST", r"/copy/$"), 5)
+
+
+@unittest.skipUnless(is_recompression_supported(), "Pillow is not installed")
+class ImageRecompressionTest(CloudTransferTestCase):
+    def test_photos_recompressed_before_upload(self):
+        files_to_upload = []
+        for name in ("DCIM/photo.jpg", "other/photo.jpg"):
+            filename = Path(self.tmpdir.name, name)
+            filename.parent.mkdir(parents=True)
+            create_photo(filename, 3000, 2000)
+            files_to_upload.append(ProjectFile({"name": name}, self.tmpdir.name))
+
+        originals = {f.name: f.local_path.read_bytes() for f in files_to_upload}
+
+        transferrer = CloudTransferrer(self.network_manager, self.cloud_project)
+        transferrer.is_image_recompression_enabled = True
+        transferrer.image_max_size = 1024
+        transferrer.sync(files_to_upload, [], [])
+        wait_for_signal(transferrer.finished)
+
+        self.assertTrue(transferrer.is_finished)
+        self.assertIsNone(transferrer.error_message)
+
+        # only the photos of the attachment dirs are recompressed, the local originals are kept
+        project_files = self.server.files[PROJECT_ID]
+        self.assertLess(
+            len(project_files["DCIM/photo.jpg"][-1]), len(originals["DCIM/photo.jpg"])
+        )
+        self.assertEqual(
+            project_files["other/photo.jpg"][-1], originals["other/photo.jpg"]
+        )
+
+        for project_file in files_to_upload:
+            self.assertEqual(
+                project_file.local_path.read_bytes(), originals[project_file.name]
+            )
+
+        # the recompressed photo is synchronized with its original
+        self.cloud_project.update_data(
+            {
+                "cloud_files": [
+                    {
+                        "name": name,
+                        "size": len(versions[-1]),
+                        "sha256": hashlib.sha256(versions[-1]).hexdigest(),
+                    }
+                    for name, versions in project_files.items()
+                ]
+            }
+        )
+
+        self.assertEqual(list(self.cloud_project.files_to_sync), [])
+
+    def test_photos_recompressed_in_a_separate_thread(self):
+        filename = Path(self.tmpdir.name, "DCIM/photo.jpg")
+        filename.parent.mkdir(parents=True)
+        create_photo(filename, 3000, 2000)
+        files_to_upload = [ProjectFile({"name": "DCIM/photo.jpg"}, self.tmpdir.name)]
+        recompressing_threads = []
+        recompress_images = cloud_transferrer.recompress_images
+
+        def recompress_images_in_thread(*args):
+            recompressing_threads.append(threading.current_thread())
+            return recompress_images(*args)
+
+        cloud_transferrer.recompress_images = recompress_images_in_thread
+
+        try:
+            transferrer = CloudTransferrer(self.network_manager, self.cloud_project)
+            transferrer.is_image_recompression_enabled = True
+            transferrer.sync(files_to_upload, [], [])
+            wait_for_signal(transferrer.finished)
+        finally:
+            cloud_transferrer.recompress_images = recompress_images
+
+        self.assertIsNone(transferrer.error_message)
+        self.assertEqual(len(recompressing_threads), 1)
+        self.assertNotEqual(recompressing_threads[0], threading.main_thread())
+
+    def test_unreadable_photo_uploaded_as_is(self):
+        filename = Path(self.tmpdir.name, "DCIM/photo.jpg")
+        filename.parent.mkdir(parents=True)
+        filename.write_bytes(b"not a photo")
+        files_to_upload = [ProjectFile({"name": "DCIM/photo.jpg"}, self.tmpdir.name)]
+
+        transferrer = CloudTransferrer(self.network_manager, self.cloud_project)
+        transferrer.is_image_recompression_enabled = True
+        transferrer.sync(files_to_upload, [], [])
+        wait_for_signal(transferrer.finished)
+
+        self.assertTrue(transferrer.is_finished)
+        self.assertIsNone(transferrer.error_message)
+        self.assertEqual(
+            self.server.files[PROJECT_ID]["DCIM/photo.jpg"][-1], b"not a photo"
+        )
+
+
+class ReplyLifecycleSoakTest(CloudTransferTestCase):
+    def sync(self, transfer_type):
+        files = [
+            ProjectFile({"name": f"DCIM/{i:02d}.jpg", "size": 10_000})
+            for i in range(SOAK_FILES_COUNT)
+        ]
+
+        if transfer_type == FileTransfer.Type.UPLOAD:
+            for file in files:
+                path = Path(self.tmpdir.name, ".qfieldsync", "upload", file.name)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(os.urandom(10_000))
+
+        transferrer = ThrottledFileTransferrer(
+            self.network_manager, self.cloud_project, files, transfer_type
+        )
+        transferrer.transfer()
+        wait_for_signal(transferrer.finished)
+
+        self.assertFalse(any(t.is_failed for t in transferrer.transfers.values()))
+
+    def collect(self):
+        # run the deferred releases, delete the network replies, then collect the
+        # replies not referenced anymore
+        QCoreApplication.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        gc.collect()
+
+    def test_memory_bounded_over_repeated_syncs(self):
+        tracemalloc.start()
+        core_filter = tracemalloc.Filter(True, "*qfieldsync/core/*")
+        memory_sizes = []
+        children_counts = []
+
+        for _i in range(SOAK_ROUNDS_COUNT):
+            self.sync(FileTransfer.Type.UPLOAD)
+            self.sync(FileTransfer.Type.DOWNLOAD)
+            self.network_manager.projects_cache.refresh()
+            wait_for_signal(self.network_manager.projects_cache.projects_updated)
+            self.collect()
+
+            self.assertEqual(self.network_manager.live_replies_count, 0)
+            self.assertEqual(self.network_manager.buffered_bytes, 0)
+
+            snapshot = tracemalloc.take_snapshot().filter_traces([core_filter])
+            memory_sizes.append(
+                sum(stat.size for stat in snapshot.statistics("filename"))
+            )
+            children_counts.append(len(self.network_manager.children()))
+
+        tracemalloc.stop()
+
+        # the first rounds warm up the caches
+        self.assertEqual(children_counts[1], children_counts[-1])
+        self.assertLess(memory_sizes[-1] - memory_sizes[1], 256 * 1024)
+
+
+@unittest.skipUnless(
+    os.environ.get("QFIELDSYNC_BENCHMARK"),
+    "set QFIELDSYNC_BENCHMARK=1 to run the benchmarks",
+)
+@unittest.skipUnless(cloud_stand_in.h2, "the h2 package is required for HTTP/2")
+class HttpVersionsBenchmark(unittest.TestCase):
+    def test_download_small_files(self):
+        server = CloudStandInServer(tls=True)
+        server.start()
+        server.files[PROJECT_ID] = {
+            f"DCIM/{i:05d}.jpg": [os.urandom(BENCHMARK_FILE_SIZE)]
+            for i in range(BENCHMARK_FILES_COUNT)
+        }
+        files = [
+            ProjectFile({"name": name, "size": BENCHMARK_FILE_SIZE})
+            for name in server.files[PROJECT_ID]
+        ]
+
+        for is_http2_enabled in (False, True):
+            network_manager = CloudNetworkAccessManager()
+            network_manager.url = server.url
+            network_manager.is_http2_enabled = is_http2_enabled
+            requests_offset = len(server.protocols)
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                cloud_project = CloudProject(
+                    {
+                        "id": PROJECT_ID,
+                        "name": "project",
+                        "owner": "user",
+                        "local_dir": tmpdir,
+                    }
+                )
+                transferrer = ThrottledFileTransferrer(
+                    network_manager, cloud_project, files, FileTransfer.Type.DOWNLOAD
+                )
+
+                started_at = time.perf_counter()
+                transferrer.transfer()
+                wait_for_signal(transferrer.finished, 600_000)
+                duration = time.perf_counter() - started_at
+
+                self.assertEqual(transferrer.finished_count, BENCHMARK_FILES_COUNT)
+                self.assertFalse(
+                    any(t.is_failed for t in transferrer.transfers.values())
+                )
+
+                cloud_project.update_data({"local_dir": None})
+
+            protocols = set(server.protocols[requests_offset:])
+            self.assertEqual(
+                protocols, {"HTTP/2"} if is_http2_enabled else {"HTTP/1.1"}
+            )
+
+            print(
+                f"download of {BENCHMARK_FILES_COUNT} files of {BENCHMARK_FILE_SIZE} bytes "
+                f"with {protocols.pop()}: {duration:.3f}s"
+            )
+
+            network_manager.stop_bulk_thread()
+            network_manager.deleteLater()
+
+        server.stop()
+
+
+@unittest.skipUnless(
+    os.environ.get("QFIELDSYNC_BENCHMARK"),
+    "set QFIELDSYNC_BENCHMARK=1 to run the benchmarks",
+)
+class PipelinedSyncBenchmark(unittest.TestCase):
+    def test_sync_both_sides_changed(self):
+        durations = {}
+
+        for is_pipelined in (False, True):
+            server = CloudStandInServer()
+            server.latency_s = PIPELINE_BENCHMARK_LATENCY_S
+            server.start()
+            network_manager = CloudNetworkAccessManager()
+            network_manager.url = server.url
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                cloud_project = CloudProject(
+                    {
+                        "id": PROJECT_ID,
+                        "name": "project",
+                        "owner": "user",
+                        "local_dir": tmpdir,
+                    }
+                )
+                # the uploaded files are too large for batches, so each is a request
+                files = create_sync_files(
+                    server, tmpdir, PIPELINE_BENCHMARK_FILES_COUNT, 1536 * 1024
+                )
+                transferrer = CloudTransferrer(network_manager, cloud_project)
+                transferrer.is_pipelined = is_pipelined
+
+                started_at = time.perf_counter()
+                transferrer.sync(*files)
+                wait_for_signal(transferrer.finished, 600_000)
+                durations[is_pipelined] = time.perf_counter() - started_at
+
+                self.assertIsNone(transferrer.error_message)
+
+                cloud_project.update_data({"local_dir": None})
+
+            print(
+                f"sync of {PIPELINE_BENCHMARK_FILES_COUNT} uploads, downloads and deletes "
+                f"with {PIPELINE_BENCHMARK_LATENCY_S * 1000:.0f}ms latency, "
+                f"{'pipelined' if is_pipelined else 'sequential'}: "
+                f"{durations[is_pipelined]:.3f}s"
+            )
+
+            network_manager.stop_bulk_thread()
+            network_manager.deleteLater()
+            server.stop()
+
+        self.assertLess(durations[True], durations[False])
+
+
+@unittest.skipUnless(
+    os.environ.get("QFIELDSYNC_BENCHMARK"),
+    "set QFIELDSYNC_BENCHMARK=1 to run the benchmarks",
+)
+class MoveDetectionBenchmark(unittest.TestCase):
+    def test_folder_move(self):
+        files_count = MOVE_BENCHMARK_SIZE // MOVE_BENCHMARK_FILE_SIZE
+        server = CloudStandInServer()
+        server.start()
+        network_manager = CloudNetworkAccessManager()
+        network_manager.url = server.url
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cloud_project = CloudProject(
+                {
+                    "id": PROJECT_ID,
+                    "name": "project",
+                    "owner": "user",
+                    "local_dir": tmpdir,
+                }
+            )
+            files_to_upload, files_to_delete = create_moved_files(
+                server, tmpdir, files_count, MOVE_BENCHMARK_FILE_SIZE, False
+            )
+            transferrer = CloudTransferrer(network_manager, cloud_project)
+            transferrer.is_pipelined = True
+            transferrer.is_move_detection_enabled = True
+            transferrer.is_server_copy_enabled = True
+
+            started_at = time.perf_counter()
+            transferrer.sync(files_to_upload, [], files_to_delete)
+            wait_for_signal(transferrer.finished, 3_600_000)
+            duration = time.perf_counter() - started_at
+
+            self.assertIsNone(transferrer.error_message)
+
+            cloud_project.update_data({"local_dir": None})
+
+        network_manager.stop_bulk_thread()
+        network_manager.deleteLater()
+        server.stop()
+
+        print(
+            f"move of {MOVE_BENCHMARK_SIZE / 1024**3:.0f} GiB in {files_count} files: "
+            f"{duration:.3f}s, "
+            f"{server.count_requests('POST', r'/copy/$')} server-side copies, "
+            f"{server.count_requests('POST', r'/DCIM/2026/')} uploads"
+        )
+
+        self.assertEqual(server.count_requests("POST", r"/copy/$"), files_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
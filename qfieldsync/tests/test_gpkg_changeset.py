@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import json
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from qgis.testing import unittest
+
+from qfieldsync.core.sync_manifest import SyncManifest
+from qfieldsync.utils.file_utils import get_file_sha256
+from qfieldsync.utils.gpkg_changeset import (
+    ChangesetError,
+    apply_changeset,
+    create_changeset,
+    get_fingerprint,
+)
+
+
+def create_geopackage(filename, rows_count):
+    """Creates a minimal GeoPackage-like database, with a spatial index and metadata tables."""
+    conn = sqlite3.connect(str(filename))
+
+    with conn:
+        conn.executescript(
+            """
+            CREATE TABLE gpkg_contents (table_name TEXT PRIMARY KEY, last_change TEXT);
+            CREATE TABLE points (
+                fid INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE,
+                geom BLOB,
+                value REAL
+            );
+            CREATE VIRTUAL TABLE rtree_points_geom USING rtree(id, minx, maxx, miny, maxy);
+            INSERT INTO gpkg_contents VALUES ('points', '2026-01-01T00:00:00Z');
+            """
+        )
+        conn.executemany(
+            "INSERT INTO points (name, geom, value) VALUES (?, ?, ?)",
+            [(f"point {i}", bytes([i % 256]) * 100, i / 3) for i in range(rows_count)],
+        )
+
+    conn.close()
+
+
+def edit_geopackage(filename):
+    """Deletes, updates and inserts a few rows, as with a short editing session."""
+    conn = sqlite3.connect(str(filename))
+
+    with conn:
+        conn.execute("DELETE FROM points WHERE fid = 5")
+        conn.execute("UPDATE points SET value = NULL, geom = x'00ff' WHERE fid = 7")
+        conn.execute("UPDATE points SET name = 'renamed' WHERE fid = 8")
+        conn.execute(
+            "INSERT INTO points (name, geom, value) VALUES ('point 4', x'01', 1.5)"
+        )
+        conn.execute("INSERT INTO rtree_points_geom VALUES (1, 0, 1, 0, 1)")
+        conn.execute("UPDATE gpkg_contents SET last_change = '2026-10-19T00:00:00Z'")
+
+    conn.close()
+
+
+def dump_geopackage(filename):
+    conn = sqlite3.connect(str(filename))
+
+    try:
+        return [
+            conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+            for table in ("points", "gpkg_contents", "sqlite_sequence")
+        ]
+    finally:
+        conn.close()
+
+
+class GeoPackageChangesetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.baseline = Path(self.tmpdir.name, "baseline.gpkg")
+        self.filename = Path(self.tmpdir.name, "data.gpkg")
+
+        create_geopackage(self.baseline, 1000)
+        shutil.copyfile(self.baseline, self.filename)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_changed_rows_applied(self):
+        edit_geopackage(self.filename)
+
+        changeset = json.loads(
+            json.dumps(create_changeset(self.baseline, self.filename))
+        )
+        changes = {
+            table["name"]: (
+                len(table["insert"]),
+                len(table["update"]),
+                len(table["delete"]),
+            )
+            for table in changeset["tables"]
+        }
+
+        # the spatial index is maintained by the triggers, so it is left out
+        self.assertEqual(
+            changes,
+            {
+                "points": (1, 2, 1),
+                "gpkg_contents": (0, 1, 0),
+                "sqlite_sequence": (0, 1, 0),
+            },
+        )
+        self.assertLess(len(json.dumps(changeset)), 2000)
+
+        apply_changeset(self.baseline, changeset)
+
+        self.assertEqual(dump_geopackage(self.baseline), dump_geopackage(self.filename))
+
+    def test_unchanged_rows(self):
+        changeset = create_changeset(self.baseline, self.filename)
+
+        self.assertEqual(changeset["tables"], [])
+
+    def test_schema_changed(self):
+        conn = sqlite3.connect(str(self.filename))
+        conn.execute("ALTER TABLE points ADD COLUMN comment TEXT")
+        conn.close()
+
+        with self.assertRaises(ChangesetError):
+            create_changeset(self.baseline, self.filename)
+
+    def test_conflicting_changeset(self):
+        edit_geopackage(self.filename)
+        changeset = create_changeset(self.baseline, self.filename)
+
+        # the inserted row already exists
+        conn = sqlite3.connect(str(self.baseline))
+        with conn:
+            conn.execute("DELETE FROM points WHERE fid = 5")
+            conn.execute("INSERT INTO points (fid, name) VALUES (1001, 'other')")
+        conn.close()
+        before = dump_geopackage(self.baseline)
+
+        with self.assertRaises(ChangesetError):
+            apply_changeset(self.baseline, changeset)
+
+        # nothing is applied
+        self.assertEqual(dump_geopackage(self.baseline), before)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ChangesetError):
+            apply_changeset(self.baseline, {"format": "other", "tables": []})
+
+
+class GeoPackageFingerprintTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmpdir.name, "data.gpkg")
+
+        create_geopackage(self.filename, 1000)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def rewrite_geopackage(self):
+        conn = sqlite3.connect(str(self.filename))
+        with conn:
+            conn.execute(
+                "CREATE TABLE gpkg_ogr_contents (table_name TEXT, feature_count INTEGER)"
+            )
+            conn.execute("INSERT INTO gpkg_ogr_contents VALUES ('points', 1000)")
+        conn.execute("VACUUM")
+        conn.close()
+
+    def test_rewritten_without_changes(self):
+        sha256 = get_file_sha256(self.filename)
+        fingerprint = get_fingerprint(self.filename)
+
+        self.rewrite_geopackage()
+
+        self.assertNotEqual(get_file_sha256(self.filename), sha256)
+        self.assertEqual(get_fingerprint(self.filename), fingerprint)
+
+    def test_changed_rows(self):
+        fingerprint = get_fingerprint(self.filename)
+
+        conn = sqlite3.connect(str(self.filename))
+        with conn:
+            conn.execute("UPDATE points SET value = 1 WHERE fid = 7")
+        conn.close()
+
+        new_fingerprint = get_fingerprint(self.filename)
+
+        self.assertEqual(fingerprint.keys(), new_fingerprint.keys())
+        self.assertEqual(
+            [
+                table
+                for table in fingerprint
+                if fingerprint[table] != new_fingerprint[table]
+            ],
+            ["points"],
+        )
+
+    def test_changed_schema(self):
+        fingerprint = get_fingerprint(self.filename)
+
+        conn = sqlite3.connect(str(self.filename))
+        conn.execute("ALTER TABLE points ADD COLUMN comment TEXT")
+        conn.close()
+
+        self.assertNotEqual(
+            get_fingerprint(self.filename)["points"], fingerprint["points"]
+        )
+
+    def test_manifest_synchronized(self):
+        manifest = SyncManifest(self.tmpdir.name)
+        sha256 = get_file_sha256(self.filename)
+        manifest.set(
+            "data.gpkg",
+            sha256,
+            "cloud",
+            gpkg_fingerprint=get_fingerprint(self.filename),
+        )
+
+        self.rewrite_geopackage()
+        new_sha256 = get_file_sha256(self.filename)
+
+        self.assertTrue(
+            manifest.is_synchronized("data.gpkg", new_sha256, "cloud", self.filename)
+        )
+        # the new bytes are recorded, so the fingerprint is not computed again
+        self.assertEqual(manifest.get("data.gpkg")["local_sha256"], new_sha256)
+        self.assertFalse(
+            manifest.is_synchronized("data.gpkg", new_sha256, "other", self.filename)
+        )
+
+        conn = sqlite3.connect(str(self.filename))
+        with conn:
+            conn.execute("DELETE FROM points WHERE fid = 5")
+        conn.close()
+
+        self.assertFalse(
+            manifest.is_synchronized(
+                "data.gpkg", get_file_sha256(self.filename), "cloud", self.filename
+            )
+        )
+
+    def test_manifest_fingerprint_cached(self):
+        manifest = SyncManifest(self.tmpdir.name)
+        manifest.set(
+            "data.gpkg",
+            get_file_sha256(self.filename),
+            "cloud",
+            gpkg_fingerprint=get_fingerprint(self.filename),
+        )
+
+        conn = sqlite3.connect(str(self.filename))
+        with conn:
+            conn.execute("DELETE FROM points WHERE fid = 5")
+        conn.close()
+        sha256 = get_file_sha256(self.filename)
+
+        self.assertFalse(
+            manifest.is_synchronized("data.gpkg", sha256, "cloud", self.filename)
+        )
+
+        manifest.save()
+        manifest = SyncManifest(self.tmpdir.name)
+        self.filename.unlink()
+
+        # the fingerprint of the same bytes is not computed again, even once reloaded
+        self.assertFalse(
+            manifest.is_synchronized("data.gpkg", sha256, "cloud", self.filename)
+        )
+        self.assertEqual(
+            manifest.get_fingerprint(
+                "data.gpkg", "gpkg_fingerprint", self.filename, sha256
+            ),
+            manifest.get("data.gpkg")["fingerprint_cache"]["value"],
+        )
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from qgis.testing import start_app, unittest
+
+from qfieldsync.utils.image_recompression import (
+    EXIF_PROCESSING_SOFTWARE_TAG,
+    PROCESSING_SOFTWARE,
+    is_recompression_supported,
+    recompress_image,
+    recompress_images,
+)
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+start_app()
+
+EXIF_ORIENTATION_TAG = 0x0112
+EXIF_GPS_IFD = 0x8825
+EXIF_GPS_LATITUDE_REF_TAG = 1
+
+
+def create_photo(filename, width, height, quality=95):
+    """Creates a noisy JPEG photo, rotated and geotagged in its EXIF metadata."""
+    image = Image.effect_noise((width, height), 64).convert("RGB")
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION_TAG] = 6
+    exif.get_ifd(EXIF_GPS_IFD)[EXIF_GPS_LATITUDE_REF_TAG] = "N"
+    image.save(filename, "JPEG", quality=quality, exif=exif.tobytes())
+
+
+@unittest.skipUnless(is_recompression_supported(), "Pillow is not installed")
+class ImageRecompressionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_downsized_with_metadata(self):
+        filename = Path(self.tmpdir.name, "photo.jpg")
+        create_photo(filename, 3000, 2000)
+        size = filename.stat().st_size
+
+        self.assertTrue(recompress_image(filename, 1024, 80))
+        self.assertLess(filename.stat().st_size, size)
+
+        with Image.open(filename) as image:
+            exif = image.getexif()
+
+            self.assertEqual(image.size, (1024, 683))
+            self.assertEqual(exif[EXIF_ORIENTATION_TAG], 6)
+            self.assertEqual(exif.get_ifd(EXIF_GPS_IFD)[EXIF_GPS_LATITUDE_REF_TAG], "N")
+            self.assertEqual(exif[EXIF_PROCESSING_SOFTWARE_TAG], PROCESSING_SOFTWARE)
+
+        self.assertEqual(list(Path(self.tmpdir.name).iterdir()), [filename])
+
+    def test_recompressed_once(self):
+        filename = Path(self.tmpdir.name, "photo.jpg")
+        create_photo(filename, 3000, 2000)
+
+        self.assertTrue(recompress_image(filename, 2048, 90))
+        content = filename.read_bytes()
+
+        self.assertFalse(recompress_image(filename, 1024, 50))
+        self.assertEqual(filename.read_bytes(), content)
+
+    def test_kept_if_not_smaller(self):
+        filename = Path(self.tmpdir.name, "photo.jpg")
+        create_photo(filename, 320, 240, quality=20)
+        content = filename.read_bytes()
+
+        self.assertFalse(recompress_image(filename, 2048, 100))
+        self.assertEqual(filename.read_bytes(), content)
+
+    def test_not_an_image_kept(self):
+        filename = Path(self.tmpdir.name, "photo.jpg")
+        filename.write_bytes(b"not a photo")
+
+        self.assertFalse(recompress_image(filename))
+        self.assertEqual(filename.read_bytes(), b"not a photo")
+
+    def test_oversized_image_kept(self):
+        filename = Path(self.tmpdir.name, "photo.jpg")
+        create_photo(filename, 400, 300)
+        content = filename.read_bytes()
+
+        # Pillow raises a `DecompressionBombError` above twice the maximum number of pixels
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 50000):
+            self.assertFalse(recompress_image(filename, 200, 80))
+
+        self.assertEqual(filename.read_bytes(), content)
+        self.assertEqual(list(Path(self.tmpdir.name).iterdir()), [filename])
+
+    def test_parallel_recompression(self):
+        filenames = [Path(self.tmpdir.name, f"{i}.jpg") for i in range(4)]
+        for filename in filenames:
+            create_photo(filename, 2400, 1800)
+
+        self.assertEqual(
+            recompress_images(filenames, 1200, 80, max_workers=2), [True] * 4
+        )
+
+        for filename in filenames:
+            with Image.open(filename) as image:
+                self.assertEqual(image.size, (1200, 900))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import json
+
+from qgis.testing import unittest
+
+from qfieldsync.utils.json_stream import JsonArrayStreamParser, JsonStreamError
+
+ELEMENTS = [
+    {"name": 'DCIM/a"b]}{[\\.jpg', "versions": [{"size": 1}, {"size": 2}]},
+    "s]\\",
+    12345,
+    -2.5e3,
+    True,
+    None,
+    [],
+    {},
+    [[1]],
+    "é",
+]
+
+
+class JsonArrayStreamParserTest(unittest.TestCase):
+    def parse_in_chunks(self, data: bytes, chunk_size: int):
+        parser = JsonArrayStreamParser()
+        elements = []
+
+        for idx in range(0, len(data), chunk_size):
+            elements += parser.feed(data[idx : idx + chunk_size])
+
+        parser.close()
+
+        return elements
+
+    def test_chunks(self):
+        for data in (
+            json.dumps(ELEMENTS, indent=2).encode(),
+            json.dumps(ELEMENTS, separators=(",", ":"), ensure_ascii=False).encode(),
+        ):
+            for chunk_size in (1, 2, 3, 7, len(data)):
+                self.assertEqual(self.parse_in_chunks(data, chunk_size), ELEMENTS)
+
+    def test_element_spanning_many_chunks(self):
+        elements = [
+            {"name": "a" * 100_000, "versions": [{"size": i} for i in range(1000)]}
+        ]
+        data = json.dumps(elements).encode()
+
+        self.assertEqual(self.parse_in_chunks(data, 512), elements)
+
+    def test_empty(self):
+        self.assertEqual(self.parse_in_chunks(b" [ ] \n", 1), [])
+
+    def test_incomplete(self):
+        with self.assertRaises(JsonStreamError):
+            self.parse_in_chunks(b'[{"name": "a"}', 3)
+
+    def test_invalid(self):
+        for data in (b'{"name": "a"}', b'[{"name": "a"} {"name": "b"}]', b"[1] 2"):
+            with self.assertRaises(JsonStreamError):
+                self.parse_in_chunks(data, 4)
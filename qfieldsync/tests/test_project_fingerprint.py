@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import tempfile
+import zipfile
+from pathlib import Path
+
+from qgis.testing import unittest
+
+from qfieldsync.core.sync_manifest import SyncManifest
+from qfieldsync.utils.file_utils import get_file_sha256
+from qfieldsync.utils.project_fingerprint import (
+    ProjectFingerprintError,
+    get_project_fingerprint,
+)
+
+PROJECT = """<!DOCTYPE qgis PUBLIC 'http://mrcc.com/qgis.dtd' 'SYSTEM'>
+<qgis projectname="" version="3.34.0-Prizren" saveDateTime="{date}" saveUser="{user}">
+  <homePath path=""/>
+  <title>{title}</title>
+  <projectlayers>
+    <maplayer type="vector" geometry="Point" autoRefreshTime="0">
+      <id>points_1</id>
+      <datasource>./data.gpkg|layername=points</datasource>
+    </maplayer>
+  </projectlayers>
+</qgis>
+"""
+
+
+class ProjectFingerprintTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_project(self, name, content):
+        filename = Path(self.tmpdir.name, name)
+        filename.write_text(content)
+
+        return filename
+
+    def test_saved_again(self):
+        filename = self.write_project(
+            "a.qgs",
+            PROJECT.format(date="2026-10-18T10:00:00", user="alice", title="Survey"),
+        )
+        other_filename = self.write_project(
+            "b.qgs",
+            PROJECT.format(date="2026-10-19T12:00:00", user="bob", title="Survey")
+            .replace('type="vector" geometry="Point"', 'geometry="Point" type="vector"')
+            .replace("  ", "    "),
+        )
+
+        self.assertEqual(
+            get_project_fingerprint(filename), get_project_fingerprint(other_filename)
+        )
+
+    def test_changed(self):
+        filename = self.write_project(
+            "a.qgs",
+            PROJECT.format(date="2026-10-18T10:00:00", user="alice", title="Survey"),
+        )
+        other_filename = self.write_project(
+            "b.qgs",
+            PROJECT.format(date="2026-10-18T10:00:00", user="alice", title="Survey 2"),
+        )
+
+        self.assertNotEqual(
+            get_project_fingerprint(filename), get_project_fingerprint(other_filename)
+        )
+
+    def test_qgz(self):
+        fingerprints = []
+
+        for idx, (date, date_time) in enumerate(
+            (
+                ("2026-10-18T10:00:00", (2026, 10, 18, 10, 0, 0)),
+                ("2026-10-19T12:00:00", (2026, 10, 19, 12, 0, 0)),
+            )
+        ):
+            filename = Path(self.tmpdir.name, f"project{idx}.qgz")
+            members = [
+                ("project.qgs", PROJECT.format(date=date, user="", title="Survey")),
+                ("project.qgd", "auxiliary storage"),
+            ]
+
+            # the archive order and dates do not matter
+            if idx:
+                members.reverse()
+
+            with zipfile.ZipFile(filename, "w") as archive:
+                for name, content in members:
+                    archive.writestr(zipfile.ZipInfo(name, date_time), content)
+
+            fingerprints.append(get_project_fingerprint(filename))
+
+        self.assertEqual(fingerprints[0], fingerprints[1])
+
+    def test_invalid(self):
+        filename = self.write_project("a.qgs", "<qgis>")
+
+        with self.assertRaises(ProjectFingerprintError):
+            get_project_fingerprint(filename)
+
+        with self.assertRaises(ProjectFingerprintError):
+            get_project_fingerprint(self.write_project("a.qgz", "<qgis/>"))
+
+    def test_manifest_synchronized(self):
+        filename = self.write_project(
+            "project.qgs",
+            PROJECT.format(date="2026-10-18T10:00:00", user="alice", title="Survey"),
+        )
+        sha256 = get_file_sha256(filename)
+        manifest = SyncManifest(self.tmpdir.name)
+        manifest.set(
+            "project.qgs",
+            sha256,
+            sha256,
+            project_fingerprint=get_project_fingerprint(filename),
+        )
+
+        self.write_project(
+            "project.qgs",
+            PROJECT.format(date="2026-10-19T12:00:00", user="alice", title="Survey"),
+        )
+
+        self.assertTrue(
+            manifest.is_synchronized(
+                "project.qgs", get_file_sha256(filename), sha256, filename
+            )
+        )
+
+        self.write_project(
+            "project.qgs",
+            PROJECT.format(date="2026-10-19T12:00:00", user="alice", title="Other"),
+        )
+
+        self.assertFalse(
+            manifest.is_synchronized(
+                "project.qgs", get_file_sha256(filename), sha256, filename
+            )
+        )
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+import io
+import tarfile
+import tempfile
+from pathlib import Path
+
+from qgis.testing import unittest
+
+from qfieldsync.utils.tar_stream import TarStreamError, TarStreamExtractor
+
+FILES = {
+    "project.qgs": b"<qgis/>",
+    "DCIM/é.jpg": bytes(range(256)) * 9,
+    "empty.txt": b"",
+    "/".join(["long"] * 40) + "/name.txt": b"long name",
+}
+
+
+def create_archive(tar_format: int, files=FILES) -> bytes:
+    archive = io.BytesIO()
+
+    with tarfile.open(fileobj=archive, mode="w", format=tar_format) as tar:
+        directory = tarfile.TarInfo("DCIM")
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+
+    return archive.getvalue()
+
+
+class TarStreamExtractorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def extract_in_chunks(self, data: bytes, chunk_size: int, get_destination=None):
+        extractor = TarStreamExtractor(
+            get_destination or (lambda name: Path(self.tmpdir.name, name))
+        )
+        files = []
+
+        for idx in range(0, len(data), chunk_size):
+            files += extractor.feed(data[idx : idx + chunk_size])
+
+        extractor.close()
+
+        return files
+
+    def test_chunks(self):
+        for tar_format in (tarfile.GNU_FORMAT, tarfile.PAX_FORMAT):
+            data = create_archive(tar_format)
+
+            for chunk_size in (1, 7, 511, 512, 513, len(data)):
+                files = self.extract_in_chunks(data, chunk_size)
+
+                self.assertEqual(
+                    files,
+                    [
+                        (name, hashlib.sha256(content).hexdigest())
+                        for name, content in FILES.items()
+                    ],
+                )
+
+                for name, content in FILES.items():
+                    self.assertEqual(Path(self.tmpdir.name, name).read_bytes(), content)
+
+    def test_skipped_files(self):
+        files = self.extract_in_chunks(
+            create_archive(tarfile.PAX_FORMAT),
+            100,
+            lambda name: (
+                Path(self.tmpdir.name, name) if name == "empty.txt" else None
+            ),
+        )
+
+        self.assertEqual(files, [("empty.txt", hashlib.sha256(b"").hexdigest())])
+        self.assertFalse(Path(self.tmpdir.name, "project.qgs").exists())
+
+    def test_files_outside_archive_skipped(self):
+        files = self.extract_in_chunks(
+            create_archive(tarfile.PAX_FORMAT, {"../evil.txt": b"x", "/abs": b"x"}),
+            100,
+        )
+
+        self.assertEqual(files, [])
+
+    def test_incomplete(self):
+        data = create_archive(tarfile.PAX_FORMAT)
+
+        with self.assertRaises(TarStreamError):
+            self.extract_in_chunks(data[:2000], 100)
+
+        # the partially written file is removed
+        self.assertFalse(Path(self.tmpdir.name, "DCIM/é.jpg").exists())
+
+    def test_invalid(self):
+        data = bytearray(create_archive(tarfile.PAX_FORMAT))
+        data[0] ^= 1
+
+        with self.assertRaises(TarStreamError):
+            self.extract_in_chunks(bytes(data), 100)
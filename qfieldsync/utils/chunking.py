@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Tuple, Union
+
+DEFAULT_MIN_CHUNK_SIZE = 16 * 1024
+DEFAULT_AVG_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_CHUNK_SIZE = 256 * 1024
+
+# the rolling hash only depends on the last 32 bytes, see `_find_cut`
+WINDOW_SIZE = 32
+READ_SIZE = 4 * 1024 * 1024
+
+# the gear table is part of the protocol, the client and the server must cut the same chunks
+GEAR = tuple(
+    int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], "big") for i in range(256)
+)
+
+
+class Chunk(NamedTuple):
+    offset: int
+    size: int
+    sha256: str
+
+
+class ChunkedFile(NamedTuple):
+    size: int
+    sha256: str
+    chunks: List[Chunk]
+
+    def to_json(self) -> Dict:
+        """Returns the signature of the file, as exchanged with the server."""
+        return {
+            "size": self.size,
+            "sha256": self.sha256,
+            "chunks": [{"size": c.size, "sha256": c.sha256} for c in self.chunks],
+        }
+
+    @staticmethod
+    def from_json(payload: Dict) -> "ChunkedFile":
+        chunks = []
+        offset = 0
+
+        for chunk in payload["chunks"]:
+            chunks.append(Chunk(offset, chunk["size"], chunk["sha256"]))
+            offset += chunk["size"]
+
+        if offset != payload["size"]:
+            raise ValueError("The chunks do not cover the whole file")
+
+        return ChunkedFile(payload["size"], payload["sha256"], chunks)
+
+
+def chunk_file(
+    filename: Union[str, Path],
+    min_size: int = DEFAULT_MIN_CHUNK_SIZE,
+    avg_size: int = DEFAULT_AVG_CHUNK_SIZE,
+    max_size: int = DEFAULT_MAX_CHUNK_SIZE,
+) -> ChunkedFile:
+    """Splits the file into content-defined chunks, along with the SHA256 of the whole file."""
+    with open(filename, "rb") as file:
+        return chunk_stream(file, min_size, avg_size, max_size)
+
+
+def chunk_stream(
+    file: BinaryIO,
+    min_size: int = DEFAULT_MIN_CHUNK_SIZE,
+    avg_size: int = DEFAULT_AVG_CHUNK_SIZE,
+    max_size: int = DEFAULT_MAX_CHUNK_SIZE,
+) -> ChunkedFile:
+    """Splits the data of the stream into content-defined chunks.
+
+    The chunk boundaries are where the rolling hash of the last bytes matches a mask,
+    so they only depend on the content around them. Inserting or removing bytes only
+    changes the chunks around the edit, the other chunks are found again, unlike
+    with fixed size blocks.
+    """
+    assert WINDOW_SIZE <= min_size <= avg_size <= max_size
+
+    file_hash = hashlib.sha256()
+    chunks = [
+        Chunk(offset, size, sha256)
+        for offset, size, sha256 in _iter_chunks(
+            file, file_hash, min_size, avg_size, max_size
+        )
+    ]
+    size = chunks[-1].offset + chunks[-1].size if chunks else 0
+
+    return ChunkedFile(size, file_hash.hexdigest(), chunks)
+
+
+def plan_ranges(chunks: List[Chunk], max_gap: int) -> List[Tuple[int, int]]:
+    """Merges the chunks into as few byte ranges as possible, as (offset, size) tuples.
+
+    The chunks must be sorted by offset. Chunks separated by up to `max_gap` bytes are
+    merged into the same range, so fewer requests are needed at the cost of a few
+    bytes transferred again.
+    """
+    ranges: List[Tuple[int, int]] = []
+
+    for chunk in chunks:
+        if ranges and chunk.offset - sum(ranges[-1]) <= max_gap:
+            offset, _size = ranges[-1]
+            ranges[-1] = (offset, chunk.offset + chunk.size - offset)
+        else:
+            ranges.append((chunk.offset, chunk.size))
+
+    return ranges
+
+
+def _iter_chunks(
+    file: BinaryIO,
+    file_hash: "hashlib._Hash",
+    min_size: int,
+    avg_size: int,
+    max_size: int,
+) -> Iterator[Tuple[int, int, str]]:
+    bits = avg_size.bit_length() - 1
+    # the highest bits of the hash depend on the most bytes of the window
+    mask = ((1 << bits) - 1) << (32 - bits)
+    buffer = b""
+    buffer_offset = 0
+    is_eof = False
+
+    while not is_eof:
+        data = file.read(READ_SIZE)
+        is_eof = not data
+        file_hash.update(data)
+        buffer = buffer + data
+        pos = 0
+
+        # a chunk is cut once enough data is buffered for its largest size
+        while len(buffer) - pos >= (1 if is_eof else max_size):
+            size = _find_cut(
+                buffer, pos, min(len(buffer) - pos, max_size), min_size, mask
+            )
+            yield (
+                buffer_offset + pos,
+                size,
+                hashlib.sha256(buffer[pos : pos + size]).hexdigest(),
+            )
+            pos += size
+
+        buffer = buffer[pos:]
+        buffer_offset += pos
+
+
+def _find_cut(data: bytes, start: int, length: int, min_size: int, mask: int) -> int:
+    if length <= min_size:
+        return length
+
+    gear = GEAR
+    hash_value = 0
+
+    # the hash at a position only depends on the window before it, so it is the same
+    # whatever the start of the chunk, which makes the chunks resynchronize after an edit
+    for byte in data[start + min_size - WINDOW_SIZE : start + min_size - 1]:
+        hash_value = ((hash_value << 1) + gear[byte]) & 0xFFFFFFFF
+
+    end = start + length
+    idx = start + min_size - 1
+
+    for byte in data[idx:end]:
+        hash_value = ((hash_value << 1) + gear[byte]) & 0xFFFFFFFF
+        idx += 1
+
+        if not hash_value & mask:
+            return idx - start
+
+    return length
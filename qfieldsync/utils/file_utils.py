@@ -18,6 +18,7 @@
  *                                                                         *
  ***************************************************************************/
 """
+import hashlib
 from enum import Enum
 from pathlib import Path
 from typing import List, TypedDict, Union
@@ -61,3 +62,14 @@ def path_to_dict(path: PathLike, dirs_only: bool = False) -> DirectoryTreeDict:
     node["content"].sort(key=lambda node: node["path"].name)
 
     return node
+
+
+def get_file_sha256(path: PathLike) -> str:
+    """Returns the SHA256 of the file, read in blocks so large files are not loaded in memory."""
+    file_hash = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for data in iter(lambda: file.read(1024 * 1024), b""):
+            file_hash.update(data)
+
+    return file_hash.hexdigest()
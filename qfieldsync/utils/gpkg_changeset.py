@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import base64
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+CHANGESET_FORMAT = "qfieldsync-gpkg-changeset"
+CHANGESET_VERSION = 1
+
+# maintained by GDAL and its triggers, e.g. rewritten when the GeoPackage is opened
+FINGERPRINT_IGNORED_TABLES = ("gpkg_ogr_contents",)
+
+
+class ChangesetError(ValueError):
+    pass
+
+
+def create_changeset(
+    baseline_filename: Union[str, Path], filename: Union[str, Path]
+) -> Dict[str, Any]:
+    """Returns the rows inserted, updated and deleted in each table since the baseline copy of the GeoPackage.
+
+    The rows are matched by rowid. Only the data is compared, so both files must have
+    the same schema. The shadow tables of the virtual tables, e.g. the spatial indexes,
+    are left out, as the triggers of the GeoPackage maintain them when the changeset
+    is applied.
+    """
+    try:
+        conn = _connect(filename, read_only=True)
+    except sqlite3.Error as err:
+        raise ChangesetError(str(err)) from err
+
+    try:
+        conn.execute("ATTACH DATABASE ? AS base", (_read_only_uri(baseline_filename),))
+
+        schema = _get_schema(conn, "main")
+        if schema != _get_schema(conn, "base"):
+            raise ChangesetError("The schema has changed since the baseline")
+
+        tables = []
+
+        for table in _get_changeset_tables(schema):
+            columns = _get_columns(conn, "main", table)
+            columns_sql = ", ".join(["rowid"] + [_quote(c) for c in columns])
+            table_sql = _quote(table)
+
+            inserted_rows = conn.execute(
+                f"SELECT {columns_sql} FROM main.{table_sql} "
+                f"WHERE rowid NOT IN (SELECT rowid FROM base.{table_sql})"
+            ).fetchall()
+            updated_rows = conn.execute(
+                f"SELECT {columns_sql} FROM main.{table_sql} "
+                f"WHERE rowid IN (SELECT rowid FROM base.{table_sql}) "
+                f"EXCEPT SELECT {columns_sql} FROM base.{table_sql}"
+            ).fetchall()
+            deleted_rowids = conn.execute(
+                f"SELECT rowid FROM base.{table_sql} "
+                f"WHERE rowid NOT IN (SELECT rowid FROM main.{table_sql})"
+            ).fetchall()
+
+            if not inserted_rows and not updated_rows and not deleted_rowids:
+                continue
+
+            tables.append(
+                {
+                    "name": table,
+                    "columns": columns,
+                    "insert": [_encode_row(row) for row in inserted_rows],
+                    "update": [_encode_row(row) for row in updated_rows],
+                    "delete": [row[0] for row in deleted_rowids],
+                }
+            )
+    except sqlite3.Error as err:
+        raise ChangesetError(str(err)) from err
+    finally:
+        conn.close()
+
+    return {
+        "format": CHANGESET_FORMAT,
+        "version": CHANGESET_VERSION,
+        "tables": tables,
+    }
+
+
+def apply_changeset(filename: Union[str, Path], changeset: Dict[str, Any]) -> None:
+    """Applies the changeset to the GeoPackage, within a single transaction.
+
+    The triggers of the GeoPackage run as the rows are changed, so the functions they
+    call, e.g. `ST_IsEmpty` for the spatial indexes, must be available.
+    """
+    if (
+        changeset.get("format") != CHANGESET_FORMAT
+        or changeset.get("version") != CHANGESET_VERSION
+    ):
+        raise ChangesetError("Unsupported changeset format")
+
+    try:
+        conn = _connect(filename, read_only=False)
+    except sqlite3.Error as err:
+        raise ChangesetError(str(err)) from err
+
+    try:
+        with conn:
+            schema = _get_schema(conn, "main")
+            changeset_tables = _get_changeset_tables(schema)
+
+            for table in changeset["tables"]:
+                if table["name"] not in changeset_tables:
+                    raise ChangesetError(f'Unknown table "{table["name"]}"')
+
+                table_sql = _quote(table["name"])
+                columns = table["columns"]
+
+                if columns != _get_columns(conn, "main", table["name"]):
+                    raise ChangesetError(f'Columns mismatch in "{table["name"]}"')
+
+                # deleted first, so the inserted rows might reuse their unique values
+                conn.executemany(
+                    f"DELETE FROM {table_sql} WHERE rowid = ?",
+                    [(rowid,) for rowid in table["delete"]],
+                )
+
+                if columns:
+                    set_sql = ", ".join(f"{_quote(c)} = ?" for c in columns)
+                    conn.executemany(
+                        f"UPDATE {table_sql} SET {set_sql} WHERE rowid = ?",
+                        [
+                            (*row[1:], row[0])
+                            for row in map(_decode_row, table["update"])
+                        ],
+                    )
+
+                columns_sql = ", ".join(["rowid"] + [_quote(c) for c in columns])
+                placeholders_sql = ", ".join("?" * (len(columns) + 1))
+                conn.executemany(
+                    f"INSERT INTO {table_sql} ({columns_sql}) VALUES ({placeholders_sql})",
+                    map(_decode_row, table["insert"]),
+                )
+    except (KeyError, TypeError, sqlite3.Error) as err:
+        raise ChangesetError(str(err)) from err
+    finally:
+        conn.close()
+
+
+def get_fingerprint(filename: Union[str, Path]) -> Dict[str, str]:
+    """Returns the SHA256 of the schema and the rows of each table of the GeoPackage.
+
+    Unlike the SHA256 of the file, it does not change when the file is rewritten with
+    the same data, e.g. with another page layout, other free pages, the feature counts
+    of `gpkg_ogr_contents` updated or the spatial indexes rebuilt.
+    """
+    try:
+        conn = _connect(filename, read_only=True)
+    except sqlite3.Error as err:
+        raise ChangesetError(str(err)) from err
+
+    fingerprint = {}
+
+    try:
+        schema = _get_schema(conn, "main")
+
+        for table in _get_changeset_tables(schema):
+            if table in FINGERPRINT_IGNORED_TABLES or table.startswith("sqlite_"):
+                continue
+
+            table_hash = hashlib.sha256()
+
+            # the table along with its indexes and triggers
+            for row in schema:
+                if row[2] == table:
+                    table_hash.update(_encode_value(list(row)))
+
+            columns_sql = ", ".join(
+                ["rowid"] + [_quote(c) for c in _get_columns(conn, "main", table)]
+            )
+
+            for row in conn.execute(
+                f"SELECT {columns_sql} FROM {_quote(table)} ORDER BY rowid"
+            ):
+                table_hash.update(_encode_value(list(row)))
+
+            fingerprint[table] = table_hash.hexdigest()
+    except sqlite3.Error as err:
+        raise ChangesetError(str(err)) from err
+    finally:
+        conn.close()
+
+    return fingerprint
+
+
+def _connect(filename: Union[str, Path], read_only: bool) -> sqlite3.Connection:
+    if read_only:
+        return sqlite3.connect(_read_only_uri(filename), uri=True)
+
+    return sqlite3.connect(str(filename))
+
+
+def _read_only_uri(filename: Union[str, Path]) -> str:
+    return Path(filename).absolute().as_uri() + "?mode=ro"
+
+
+def _get_schema(conn: sqlite3.Connection, schema_name: str) -> List[Tuple[str, ...]]:
+    return conn.execute(
+        f"SELECT type, name, tbl_name, sql FROM {schema_name}.sqlite_master "
+        "WHERE name NOT LIKE 'sqlite_autoindex_%' ORDER BY type, name"
+    ).fetchall()
+
+
+def _get_changeset_tables(schema: List[Tuple[str, ...]]) -> List[str]:
+    """Returns the names of the tables whose rows are part of the changesets.
+
+    The metadata tables, e.g. `gpkg_contents` or `sqlite_sequence`, are the last, so
+    their values are set once the triggers of the data tables have run.
+    """
+    virtual_tables = [
+        name
+        for type_, name, _tbl_name, sql in schema
+        if type_ == "table" and (sql or "").upper().startswith("CREATE VIRTUAL TABLE")
+    ]
+    tables = []
+
+    for type_, name, _tbl_name, sql in schema:
+        if type_ != "table" or name in virtual_tables:
+            continue
+
+        if any(
+            name.startswith(virtual_table + "_") for virtual_table in virtual_tables
+        ):
+            continue
+
+        if "WITHOUT ROWID" in (sql or "").upper():
+            raise ChangesetError(f'Table "{name}" has no rowid')
+
+        tables.append(name)
+
+    return sorted(tables, key=lambda name: name.startswith(("gpkg_", "sqlite_")))
+
+
+def _get_columns(conn: sqlite3.Connection, schema_name: str, table: str) -> List[str]:
+    return [
+        row[1]
+        for row in conn.execute(f"PRAGMA {schema_name}.table_info({_quote(table)})")
+    ]
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _encode_row(row: Tuple[Any, ...]) -> List[Any]:
+    # the geometries and other binary values are not JSON serializable
+    return [
+        {"blob": base64.b64encode(value).decode("ascii")}
+        if isinstance(value, bytes)
+        else value
+        for value in row
+    ]
+
+
+def _encode_value(value: Any) -> bytes:
+    """Encodes the value unambiguously, with its type and length."""
+    if value is None:
+        return b"n"
+    elif isinstance(value, int):
+        return b"i%d;" % value
+    elif isinstance(value, float):
+        return b"f" + value.hex().encode("ascii") + b";"
+    elif isinstance(value, str):
+        value = value.encode("utf-8")
+        return b"s%d:" % len(value) + value
+    elif isinstance(value, bytes):
+        return b"b%d:" % len(value) + value
+    elif isinstance(value, list):
+        return b"l%d:" % len(value) + b"".join(map(_encode_value, value))
+
+    raise TypeError(f"Unsupported value {value!r}")
+
+
+def _decode_row(row: List[Any]) -> Tuple[Any, ...]:
+    return tuple(
+        base64.b64decode(value["blob"]) if isinstance(value, dict) else value
+        for value in row
+    )
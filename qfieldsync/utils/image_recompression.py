@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    # HEIC images are only supported with the plugin of Pillow
+    from pillow_heif import register_heif_opener
+
+    register_heif_opener()
+except ImportError:
+    pass
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".heic", ".heif")
+
+DEFAULT_MAX_SIZE = 2048
+DEFAULT_QUALITY = 85
+
+# the EXIF tag marking the images already recompressed, so they are not recompressed again
+EXIF_PROCESSING_SOFTWARE_TAG = 0x000B
+PROCESSING_SOFTWARE = "QFieldSync"
+
+
+def is_recompression_supported() -> bool:
+    return Image is not None
+
+
+def recompress_images(
+    filenames: List[Path],
+    max_size: int = DEFAULT_MAX_SIZE,
+    quality: int = DEFAULT_QUALITY,
+    max_workers: Optional[int] = None,
+) -> List[bool]:
+    """Recompresses the images in place, in parallel worker processes, returns whether each one has been replaced.
+
+    Threads are used instead if no Python interpreter is found to start the processes,
+    Pillow releases the GIL while decoding, resizing and encoding anyway.
+    """
+    if not is_recompression_supported() or not filenames:
+        return [False] * len(filenames)
+
+    jobs = [(str(filename), max_size, quality) for filename in filenames]
+    context = _get_process_context()
+
+    if context is not None:
+        try:
+            with ProcessPoolExecutor(max_workers, mp_context=context) as executor:
+                return _run(executor, jobs)
+        except (OSError, BrokenProcessPool):
+            pass
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        return _run(executor, jobs)
+
+
+def recompress_image(
+    filename: Path, max_size: int = DEFAULT_MAX_SIZE, quality: int = DEFAULT_QUALITY
+) -> bool:
+    """Downsizes the image to `max_size` pixels on its longest side and recompresses it in place.
+
+    The EXIF metadata is kept, including the orientation and the geotags, as the pixels
+    are only scaled. The image is kept as is if it has been recompressed already, if
+    its format cannot be written, if it cannot be read or if the new one is not smaller.
+    """
+    if not is_recompression_supported():
+        return False
+
+    temp_filename = filename.with_name(filename.name + ".recompressed")
+
+    try:
+        with Image.open(filename) as image:
+            image_format = image.format
+            exif = image.getexif()
+
+            if exif.get(EXIF_PROCESSING_SOFTWARE_TAG) == PROCESSING_SOFTWARE:
+                return False
+
+            exif[EXIF_PROCESSING_SOFTWARE_TAG] = PROCESSING_SOFTWARE
+            icc_profile = image.info.get("icc_profile")
+
+            image.thumbnail((max_size, max_size), Image.LANCZOS)
+
+            save_kwargs = {"quality": quality, "exif": exif.tobytes()}
+            if icc_profile:
+                save_kwargs["icc_profile"] = icc_profile
+
+            image.save(temp_filename, image_format, **save_kwargs)
+
+        if temp_filename.stat().st_size >= filename.stat().st_size:
+            return False
+
+        os.replace(temp_filename, filename)
+
+        return True
+    except Exception:
+        # Pillow raises various errors on corrupt or oversized images, e.g. `DecompressionBombError`
+        return False
+    finally:
+        temp_filename.unlink(missing_ok=True)
+
+
+def _recompress_job(job: Tuple[str, int, int]) -> bool:
+    filename, max_size, quality = job
+
+    return recompress_image(Path(filename), max_size, quality)
+
+
+def _run(executor: Executor, jobs: List[Tuple[str, int, int]]) -> List[bool]:
+    return list(executor.map(_recompress_job, jobs))
+
+
+def _get_process_context() -> Optional[BaseContext]:
+    """Returns the context to start the worker processes, `None` without a Python interpreter.
+
+    The processes are spawned rather than forked, forking the threads of Qt is unsafe.
+    Within QGIS, `sys.executable` might be QGIS itself rather than Python.
+    """
+    context = get_context("spawn")
+    executable = Path(sys.executable)
+
+    if executable.name.lower().startswith("python"):
+        return context
+
+    for name in ("python.exe", "python3.exe", "bin/python3"):
+        executable = Path(sys.exec_prefix, name)
+
+        if executable.is_file():
+            context.set_executable(str(executable))
+            return context
+
+    return None
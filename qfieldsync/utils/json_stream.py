@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import codecs
+import json
+import re
+from typing import Any, List, Optional
+
+WHITESPACE_RE = re.compile(r"[ \t\r\n]*")
+# the characters changing the nesting of an element, outside of its strings
+STRUCTURE_RE = re.compile(r'["{}\[\]]')
+# the characters ending a string or escaping the next one
+STRING_SPECIAL_RE = re.compile(r'["\\]')
+# the characters ending a number, `true`, `false` or `null`
+SCALAR_END_RE = re.compile(r"[,\] \t\r\n]")
+
+
+class JsonStreamError(ValueError):
+    pass
+
+
+class JsonArrayStreamParser:
+    """Incremental parser of a JSON array, returning its elements as soon as they are complete.
+
+    The data is fed in chunks as it arrives, only the text of the elements not received
+    completely yet is kept in memory.
+    """
+
+    def __init__(self) -> None:
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._is_started = False
+        self._is_finished = False
+        self._has_elements = False
+        # whether the next non-whitespace character must be a "," or the closing "]"
+        self._expects_separator = False
+        # the scan state of the element not received completely yet, so its received text
+        # is not scanned again with the next chunk, `_scan_pos` is `None` between elements
+        self._scan_pos: Optional[int] = None
+        self._depth = 0
+        self._is_in_string = False
+
+    @property
+    def is_finished(self) -> bool:
+        return self._is_finished
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Adds data to the parser and returns the elements completed with it."""
+        text = self._text_decoder.decode(data)
+
+        if self._is_finished:
+            if text.strip():
+                raise JsonStreamError("Unexpected data after the end of the array")
+
+            return []
+
+        self._buffer += text
+
+        elements = []
+        pos = WHITESPACE_RE.match(self._buffer).end()
+
+        if not self._is_started:
+            if pos == len(self._buffer):
+                self._buffer = ""
+                return elements
+
+            if self._buffer[pos] != "[":
+                raise JsonStreamError("Expected a JSON array")
+
+            self._is_started = True
+            pos = WHITESPACE_RE.match(self._buffer, pos + 1).end()
+
+        while pos < len(self._buffer):
+            char = self._buffer[pos]
+
+            if char == "]" and (self._expects_separator or not self._has_elements):
+                self._is_finished = True
+                pos += 1
+                break
+
+            if self._expects_separator:
+                if char != ",":
+                    raise JsonStreamError(f"Expected a separator, got {char!r} instead")
+
+                self._expects_separator = False
+                pos = WHITESPACE_RE.match(self._buffer, pos + 1).end()
+                continue
+
+            end = self._scan_element(pos)
+            if end is None:
+                # the element is not complete yet, resume its scan with the next chunk
+                self._scan_pos -= pos
+                break
+
+            try:
+                element, decoded_end = self._json_decoder.raw_decode(self._buffer, pos)
+            except ValueError as err:
+                raise JsonStreamError(f"Invalid JSON element: {err}") from err
+
+            if decoded_end != end:
+                raise JsonStreamError("Invalid JSON element")
+
+            elements.append(element)
+            self._has_elements = True
+            self._expects_separator = True
+            pos = WHITESPACE_RE.match(self._buffer, end).end()
+
+        self._buffer = self._buffer[pos:]
+
+        return elements
+
+    def _scan_element(self, start: int) -> Optional[int]:
+        """Returns the end of the element starting at `start`, `None` if it is not complete yet.
+
+        Only the boundaries of the element are searched, it is decoded once complete.
+        """
+        buffer = self._buffer
+
+        if self._scan_pos is None:
+            self._scan_pos = start
+            self._depth = 0
+            self._is_in_string = False
+
+        pos = self._scan_pos
+
+        if buffer[start] not in '"{[':
+            match = SCALAR_END_RE.search(buffer, pos)
+            if match is None:
+                self._scan_pos = len(buffer)
+                return None
+
+            self._scan_pos = None
+            return match.start()
+
+        while True:
+            if self._is_in_string:
+                match = STRING_SPECIAL_RE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+
+                if match.group() == "\\":
+                    # the escaped character is not received yet
+                    if match.end() == len(buffer):
+                        pos = match.start()
+                        break
+
+                    pos = match.end() + 1
+                    continue
+
+                self._is_in_string = False
+                pos = match.end()
+            else:
+                match = STRUCTURE_RE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+
+                pos = match.end()
+                char = match.group()
+
+                if char == '"':
+                    self._is_in_string = True
+                    continue
+
+                if char in "{[":
+                    self._depth += 1
+                    continue
+
+                self._depth -= 1
+
+            if self._depth == 0:
+                self._scan_pos = None
+                return pos
+
+        self._scan_pos = pos
+
+        return None
+
+    def close(self) -> None:
+        """Checks the whole array has been received."""
+        if not self._is_finished:
+            raise JsonStreamError("Incomplete JSON array")
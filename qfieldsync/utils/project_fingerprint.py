@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Tuple, Union
+from xml.etree import ElementTree
+
+# the attributes rewritten by QGIS on each save of the project, by element tag
+VOLATILE_ATTRIBUTES: Dict[str, Tuple[str, ...]] = {
+    "qgis": ("saveDateTime", "saveUser", "saveUserFull"),
+}
+
+
+class ProjectFingerprintError(ValueError):
+    pass
+
+
+def get_project_fingerprint(filename: Union[str, Path]) -> str:
+    """Returns a SHA256 of the QGIS project that only changes with the meaningful content of the project.
+
+    The XML is hashed as a canonical form, without the volatile attributes, with the
+    attributes sorted and the whitespace around the text stripped. The files of a
+    .qgz archive are hashed in name order, whatever their order and dates in the archive.
+    """
+    filename = Path(filename)
+    project_hash = hashlib.sha256()
+
+    try:
+        if filename.suffix.lower() == ".qgz":
+            with zipfile.ZipFile(filename) as archive:
+                for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                    if info.is_dir():
+                        continue
+
+                    _update(project_hash, info.filename)
+
+                    with archive.open(info) as file:
+                        if info.filename.lower().endswith(".qgs"):
+                            _update_xml(project_hash, file)
+                        else:
+                            _update_raw(project_hash, file)
+        else:
+            with open(filename, "rb") as file:
+                _update_xml(project_hash, file)
+    except (OSError, zipfile.BadZipFile, ElementTree.ParseError) as err:
+        raise ProjectFingerprintError(str(err)) from err
+
+    return project_hash.hexdigest()
+
+
+def _update(project_hash: "hashlib._Hash", *values: str) -> None:
+    # each value is prefixed by its length, so the values cannot run into each other
+    for value in values:
+        data = value.encode("utf-8")
+        project_hash.update(len(data).to_bytes(8, "big"))
+        project_hash.update(data)
+
+
+def _update_raw(project_hash: "hashlib._Hash", file: BinaryIO) -> None:
+    file_hash = hashlib.sha256()
+
+    for data in iter(lambda: file.read(1024 * 1024), b""):
+        file_hash.update(data)
+
+    _update(project_hash, file_hash.hexdigest())
+
+
+def _update_xml(project_hash: "hashlib._Hash", file: BinaryIO) -> None:
+    # streamed, so only the element being read is kept in memory
+    for event, element in ElementTree.iterparse(file, events=("start", "end")):
+        if event == "start":
+            volatile_attributes = VOLATILE_ATTRIBUTES.get(element.tag, ())
+            attributes = sorted(
+                (key, value)
+                for key, value in element.attrib.items()
+                if key not in volatile_attributes
+            )
+
+            _update(project_hash, "<", element.tag, str(len(attributes)))
+            for key, value in attributes:
+                _update(project_hash, key, value)
+        else:
+            # the text is only complete once the element ends, the tail is not parsed
+            # yet, the project files have no mixed content anyway
+            _update(project_hash, ">", (element.text or "").strip())
+            element.clear()
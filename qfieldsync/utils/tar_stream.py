@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+"""
+/***************************************************************************
+ QFieldSync
+                              -------------------
+        begin                : 2026
+        copyright            : (C) 2026 by OPENGIS.ch
+        email                : info@opengis.ch
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import hashlib
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+BLOCK_SIZE = 512
+REGULAR_TYPES = (b"0", b"\0", b"7")
+PAX_HEADER_TYPE = b"x"
+PAX_GLOBAL_HEADER_TYPE = b"g"
+GNU_LONG_NAME_TYPE = b"L"
+
+
+class TarStreamError(ValueError):
+    pass
+
+
+class TarStreamExtractor:
+    """Incremental extractor of a tar archive, writing the files as soon as their data arrives.
+
+    The data is fed in chunks as it arrives, only the incomplete header is kept in
+    memory. The destination of each file is given by `get_destination`, the files
+    without a destination are skipped. The SHA256 of each file is computed while
+    it is written.
+    """
+
+    def __init__(self, get_destination: Callable[[str], Optional[Path]]) -> None:
+        self._get_destination = get_destination
+        self._buffer = b""
+        self._is_finished = False
+        # the entry whose data is being received
+        self._entry_type = b""
+        self._entry_name = ""
+        self._entry_remaining = 0
+        self._entry_padding = 0
+        self._entry_data = b""
+        self._file: Optional[BinaryIO] = None
+        self._path: Optional[Path] = None
+        self._hash = hashlib.sha256()
+        # the name of the next entry, given by a pax or GNU long name header
+        self._next_name: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self._is_finished
+
+    def feed(self, data: bytes) -> List[Tuple[str, str]]:
+        """Adds data to the extractor and returns the name and SHA256 of the files completed with it."""
+        completed = []
+        view = memoryview(data)
+
+        while len(view) and not self._is_finished:
+            if self._entry_remaining or self._entry_padding:
+                view = self._consume_entry_data(view, completed)
+                continue
+
+            needed = BLOCK_SIZE - len(self._buffer)
+            self._buffer += view[:needed].tobytes()
+            view = view[needed:]
+
+            if len(self._buffer) < BLOCK_SIZE:
+                break
+
+            header = self._buffer
+            self._buffer = b""
+            self._start_entry(header, completed)
+
+        return completed
+
+    def close(self) -> None:
+        """Checks the whole archive has been received."""
+        if not self._is_finished:
+            self.abort()
+            raise TarStreamError("Incomplete tar archive")
+
+    def abort(self) -> None:
+        """Removes the file being written, if any."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+            assert self._path
+            self._path.unlink()
+
+    def _start_entry(self, header: bytes, completed: List[Tuple[str, str]]) -> None:
+        # the end of the archive is marked by zero blocks
+        if header == b"\0" * BLOCK_SIZE:
+            self._is_finished = True
+            return
+
+        checksum = _parse_number(header[148:156])
+        if checksum != sum(header[:148]) + 8 * ord(" ") + sum(header[156:]):
+            raise TarStreamError("Invalid tar header checksum")
+
+        size = _parse_number(header[124:136])
+        self._entry_type = header[156:157]
+        self._entry_remaining = size
+        self._entry_padding = -size % BLOCK_SIZE
+        self._entry_data = b""
+
+        name = _parse_string(header[0:100])
+        if header[257:262] == b"ustar":
+            prefix = _parse_string(header[345:500])
+            if prefix:
+                name = prefix + "/" + name
+
+        if self._next_name is not None and self._entry_type not in (
+            PAX_HEADER_TYPE,
+            PAX_GLOBAL_HEADER_TYPE,
+            GNU_LONG_NAME_TYPE,
+        ):
+            name = self._next_name
+            self._next_name = None
+
+        self._entry_name = name
+
+        if self._entry_type in REGULAR_TYPES:
+            self._path = None
+            self._hash = hashlib.sha256()
+
+            normalized_name = _normalize_name(name)
+            destination = (
+                self._get_destination(normalized_name) if normalized_name else None
+            )
+
+            if destination is not None:
+                self._entry_name = normalized_name
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                self._path = destination
+                self._file = open(destination, "wb")
+
+            if size == 0:
+                self._finish_entry(completed)
+
+    def _consume_entry_data(
+        self, view: memoryview, completed: List[Tuple[str, str]]
+    ) -> memoryview:
+        if self._entry_remaining:
+            chunk = view[: self._entry_remaining]
+            view = view[len(chunk) :]
+            self._entry_remaining -= len(chunk)
+
+            if self._entry_type in REGULAR_TYPES:
+                self._hash.update(chunk)
+
+                if self._file is not None:
+                    self._file.write(chunk)
+            elif self._entry_type in (PAX_HEADER_TYPE, GNU_LONG_NAME_TYPE):
+                self._entry_data += chunk.tobytes()
+
+            if not self._entry_remaining:
+                self._finish_entry(completed)
+
+        padding = view[: self._entry_padding]
+        self._entry_padding -= len(padding)
+
+        return view[len(padding) :]
+
+    def _finish_entry(self, completed: List[Tuple[str, str]]) -> None:
+        if self._entry_type in REGULAR_TYPES:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                completed.append((self._entry_name, self._hash.hexdigest()))
+        elif self._entry_type == GNU_LONG_NAME_TYPE:
+            self._next_name = _parse_string(self._entry_data)
+        elif self._entry_type == PAX_HEADER_TYPE:
+            path = _parse_pax_path(self._entry_data)
+            if path is not None:
+                self._next_name = path
+
+
+def _parse_string(field: bytes) -> str:
+    return field.split(b"\0", 1)[0].decode("utf-8")
+
+
+def _parse_number(field: bytes) -> int:
+    # large numbers are stored in base-256, with the highest bit of the first byte set
+    if field[0] & 0x80:
+        value = field[0] & 0x7F
+        for byte in field[1:]:
+            value = (value << 8) + byte
+
+        return value
+
+    text = field.split(b"\0", 1)[0].strip()
+    if not text:
+        return 0
+
+    try:
+        return int(text, 8)
+    except ValueError as err:
+        raise TarStreamError("Invalid number in tar header") from err
+
+
+def _parse_pax_path(data: bytes) -> Optional[str]:
+    """Returns the path of the pax extended header records, if any.
+
+    Each record is "<length> <key>=<value>\\n", the length including the whole record.
+    """
+    path = None
+    pos = 0
+
+    while pos < len(data):
+        space_idx = data.index(b" ", pos)
+        length = int(data[pos:space_idx])
+        key, _sep, value = data[space_idx + 1 : pos + length - 1].partition(b"=")
+
+        if key == b"path":
+            path = value.decode("utf-8")
+
+        pos += length
+
+    return path
+
+
+def _normalize_name(name: str) -> Optional[str]:
+    """Returns the relative POSIX name of the entry, `None` if it points outside the archive."""
+    path = PurePosixPath(name)
+
+    if path.is_absolute() or ".." in path.parts:
+        return None
+
+    parts = [part for part in path.parts if part != "."]
+    if not parts:
+        return None
+
+    return "/".join(parts)